@@ -1,4 +1,9 @@
 import FreeCAD as App, FreeCADGui as Gui, Part, math
+import os, sys
+
+_REPO = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", ".."))
+if _REPO not in sys.path: sys.path.insert(0, _REPO)
+from starsat import fillet_edges
 
 DOC_NAME = "ExtremeShield_Probe_Printable"
 if App.ActiveDocument is None or App.ActiveDocument.Label != DOC_NAME:
@@ -51,10 +56,8 @@ def add_obj(shape, label, color=(0.70,0.70,0.72)):
     return o
 
 def safe_fillet(shape, r):
-    try:
-        return shape.makeFillet(r, shape.Edges)
-    except:
-        return shape
+    # solo aristas vivas donde cabe r (sin astillas); si OCC falla devuelve shape
+    return fillet_edges(shape, r, "sharp")
 
 def make_cyl_x(d, L, cx=0, cy=0, cz=0):
     c = Part.makeCylinder(d/2.0, L)
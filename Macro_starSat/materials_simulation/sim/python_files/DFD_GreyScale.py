@@ -2,7 +2,11 @@
 # Autor: Víctor + Copilot
 # Unidades: mm, eje longitudinal = X
 
-import FreeCAD as App, FreeCADGui as Gui, Part, math
+import FreeCAD as App, FreeCADGui as Gui, Part, math, os, sys
+
+_REPO = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", ".."))
+if _REPO not in sys.path: sys.path.insert(0, _REPO)
+from starsat import Assembly, axial_profile, brep_cache, fillet_edges, fuse_all, inset_solid, laminate, report_fuse_stats
 
 doc_name="Direct_Fusion_Drive"
 if App.ActiveDocument is None or App.ActiveDocument.Label!=doc_name:
@@ -102,11 +106,17 @@ MAT={
 # ========================
 X_AXIS=App.Vector(1,0,0);Y_AXIS=App.Vector(0,1,0);Z_AXIS=App.Vector(0,0,1)
 def rot_to_x():return App.Rotation(Y_AXIS,90)
-def add_obj(shape,label):obj=doc.addObject("Part::Feature",label);obj.Shape=shape;return obj
+# Todas las piezas en un único objeto (compound + tabla de materiales); False = un Part::Feature por pieza
+single_object=True
+ASM=Assembly() if single_object else None
+def add_obj(shape,label):
+    if ASM is not None:return ASM.add(shape,label)
+    obj=doc.addObject("Part::Feature",label);obj.Shape=shape;return obj
 def set_mat(obj,mat): 
     if not obj:return
     m=MAT.get(mat,None)if isinstance(mat,str)else mat
     if not m:return
+    if ASM is not None:ASM.set_material(obj,mat if isinstance(mat,str)else m.get('name',''),m.get('name',''),m.get('rho',0.0),m);return
     obj.addProperty("App::PropertyString","Material","Meta","").Material=m.get('name','')
     obj.addProperty("App::PropertyMap","MaterialData","Meta","").MaterialData={k:str(v)for k,v in m.items()}
     obj.addProperty("App::PropertyFloat","Density","Meta","").Density=m.get('rho',0.0)
@@ -118,7 +128,10 @@ def make_torus_x(R,r,cx=0.0,cy=0.0,cz=0.0,label="TorusX"):
     tor=Part.makeTorus(R,r);tor.Placement=App.Placement(App.Vector(cx,cy,cz),rot_to_x());return add_obj(tor,label)
 def make_box(w,d,h,cx=0.0,cy=0.0,cz=0.0,label="Box"):
     b=Part.makeBox(w,d,h);b.Placement=App.Placement(App.Vector(cx-w/2.0,cy-d/2.0,cz-h/2.0),App.Rotation());return add_obj(b,label)
-def make_hollow_from_offset(outer_shape,t,label="Shell"): 
+def make_hollow_from_offset(outer_shape,t,label="Shell",profile=None):
+    # Con el perfil meridiano la cáscara es analítica (espesor exacto, sin makeOffsetShape)
+    if profile is not None:
+        return add_obj(laminate(profile,[t])[0],label)
     try:
         inner=outer_shape.makeOffsetShape(-t,0.01,join=2,fill=True)
         shell=outer_shape.cut(inner)
@@ -126,12 +139,9 @@ def make_hollow_from_offset(outer_shape,t,label="Shell"):
     except Exception:
         return add_obj(outer_shape,label+"_fallback")
 def fillet_between(shpA,shpB,r):
+    # solo la costura A∩B (no todas las aristas del conjunto fusionado)
     fused=shpA.fuse(shpB)
-    try:
-        edges=[e for e in fused.Edges if e.Length>30 and e.Length<10000]
-        new=fused.makeFillet(r,edges);return new
-    except Exception:
-        return fused
+    return fillet_edges(fused,r,"seam",operands=[shpA,shpB],min_length=30,max_length=10000)
 def sweep_rect_around_X(R,rw,rh,cx,cy,cz,ax0,ax1,label="CoilSweep"):
     circ=Part.makeCircle(R,App.Vector(cx,cy,cz),X_AXIS);path=Part.Wire([circ])
     p0=App.Vector(0,-rw/2.0,-rh/2.0);p1=App.Vector(0,rw/2.0,-rh/2.0)
@@ -158,8 +168,7 @@ def create_instrument_fields():
         set_mat(boom, 'AL')
         booms.append(boom.Shape)
     if booms:
-        booms_shape = booms[0]
-        for b in booms[1:]: booms_shape = booms_shape.fuse(b)
+        booms_shape = fuse_all(booms, "fields_booms")
         booms_obj = add_obj(booms_shape, "FIELDS_Booms")
         set_mat(booms_obj, 'AL')
         return body.Shape.fuse(booms_shape)
@@ -174,11 +183,7 @@ def create_instrument_sweap():
         det = make_cyl_x(inst["d"]/3, inst["l"]/2, cx=inst["cx"] + i*50, cy=inst["cy"], cz=inst["cz"] + i*30, label=f"SWEAP_Det_{i+1}")
         set_mat(det, 'COPPER')
         detectors.append(det.Shape)
-    if detectors:
-        det_shape = detectors[0]
-        for d in detectors[1:]: det_shape = det_shape.fuse(d)
-        return body.Shape.fuse(det_shape)
-    return body.Shape
+    return fuse_all([body.Shape] + detectors, "sweap")
 
 def create_instrument_isis():
     inst = INSTRUMENTS["ISIS"]
@@ -189,11 +194,7 @@ def create_instrument_isis():
         tel = make_cyl_x(inst["d"]/4, inst["l"]/3, cx=inst["cx"] + i*40, cy=inst["cy"] + i*20, cz=inst["cz"], label=f"ISIS_Tel_{i+1}")
         set_mat(tel, 'AL')
         telescopes.append(tel.Shape)
-    if telescopes:
-        tel_shape = telescopes[0]
-        for t in telescopes[1:]: tel_shape = tel_shape.fuse(t)
-        return body.Shape.fuse(tel_shape)
-    return body.Shape
+    return fuse_all([body.Shape] + telescopes, "isis")
 
 def create_instrument_wispr():
     inst = INSTRUMENTS["WISPR"]
@@ -204,15 +205,12 @@ def create_instrument_wispr():
         cam = make_cyl_x(inst["d"]/3, inst["l"]/4, cx=inst["cx"] + i*30, cy=inst["cy"], cz=inst["cz"] + i*20, label=f"WISPR_Cam_{i+1}")
         set_mat(cam, 'STEEL')
         cameras.append(cam.Shape)
-    if cameras:
-        cam_shape = cameras[0]
-        for c in cameras[1:]: cam_shape = cam_shape.fuse(c)
-        return body.Shape.fuse(cam_shape)
-    return body.Shape
+    return fuse_all([body.Shape] + cameras, "wispr")
 
 # ========================
 # TPS avanzado con aislamiento multicapa
 # ========================
+@brep_cache
 def create_advanced_tps():
     tps_base = TPS_fused.Shape
     insul_layers = []
@@ -235,10 +233,7 @@ def create_advanced_tps():
         set_mat(beam, 'STEEL')
         beams.append(beam.Shape)
     all_parts = [tps_base, ceramic_coat.Shape, foam_core.Shape] + insul_layers + beams
-    fused = all_parts[0]
-    for p in all_parts[1:]:
-        fused = fused.fuse(p)
-    return fused
+    return fuse_all(all_parts, "tps_advanced")
 
 # ========================
 # Sistema de energía: Paneles solares retráctiles con refrigeración
@@ -259,10 +254,7 @@ def create_energy_system():
             set_mat(tube, 'COPPER')
             cooling_tubes.append(tube.Shape)
     all_parts = panels + cooling_tubes
-    fused = all_parts[0]
-    for p in all_parts[1:]:
-        fused = fused.fuse(p)
-    return fused
+    return fuse_all(all_parts, "energy_system")
 
 # ========================
 # Comunicación y navegación
@@ -284,10 +276,7 @@ def create_comm_nav():
         set_mat(sensor, 'AL')
         sensors.append(sensor.Shape)
     all_parts = [hga] + sensors
-    fused = all_parts[0]
-    for p in all_parts[1:]:
-        fused = fused.fuse(p)
-    return fused
+    return fuse_all(all_parts, "comm_nav")
 
 # ========================
 # Estructura avanzada: Truss para soporte
@@ -310,10 +299,7 @@ def create_advanced_structure():
         set_mat(mount, 'STEEL')
         mounts.append(mount.Shape)
     all_parts = beams + mounts
-    fused = all_parts[0]
-    for p in all_parts[1:]:
-        fused = fused.fuse(p)
-    return fused
+    return fuse_all(all_parts, "advanced_structure")
 
 # ========================
 # Fuselaje (sólidos)
@@ -323,8 +309,11 @@ mid =make_cyl_x(P["mid_d"],P["mid_len"],cx=P["nose_len"]+P["mid_len"]/2.0,label=
 rear=make_cyl_x(P["rear_d"],P["rear_len"],cx=P["nose_len"]+P["mid_len"]+P["rear_len"]/2.0,label="Rear"); set_mat(rear,'AL')
 
 # Casco hueco del fuselaje (si quieres sólido, usa fuse_fuselage_shape directamente)
-fuse_fuselage_shape=nose.Shape.fuse(mid.Shape).fuse(rear.Shape)
-hull=make_hollow_from_offset(fuse_fuselage_shape,P["hull_t"],label="Hull_Shell"); set_mat(hull,'AL')
+# Perfil meridiano (x, r) del fuselaje, igual que Nose/Mid/Rear: cono con la base en x=0 y
+# la punta en x=nose_len (apoyada en el cilindro medio) + cilindros medio y trasero
+HULL_PROFILE=axial_profile([(P["nose_len"],P["nose_base_d"]/2.0,0.0),(P["mid_len"],P["mid_d"]/2.0,P["mid_d"]/2.0),(P["rear_len"],P["rear_d"]/2.0,P["rear_d"]/2.0)])
+fuse_fuselage_shape=inset_solid(HULL_PROFILE,0.0)  # macizo: revolución del perfil por trozos, sin fusiones
+hull=make_hollow_from_offset(fuse_fuselage_shape,P["hull_t"],label="Hull_Shell",profile=HULL_PROFILE); set_mat(hull,'AL')
 
 # ========================
 # TPS tipo Parker (pieza fusionada imprimible)
@@ -357,8 +346,7 @@ hull_cut=add_obj(hull.Shape.cut(win1.Shape).cut(win2.Shape),"Hull_Shell_Cut"); s
 
 cockpit_box=Part.makeBox(P["cockpit_l"],P["cockpit_w"],P["cockpit_h"])
 cockpit_box.Placement=App.Placement(App.Vector(P["cockpit_x0"],-P["cockpit_w"]/2.0,-P["cockpit_h"]/2.0),App.Rotation())
-try: cockpit_f=cockpit_box.makeFillet(20.0,cockpit_box.Edges)
-except Exception: cockpit_f=cockpit_box
+cockpit_f=fillet_edges(cockpit_box,20.0,"sharp")  # sin redondeos en LOD draft
 cockpit=add_obj(cockpit_f,"Cockpit"); set_mat(cockpit,'AL')
 
 # ========================
@@ -373,8 +361,7 @@ for i in range(P["ring_n"]):
     ring=Part.makeTorus((P["ring_ro"]+P["ring_ri"])/2.0,(P["ring_ro"]-P["ring_ri"])/2.0)
     ring.Placement=App.Placement(App.Vector(x,0,0),rot_to_x())
     rings.append(ring)
-rings_shape=rings[0]
-for r in rings[1:]: rings_shape=rings_shape.fuse(r)
+rings_shape=fuse_all(rings,"reactor_rings")
 rings_obj=add_obj(rings_shape,"Reactor_Rings"); set_mat(rings_obj,'STEEL')
 
 coils=[]
@@ -383,8 +370,7 @@ for i in range(P["coil_n"]):
     cx=cx0+i*(span/(max(1,(P["coil_n"]-1))))
     coil=sweep_rect_around_X(P["coil_R"],P["coil_rect_w"],P["coil_rect_h"],cx,0.0,0.0,0.0,0.0,label=f"Coil_{i+1}")
     coils.append(coil.Shape)
-coils_shape=coils[0]
-for c in coils[1:]: coils_shape=coils_shape.fuse(c)
+coils_shape=fuse_all(coils,"reactor_coils")
 coils_obj=add_obj(coils_shape,"Reactor_Coils"); set_mat(coils_obj,'COPPER')
 
 # ========================
@@ -415,8 +401,7 @@ for k in range(P["truss_n"]):
     beam=Part.makeBox(L,P["truss_tube_w"],P["truss_tube_w"])
     beam.Placement=App.Placement(App.Vector(x_attach-L/2.0,y-P["truss_tube_w"]/2.0,z-P["truss_tube_w"]/2.0),App.Rotation())
     truss_list.append(beam)
-truss_shape=truss_list[0]
-for t in truss_list[1:]: truss_shape=truss_shape.fuse(t)
+truss_shape=fuse_all(truss_list,"nozzle_truss")
 truss_obj=add_obj(truss_shape,"Nozzle_Truss"); set_mat(truss_obj,'STEEL')
 
 mod_inner_r=P["reactor_d"]/2.0+P["moderator_gap"]; mod_outer_r=mod_inner_r+P["moderator_t"]
@@ -568,21 +553,24 @@ to_fuse = [
 # Elimina posibles None y duplica protección
 to_fuse = [o for o in to_fuse if o and hasattr(o,'Shape')]
 
-fused = to_fuse[0].Shape
-for o in to_fuse[1:]:
-    try:
-        fused = fused.fuse(o.Shape)
-    except Exception:
-        pass
+fused = fuse_all([o.Shape for o in to_fuse], "assembly")
 
-Assembly_Fused = add_obj(fused, "Assembly_Fused")  # Sólido único imprimible
-set_mat(Assembly_Fused, 'AL')  # material global visual (las subpropiedades ya están en piezas individuales)
+if ASM is None:
+    Assembly_Fused = add_obj(fused, "Assembly_Fused")  # Sólido único imprimible
+    set_mat(Assembly_Fused, 'AL')  # material global visual (las subpropiedades ya están en piezas individuales)
 
-# Opcional: compuesto no fusionado (solo visual)
-compound = Part.Compound([o.Shape for o in to_fuse])
-add_obj(compound, "Assembly_Compound")
+    # Opcional: compuesto no fusionado (solo visual)
+    compound = Part.Compound([o.Shape for o in to_fuse])
+    add_obj(compound, "Assembly_Compound")
+else:
+    # Pieza única imprimible aparte; todas las piezas, con su material y color, en un solo objeto
+    Assembly_Fused = doc.addObject("Part::Feature", "Assembly_Fused"); Assembly_Fused.Shape = fused
+    Assembly_Compound = ASM.materialize(doc, "Assembly_Compound")
+    rollup = ASM.mass_rollup(to_fuse)
+    print("Masa: %.1f kg, CG %s (%d piezas en Assembly_Compound)" % (rollup["mass"], rollup["cg"], len(ASM)))
 
 doc.recompute()
+report_fuse_stats()
 print("Ensamblado mejorado completado con instrumentos científicos, TPS avanzado, sistema de energía, comunicación/navegación y estructura mejorada. Assembly_Fused (única pieza) y Assembly_Compound (visual). Listo para exportar STL/STEP.")
 
 DFD_GRIS_mejora.py
@@ -647,11 +635,17 @@ MAT={
 # ========================
 X_AXIS=App.Vector(1,0,0);Y_AXIS=App.Vector(0,1,0);Z_AXIS=App.Vector(0,0,1)
 def rot_to_x():return App.Rotation(Y_AXIS,90)
-def add_obj(shape,label):obj=doc.addObject("Part::Feature",label);obj.Shape=shape;return obj
+# Todas las piezas en un único objeto (compound + tabla de materiales); False = un Part::Feature por pieza
+single_object=True
+ASM=Assembly() if single_object else None
+def add_obj(shape,label):
+    if ASM is not None:return ASM.add(shape,label)
+    obj=doc.addObject("Part::Feature",label);obj.Shape=shape;return obj
 def set_mat(obj,mat): 
     if not obj:return
     m=MAT.get(mat,None)if isinstance(mat,str)else mat
     if not m:return
+    if ASM is not None:ASM.set_material(obj,mat if isinstance(mat,str)else m.get('name',''),m.get('name',''),m.get('rho',0.0),m);return
     obj.addProperty("App::PropertyString","Material","Meta","").Material=m.get('name','')
     obj.addProperty("App::PropertyMap","MaterialData","Meta","").MaterialData={k:str(v)for k,v in m.items()}
     obj.addProperty("App::PropertyFloat","Density","Meta","").Density=m.get('rho',0.0)
@@ -663,7 +657,10 @@ def make_torus_x(R,r,cx=0.0,cy=0.0,cz=0.0,label="TorusX"):
     tor=Part.makeTorus(R,r);tor.Placement=App.Placement(App.Vector(cx,cy,cz),rot_to_x());return add_obj(tor,label)
 def make_box(w,d,h,cx=0.0,cy=0.0,cz=0.0,label="Box"):
     b=Part.makeBox(w,d,h);b.Placement=App.Placement(App.Vector(cx-w/2.0,cy-d/2.0,cz-h/2.0),App.Rotation());return add_obj(b,label)
-def make_hollow_from_offset(outer_shape,t,label="Shell"): 
+def make_hollow_from_offset(outer_shape,t,label="Shell",profile=None):
+    # Con el perfil meridiano la cáscara es analítica (espesor exacto, sin makeOffsetShape)
+    if profile is not None:
+        return add_obj(laminate(profile,[t])[0],label)
     try:
         inner=outer_shape.makeOffsetShape(-t,0.01,join=2,fill=True)
         shell=outer_shape.cut(inner)
@@ -671,12 +668,9 @@ def make_hollow_from_offset(outer_shape,t,label="Shell"):
     except Exception:
         return add_obj(outer_shape,label+"_fallback")
 def fillet_between(shpA,shpB,r):
+    # solo la costura A∩B (no todas las aristas del conjunto fusionado)
     fused=shpA.fuse(shpB)
-    try:
-        edges=[e for e in fused.Edges if e.Length>30 and e.Length<10000]
-        new=fused.makeFillet(r,edges);return new
-    except Exception:
-        return fused
+    return fillet_edges(fused,r,"seam",operands=[shpA,shpB],min_length=30,max_length=10000)
 def sweep_rect_around_X(R,rw,rh,cx,cy,cz,ax0,ax1,label="CoilSweep"):
     circ=Part.makeCircle(R,App.Vector(cx,cy,cz),X_AXIS);path=Part.Wire([circ])
     p0=App.Vector(0,-rw/2.0,-rh/2.0);p1=App.Vector(0,rw/2.0,-rh/2.0)
@@ -695,8 +689,11 @@ mid =make_cyl_x(P["mid_d"],P["mid_len"],cx=P["nose_len"]+P["mid_len"]/2.0,label=
 rear=make_cyl_x(P["rear_d"],P["rear_len"],cx=P["nose_len"]+P["mid_len"]+P["rear_len"]/2.0,label="Rear"); set_mat(rear,'AL')
 
 # Casco hueco del fuselaje (si quieres sólido, usa fuse_fuselage_shape directamente)
-fuse_fuselage_shape=nose.Shape.fuse(mid.Shape).fuse(rear.Shape)
-hull=make_hollow_from_offset(fuse_fuselage_shape,P["hull_t"],label="Hull_Shell"); set_mat(hull,'AL')
+# Perfil meridiano (x, r) del fuselaje, igual que Nose/Mid/Rear: cono con la base en x=0 y
+# la punta en x=nose_len (apoyada en el cilindro medio) + cilindros medio y trasero
+HULL_PROFILE=axial_profile([(P["nose_len"],P["nose_base_d"]/2.0,0.0),(P["mid_len"],P["mid_d"]/2.0,P["mid_d"]/2.0),(P["rear_len"],P["rear_d"]/2.0,P["rear_d"]/2.0)])
+fuse_fuselage_shape=inset_solid(HULL_PROFILE,0.0)  # macizo: revolución del perfil por trozos, sin fusiones
+hull=make_hollow_from_offset(fuse_fuselage_shape,P["hull_t"],label="Hull_Shell",profile=HULL_PROFILE); set_mat(hull,'AL')
 
 # ========================
 # TPS tipo Parker (pieza fusionada imprimible)
@@ -729,8 +726,7 @@ hull_cut=add_obj(hull.Shape.cut(win1.Shape).cut(win2.Shape),"Hull_Shell_Cut"); s
 
 cockpit_box=Part.makeBox(P["cockpit_l"],P["cockpit_w"],P["cockpit_h"])
 cockpit_box.Placement=App.Placement(App.Vector(P["cockpit_x0"],-P["cockpit_w"]/2.0,-P["cockpit_h"]/2.0),App.Rotation())
-try: cockpit_f=cockpit_box.makeFillet(20.0,cockpit_box.Edges)
-except Exception: cockpit_f=cockpit_box
+cockpit_f=fillet_edges(cockpit_box,20.0,"sharp")  # sin redondeos en LOD draft
 cockpit=add_obj(cockpit_f,"Cockpit"); set_mat(cockpit,'AL')
 
 # ========================
@@ -745,8 +741,7 @@ for i in range(P["ring_n"]):
     ring=Part.makeTorus((P["ring_ro"]+P["ring_ri"])/2.0,(P["ring_ro"]-P["ring_ri"])/2.0)
     ring.Placement=App.Placement(App.Vector(x,0,0),rot_to_x())
     rings.append(ring)
-rings_shape=rings[0]
-for r in rings[1:]: rings_shape=rings_shape.fuse(r)
+rings_shape=fuse_all(rings,"reactor_rings")
 rings_obj=add_obj(rings_shape,"Reactor_Rings"); set_mat(rings_obj,'STEEL')
 
 coils=[]
@@ -755,8 +750,7 @@ for i in range(P["coil_n"]):
     cx=cx0+i*(span/(max(1,(P["coil_n"]-1))))
     coil=sweep_rect_around_X(P["coil_R"],P["coil_rect_w"],P["coil_rect_h"],cx,0.0,0.0,0.0,0.0,label=f"Coil_{i+1}")
     coils.append(coil.Shape)
-coils_shape=coils[0]
-for c in coils[1:]: coils_shape=coils_shape.fuse(c)
+coils_shape=fuse_all(coils,"reactor_coils")
 coils_obj=add_obj(coils_shape,"Reactor_Coils"); set_mat(coils_obj,'COPPER')
 
 # ========================
@@ -787,8 +781,7 @@ for k in range(P["truss_n"]):
     beam=Part.makeBox(L,P["truss_tube_w"],P["truss_tube_w"])
     beam.Placement=App.Placement(App.Vector(x_attach-L/2.0,y-P["truss_tube_w"]/2.0,z-P["truss_tube_w"]/2.0),App.Rotation())
     truss_list.append(beam)
-truss_shape=truss_list[0]
-for t in truss_list[1:]: truss_shape=truss_shape.fuse(t)
+truss_shape=fuse_all(truss_list,"nozzle_truss")
 truss_obj=add_obj(truss_shape,"Nozzle_Truss"); set_mat(truss_obj,'STEEL')
 
 mod_inner_r=P["reactor_d"]/2.0+P["moderator_gap"]; mod_outer_r=mod_inner_r+P["moderator_t"]
@@ -899,19 +892,22 @@ to_fuse = [
 # Elimina posibles None y duplica protección
 to_fuse = [o for o in to_fuse if o and hasattr(o,'Shape')]
 
-fused = to_fuse[0].Shape
-for o in to_fuse[1:]:
-    try:
-        fused = fused.fuse(o.Shape)
-    except Exception:
-        pass
+fused = fuse_all([o.Shape for o in to_fuse], "assembly")
 
-Assembly_Fused = add_obj(fused, "Assembly_Fused")  # Sólido único imprimible
-set_mat(Assembly_Fused, 'AL')  # material global visual (las subpropiedades ya están en piezas individuales)
+if ASM is None:
+    Assembly_Fused = add_obj(fused, "Assembly_Fused")  # Sólido único imprimible
+    set_mat(Assembly_Fused, 'AL')  # material global visual (las subpropiedades ya están en piezas individuales)
 
-# Opcional: compuesto no fusionado (solo visual)
-compound = Part.Compound([o.Shape for o in to_fuse])
-add_obj(compound, "Assembly_Compound")
+    # Opcional: compuesto no fusionado (solo visual)
+    compound = Part.Compound([o.Shape for o in to_fuse])
+    add_obj(compound, "Assembly_Compound")
+else:
+    # Pieza única imprimible aparte; todas las piezas, con su material y color, en un solo objeto
+    Assembly_Fused = doc.addObject("Part::Feature", "Assembly_Fused"); Assembly_Fused.Shape = fused
+    Assembly_Compound = ASM.materialize(doc, "Assembly_Compound")
+    rollup = ASM.mass_rollup(to_fuse)
+    print("Masa: %.1f kg, CG %s (%d piezas en Assembly_Compound)" % (rollup["mass"], rollup["cg"], len(ASM)))
 
 doc.recompute()
+report_fuse_stats()
 print("Ensamblado completado: Assembly_Fused (única pieza) y Assembly_Compound (visual). Listo para exportar STL/STEP.")
@@ -1,6 +1,10 @@
 # Unidades: mm, eje longitudinal = X
 
-import FreeCAD as App, FreeCADGui as Gui, Part, math
+import FreeCAD as App, FreeCADGui as Gui, Part, math, os, sys
+
+_REPO = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", ".."))
+if _REPO not in sys.path: sys.path.insert(0, _REPO)
+from starsat import axial_profile, fillet_edges, fuse_all, inset_solid, laminate
 
 doc_name="Direct_Fusion_Drive"
 if App.ActiveDocument is None or App.ActiveDocument.Label!=doc_name:
@@ -102,7 +106,10 @@ def make_box(w,d,h,cx=0.0,cy=0.0,cz=0.0,label="Box"):
     b.Placement=App.Placement(App.Vector(cx-w/2.0,cy-d/2.0,cz-h/2.0),App.Rotation())
     return add_obj(b,label)
 
-def make_hollow_from_offset(outer_shape,t,label="Shell"):
+def make_hollow_from_offset(outer_shape,t,label="Shell",profile=None):
+    # Con el perfil meridiano la cáscara es analítica (espesor exacto, sin makeOffsetShape)
+    if profile is not None:
+        return add_obj(laminate(profile,[t])[0],label)
     try:
         inner=outer_shape.makeOffsetShape(-t,0.01,join=2,fill=True)
         shell=outer_shape.cut(inner)
@@ -111,7 +118,7 @@ def make_hollow_from_offset(outer_shape,t,label="Shell"):
         return add_obj(outer_shape,label+"_fallback")
 
 def fillet_between(shpA,shpB,r):
-    fused=shpA.fuse(shpB)
+    fused=fuse_all([shpA,shpB],"fillet_between")  # refinado: sin costuras de operandos
     try:
         edges=[e for e in fused.Edges if e.Length>30 and e.Length<10000]
         new=fused.makeFillet(r,edges)
@@ -136,8 +143,11 @@ def sweep_rect_around_X(R,rw,rh,cx,cy,cz,ax0,ax1,label="CoilSweep"):
 nose=make_cone_x(P["nose_base_d"],0.0,P["nose_len"],cx=P["nose_len"]/2.0,label="Nose")
 mid=make_cyl_x(P["mid_d"],P["mid_len"],cx=P["nose_len"]+P["mid_len"]/2.0,label="Mid")
 rear=make_cyl_x(P["rear_d"],P["rear_len"],cx=P["nose_len"]+P["mid_len"]+P["rear_len"]/2.0,label="Rear")
-fuse_fuselage_shape=nose.Shape.fuse(mid.Shape).fuse(rear.Shape)
-hull=make_hollow_from_offset(fuse_fuselage_shape,P["hull_t"],label="Hull_Shell")
+# Perfil meridiano (x, r) del fuselaje, igual que Nose/Mid/Rear: cono con la base en x=0 y
+# la punta en x=nose_len (apoyada en el cilindro medio) + cilindros medio y trasero
+HULL_PROFILE=axial_profile([(P["nose_len"],P["nose_base_d"]/2.0,0.0),(P["mid_len"],P["mid_d"]/2.0,P["mid_d"]/2.0),(P["rear_len"],P["rear_d"]/2.0,P["rear_d"]/2.0)])
+fuse_fuselage_shape=inset_solid(HULL_PROFILE,0.0)  # macizo: revolución del perfil por trozos, sin fusiones
+hull=make_hollow_from_offset(fuse_fuselage_shape,P["hull_t"],label="Hull_Shell",profile=HULL_PROFILE)
 
 # ========================
 # TPS tipo Parker montado en el morro
@@ -168,8 +178,7 @@ hull_cut=add_obj(hull.Shape.cut(win1.Shape).cut(win2.Shape),"Hull_Shell_Cut")
 
 cockpit_box=Part.makeBox(P["cockpit_l"],P["cockpit_w"],P["cockpit_h"])
 cockpit_box.Placement=App.Placement(App.Vector(P["cockpit_x0"],-P["cockpit_w"]/2.0,-P["cockpit_h"]/2.0),App.Rotation())
-try: cockpit_f=cockpit_box.makeFillet(20.0,cockpit_box.Edges)
-except Exception: cockpit_f=cockpit_box
+cockpit_f=fillet_edges(cockpit_box,20.0,"sharp")  # sin redondeos en LOD draft
 cockpit=add_obj(cockpit_f,"Cockpit"); set_mat(cockpit,'AL')
 
 # ========================
@@ -1,6 +1,10 @@
 import FreeCAD as App
 import FreeCADGui as Gui
-import Part, math, os
+import Part, math, os, sys
+
+_REPO = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", ".."))
+if _REPO not in sys.path: sys.path.insert(0, _REPO)
+from starsat import cut_all, lod_steps, lod_wants, make_finned_radiator, proxy_array
 
 # ---------------------------------
 # Documento y configuración
@@ -183,16 +187,25 @@ mount_ring = mk_ring(P["body_R"] + P["mount_ring_t"], P["body_R"] + P["mount_rin
                      x0=P["cone_L"] + P["body_L"]*0.20)
 add_part(mount_ring, "Mount_Ring", color=P["col_bracket"])
 
-for i in range(P["mount_bolts"]):
-    ang = 2*math.pi * i / P["mount_bolts"]
+# LOD draft: menos pernos en el anillo (lod_steps), el resto de la geometría igual
+n_bolts = lod_steps(P["mount_bolts"], minimum=4)
+bolts = []
+for i in range(n_bolts):
+    ang = 2*math.pi * i / n_bolts
     br = P["body_R"] + P["mount_ring_t"] - P["mount_ring_w"]/2.0
     bx = P["cone_L"] + P["body_L"]*0.20
     by = math.cos(ang) * br
     bz = math.sin(ang) * br
     shank = mk_cyl_x(P["bolt_R"], P["mount_ring_t"], x0=bx, y=by, z=bz)
-    add_part(shank, f"Bolt_{i}_Shank", color=(0.55,0.55,0.58))
     head = mk_cyl_x(P["bolt_head_D"]/2.0, P["bolt_head_H"], x0=bx + P["mount_ring_t"]/2.0, y=by, z=bz)
-    add_part(head, f"Bolt_{i}_Head", color=(0.60,0.60,0.62))
+    bolts.append((i, shank, head))
+# LOD draft: toda la tornillería en un solo objeto de cajas envolventes
+if lod_wants("proxies"):
+    add_part(proxy_array([s for b in bolts for s in b[1:]]), "Bolts_Proxy", color=(0.55,0.55,0.58))
+else:
+    for i, shank, head in bolts:
+        add_part(shank, f"Bolt_{i}_Shank", color=(0.55,0.55,0.58))
+        add_part(head, f"Bolt_{i}_Head", color=(0.60,0.60,0.62))
 
 # Núcleo hex estilizado (simplificado robusto)
 hex_body = mk_box(P["core_flat"], P["core_flat"], P["core_h"], x=P["cone_L"] + P["body_L"]/2.0, y=0, z=0, center=True)
@@ -228,13 +241,9 @@ def make_panel_with_frame(L, W, T, rows, cols, frame):
     cell_w = L / cols
     cell_h = W / rows
     groove = max(0.0015, T * 0.25)
-    for i in range(1, cols):
-        cut = mk_box(0.004, groove, W, x=i*cell_w, y=(T-groove)/2.0, z=0, center=False)
-        panel = panel.cut(cut)
-    for j in range(1, rows):
-        cut = mk_box(L, groove, 0.004, x=0, y=(T-groove)/2.0, z=j*cell_h, center=False)
-        panel = panel.cut(cut)
-    return panel
+    cuts = [mk_box(0.004, groove, W, x=i*cell_w, y=(T-groove)/2.0, z=0, center=False) for i in range(1, cols)]
+    cuts += [mk_box(L, groove, 0.004, x=0, y=(T-groove)/2.0, z=j*cell_h, center=False) for j in range(1, rows)]
+    return cut_all(panel, cuts, "panel_grooves", cosmetic=True)
 
 panel_base = make_panel_with_frame(P["panel_L"], P["panel_W"], P["panel_T"], P["panel_rows"], P["panel_cols"], P["panel_frame"])
 
@@ -294,24 +303,19 @@ add_strut('Y+'); add_strut('Y-'); add_strut('Z+'); add_strut('Z-')
 # ---------------------------------
 # Radiadores con aletas
 # ---------------------------------
-def make_radiator_with_fins(W, H, T, fin_T, fin_gap):
-    base = mk_box(W, T, H, x=0, y=0, z=0, center=False)
-    # aletas longitudinales (en Z)
-    n_fins = int(H / (fin_gap + fin_T))
-    z0 = 0.0
-    for i in range(n_fins):
-        fin = mk_box(W, fin_T, fin_gap, x=0, y=T, z=z0, center=False)
-        base = base.fuse(fin)
-        z0 += fin_gap + fin_T
-    return base
-
-rad_R = make_radiator_with_fins(P["radiator_W"], P["radiator_H"], P["radiator_T"], P["fin_T"], P["fin_gap"])
-rad_R.Placement = App.Placement(App.Vector(mm(P["cone_L"] + P["body_L"]*0.62), mm(P["body_R"] + P["radiator_offset"]), 0), App.Rotation())
-add_part(rad_R, "Radiator_Right", color=(0.62,0.66,0.70))
-
-rad_L = rad_R.copy()
-rad_L.Placement = App.Placement(App.Vector(mm(P["cone_L"] + P["body_L"]*0.62), mm(-(P["body_R"] + P["radiator_offset"])), 0), App.Rotation())
-add_part(rad_L, "Radiator_Left", color=(0.62,0.66,0.70))
+# Features paramétricas: editar Width/FinGap... en la vista de propiedades y recomputar
+def add_radiator(name, y):
+    rad = make_finned_radiator(doc, name, Width=mm(P["radiator_W"]), Height=mm(P["radiator_H"]),
+                               Thickness=mm(P["radiator_T"]), FinThickness=mm(P["fin_T"]), FinGap=mm(P["fin_gap"]))
+    rad.Placement = App.Placement(App.Vector(mm(P["cone_L"] + P["body_L"]*0.62), mm(y), 0), App.Rotation())
+    try:
+        rad.ViewObject.ShapeColor = (0.62,0.66,0.70)
+        rad.ViewObject.LineColor = (0.3,0.3,0.3)
+    except: pass
+    return rad
+
+rad_R = add_radiator("Radiator_Right", P["body_R"] + P["radiator_offset"])
+rad_L = add_radiator("Radiator_Left", -(P["body_R"] + P["radiator_offset"]))
 
 # ---------------------------------
 # Sensores: sun sensor y star tracker
@@ -371,9 +375,10 @@ wrap_outer = mk_cyl_x(P["body_R"] + P["insul_th"], ins_w, x0=P["insul_from"])
 wrap_inner = mk_cyl_x(max(0.01, P["body_R"] - P["insul_th"]), ins_w + 0.0002, x0=P["insul_from"])
 wrap_band = wrap_outer.cut(wrap_inner)
 
-# Ondulación por sustracción y costuras longitudinales (pequeños "cordones")
-for i in range(P["insul_wave_freq"]):
-    z = math.sin(i * math.pi / P["insul_wave_freq"]) * P["insul_wave_amp"]
+# Ondulación por sustracción y costuras longitudinales (pequeños "cordones"): cosméticas
+n_wave = P["insul_wave_freq"] if lod_wants("cosmetic") else 0
+for i in range(n_wave):
+    z = math.sin(i * math.pi / n_wave) * P["insul_wave_amp"]
     cut = mk_box(ins_w, 0.10, 0.004, x=P["insul_from"] + ins_w/2.0, y=0, z=z, center=True)
     wrap_band = wrap_band.cut(cut)
 
@@ -381,7 +386,8 @@ for i in range(P["insul_wave_freq"]):
 seam_y = P["body_R"] * 0.92
 seam1 = mk_box(ins_w, P["mli_seam_w"], 0.002, x=P["insul_from"] + ins_w/2.0, y=seam_y, z=0, center=True)
 seam2 = mk_box(ins_w, P["mli_seam_w"], 0.002, x=P["insul_from"] + ins_w/2.0, y=-seam_y, z=0, center=True)
-wrap_band = wrap_band.fuse(seam1).fuse(seam2)
+if lod_wants("cosmetic"):
+    wrap_band = wrap_band.fuse(seam1).fuse(seam2)
 
 add_part(wrap_band, "Thermal_Insulation_MLI", color=P["col_gold"])
 
@@ -389,7 +395,7 @@ add_part(wrap_band, "Thermal_Insulation_MLI", color=P["col_gold"])
 # Recomputa y exporta
 # ---------------------------------
 doc.recompute()
-if EXPORT_STEP:
+if EXPORT_STEP and lod_wants("export"):
     try:
         Part.export([o for o in doc.Objects if hasattr(o, "Shape")], STEP_PATH)
         App.Console.PrintMessage(f"STEP exportado en: {STEP_PATH}\n")
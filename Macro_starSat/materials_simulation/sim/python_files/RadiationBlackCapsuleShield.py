@@ -4,10 +4,14 @@ RadiationBlackCapsuleShield.py
 # admisión estrecha-profunda, filtro de plasma, thruster iónico principal, radiadores curvos,
 # manifolds y piping. Incluye metadatos de materiales y Tmax. Exporta STEP AP214.
 
-import math
+import math, os, sys
 import FreeCAD as App
 import Part
 
+_REPO = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", ".."))
+if _REPO not in sys.path: sys.path.insert(0, _REPO)
+from starsat import annular_sector, annular_sector_face, brep_cache, capsule_layers, build_parallel, lod_level, lod_steps, lod_wants, paraboloid_shell, paraboloid_solid, polar_pattern, proxy_array, set_view
+
 # ===================== Parámetros (mm) y diseño térmico =====================
 # Geometría base (alargada)
 caps_rad      = 105.0      # radio externo
@@ -51,6 +55,7 @@ rad_angle_deg   = 110.0
 rad_gap_from_hull = 10.0
 rad_radial_t    = 6.0
 rad_len_x       = 280.0
+rad_thickness_profile = None   # (t_centro, t_borde) p.ej. (6.0, 3.0); standoffs hasta R_out - rad_radial_t
 rad_n_panels    = 2   # 1=±Y, 2=±Y y ±Z
 
 # Manifolds y tubería
@@ -71,6 +76,8 @@ Tmax_struct  = 650   # °C
 
 # Exportación
 export_path = App.getUserAppDataDir() + "HighT_CapsuleCollector.step"
+# Subconjuntos en workers FreeCADCmd paralelos (secuencial si no hay FreeCADCmd)
+parallel_build = True
 
 # ===================== Utilidades =====================
 def place_shape(shape, pos=App.Vector(0,0,0), rot_axis=App.Vector(0,1,0), rot_deg=0):
@@ -85,11 +92,8 @@ def add_part(doc, shape, name, color=(0.8,0.8,0.8), transparency=0, mat=None):
     if shape is None: return None
     obj = doc.addObject("Part::Feature", name)
     obj.Shape = shape
-    try:
-        obj.ViewObject.ShapeColor = color
-        obj.ViewObject.Transparency = int(max(0, min(100, round(transparency*100))))
-    except Exception:
-        pass
+    # Diferido en bulk_build (y registrado para los workers de build_parallel, sin ViewObject)
+    set_view(obj, ShapeColor=color, Transparency=int(max(0, min(100, round(transparency*100)))))
     # Metadatos de material
     if mat:
         try:
@@ -101,33 +105,12 @@ def add_part(doc, shape, name, color=(0.8,0.8,0.8), transparency=0, mat=None):
     return obj
 
 def make_revolved_solid_from_diameter(d, depth, steps=128, z0_eps_factor=1.0):
-    if d <= 0 or depth <= 0:
-        return None
-    f = (d*d) / (16.0*depth)
-    def r(z): return math.sqrt(max(0.0, 4.0*f*z))
-    steps = max(48, int(steps))
-    z0 = depth / (steps * z0_eps_factor)
-    p_axis_bot = App.Vector(0, 0, z0)
-    p_axis_top = App.Vector(0, 0, depth)
-    e_axis = Part.makeLine(p_axis_bot, p_axis_top)
-    p_top_out = App.Vector(r(depth), 0, depth)
-    e_top = Part.makeLine(p_axis_top, p_top_out)
-    outer_pts = []
-    for i in range(steps+1):
-        z = depth - (depth - z0) * (i/steps)
-        outer_pts.append(App.Vector(r(z), 0, z))
-    e_curve = Part.makePolygon(outer_pts)
-    p_bot_out = outer_pts[-1]
-    e_bot = Part.makeLine(p_bot_out, p_axis_bot)
-    wire = Part.Wire([e_axis, e_top, e_curve, e_bot])
-    face = Part.Face(wire)
-    return face.revolve(App.Vector(0,0,0), App.Vector(0,0,1), 360)
+    # Perfil parabólico exacto (Bézier): steps solo fija el recorte del vértice z0
+    return paraboloid_solid(d, depth, depth / (max(48, int(steps)) * z0_eps_factor))
 
 def make_shell_from_revolve(d, depth, t, steps=128):
-    outer = make_revolved_solid_from_diameter(d, depth, steps)
-    d_inner = max(0.1, d - 2.0*t)
-    inner = make_revolved_solid_from_diameter(d_inner, depth, steps)
-    return outer.cut(inner)
+    # Una revolución del perfil entre las dos parábolas: 4 caras, sin booleana
+    return paraboloid_shell(d, depth, t, depth / max(48, int(steps)))
 
 def make_ring(r_outer, r_inner, h):
     outer = Part.makeCylinder(r_outer, h)
@@ -135,51 +118,45 @@ def make_ring(r_outer, r_inner, h):
     return outer.cut(inner)
 
 def make_capsule_body(R):
-    # Cuerpo cilíndrico + hemisferios
-    cyl = Part.makeCylinder(R, caps_cyl_len, App.Vector(-caps_cyl_len/2.0,0,0), App.Vector(1,0,0))
-    s_front = Part.makeSphere(R); s_front.translate(App.Vector(+caps_cyl_len/2.0,0,0))
-    s_back  = Part.makeSphere(R); s_back.translate(App.Vector(-caps_cyl_len/2.0,0,0))
-    box_front = Part.makeBox(R*2.2, R*2.2, R*2.2); box_front.translate(App.Vector(+caps_cyl_len/2.0, -R*1.1, -R*1.1))
-    box_back  = Part.makeBox(R*2.2, R*2.2, R*2.2); box_back.translate(App.Vector(-caps_cyl_len/2.0 - R*2.2, -R*1.1, -R*1.1))
-    hemi_front = s_front.common(box_front)
-    hemi_back  = s_back.common(box_back)
-    return cyl.fuse([hemi_front, hemi_back])
+    # Cuerpo cilíndrico + hemisferios: una revolución del semiperfil
+    return capsule_layers(R, caps_cyl_len, [], core=True)[0]
 
 def make_capsule_layer(R_outer, thickness):
-    # Capa como (outer - inner) manteniendo espesor en hemisferios y cilindro
-    outer = make_capsule_body(R_outer)
-    R_inner = max(1.0, R_outer - thickness)
-    # Inner se recorta para dejar espesor constante
-    inner = make_capsule_body(R_inner)
-    return outer.cut(inner)
+    # Capa de espesor constante en hemisferios y cilindro: una revolución, sin booleanas
+    return capsule_layers(R_outer, caps_cyl_len, [thickness])[0]
 
 def add_standoffs_ring(doc, x_pos, R_from, R_to, n=8, r=2.4, color=(0.75,0.75,0.78), mat=None):
     objs=[]
     L = abs(R_to - R_from)
+    n = lod_steps(n, minimum=4)  # LOD draft: menos separadores en el anillo
     for a in range(n):
         ang = a*(360.0/n)
         y = R_from*math.cos(math.radians(ang))
         z = R_from*math.sin(math.radians(ang))
         axis = App.Vector(0, math.cos(math.radians(ang)), math.sin(math.radians(ang)))
         st = Part.makeCylinder(r, L, App.Vector(x_pos, y, z), axis)
-        objs.append(add_part(doc, st, f"Standoff_{int(x_pos)}_{a}", color=color, transparency=0, mat=mat))
-    return objs
+        objs.append(st)
+    # LOD draft: el anillo de separadores como un solo objeto de cajas envolventes
+    if lod_wants("proxies"):
+        return [add_part(doc, proxy_array(objs), f"Standoffs_{int(x_pos)}_Proxy", color=color, transparency=0, mat=mat)]
+    return [add_part(doc, st, f"Standoff_{int(x_pos)}_{a}", color=color, transparency=0, mat=mat)
+            for a, st in enumerate(objs)]
 
 # ===================== Subconjuntos (con materiales) =====================
+@brep_cache
 def build_capsule_multilayer(doc):
     objs = []
+    # Las tres capas en una pasada, con interfaces compartidas (externo → interno)
+    hot, ins, struct = capsule_layers(caps_rad, caps_cyl_len, [t_hotface, t_insul, t_struct])
     # Capa 1: Hot-face (C/C)
-    hot = make_capsule_layer(caps_rad, t_hotface)
     o1 = add_part(doc, hot, "Shell_HotFace", color=(0.15,0.15,0.16), transparency=0,
                   mat={"name":"Carbon-Carbon (C/C)", "TmaxC":Tmax_hotface, "notes":"Hot-face TPS; ablativo/RCG opcional"})
     objs.append(o1)
     # Capa 2: Aislamiento (Aerogel / Carbon foam)
-    ins = make_capsule_layer(caps_rad - t_hotface, t_insul)
     o2 = add_part(doc, ins, "Shell_Insulation", color=(0.95,0.88,0.55), transparency=70/100.0,
                   mat={"name":"Silica aerogel / Carbon foam", "TmaxC":Tmax_insul, "notes":"Aislamiento de baja k; ventilado hacia radiadores"})
     objs.append(o2)
     # Capa 3: Estructural (Ti / Inconel)
-    struct = make_capsule_layer(caps_rad - t_hotface - t_insul, t_struct)
     o3 = add_part(doc, struct, "Shell_Structural", color=(0.50,0.54,0.60), transparency=0,
                   mat={"name":"Ti-6Al-4V / Inconel 718", "TmaxC":Tmax_struct, "notes":"Casco portante; puntos de anclaje internos"})
     objs.append(o3)
@@ -194,6 +171,7 @@ def build_capsule_multilayer(doc):
                              mat={"name":"Ti-6Al-4V", "TmaxC":450, "notes":"Anillo de rigidez"}))
     return objs
 
+@brep_cache
 def build_intake_TPS(doc):
     objs=[]
     nose_x = +caps_cyl_len/2.0
@@ -215,7 +193,7 @@ def build_intake_TPS(doc):
                          mat={"name":"C/C Bumper", "TmaxC":Tmax_hotface, "notes":"Protección de borde"}))
 
     # Discos de condensación (cerámicos / metálicos)
-    for i in range(cond_n_discs):
+    for i in range(cond_n_discs if lod_wants("cosmetic") else 0):
         x_i = nose_x + 12.0 + i*cond_disc_pitch
         r_out = intake_d/2.0 - 6.0 - i*2.0
         r_in  = max(10.0, r_out - 10.0)
@@ -233,7 +211,7 @@ def build_plasma_filter(doc):
     shell = outer.cut(inner)
     objs.append(add_part(doc, shell, "PlasmaFilterShell", color=(0.62,0.66,0.72), transparency=0,
                          mat={"name":"Inconel 718 / Ti", "TmaxC":650, "notes":"Carcasa filtro plasma"}))
-    for i in range(filter_pack_n):
+    for i in range(filter_pack_n if lod_wants("cosmetic") else 0):
         xi = x0 - filter_len/2.0 + 10.0 + i*(filter_pack_t + filter_pack_gap)
         disc = Part.makeCylinder(filter_r_out - 10.0, filter_pack_t, App.Vector(xi, 0, 0), App.Vector(1,0,0))
         objs.append(add_part(doc, disc, f"FilterPack_{i}", color=(0.80,0.82,0.86), transparency=0,
@@ -253,36 +231,23 @@ def build_thruster(doc):
     objs.append(add_part(doc, nozzle, "MainNozzle", color=(0.22,0.22,0.24), transparency=0,
                          mat={"name":"C/C / Grafito reforzado", "TmaxC":1200, "notes":"Tobera principal alta T"}))
     # Auxiliares
-    for i in range(rcs_small_n):
-        ang = i*(360.0/rcs_small_n)
-        rad = thruster_body_r + 12.0
-        y = rad*math.cos(math.radians(ang)); z = rad*math.sin(math.radians(ang))
-        cone = Part.makeCone(7.0, 2.5, 22.0)
-        cone = place_shape(cone, rot_axis=App.Vector(0,1,0), rot_deg=90); cone.translate(App.Vector(tail_x - 30.0, y, z))
+    cone = Part.makeCone(7.0, 2.5, 22.0)
+    cone = place_shape(cone, rot_axis=App.Vector(0,1,0), rot_deg=90); cone.translate(App.Vector(tail_x - 30.0, 0, 0))
+    aux = polar_pattern(cone, rcs_small_n, App.Vector(1,0,0), thruster_body_r + 12.0)
+    for i, cone in enumerate(aux):
         objs.append(add_part(doc, cone, f"AuxNozzle_{i}", color=(0.30,0.30,0.34), transparency=0,
                              mat={"name":"C/C", "TmaxC":900, "notes":"Tobera auxiliar"}))
     return objs
 
-def make_annular_sector_face(R_out, R_in, theta_deg, nseg=64):
-    theta = math.radians(theta_deg); half = theta/2.0
-    pts=[]
-    for i in range(nseg+1):
-        ang = -half + (theta*i/nseg)
-        y = R_out*math.cos(ang); z = R_out*math.sin(ang)
-        pts.append(App.Vector(0,y,z))
-    for i in range(nseg, -1, -1):
-        ang = -half + (theta*i/nseg)
-        y = R_in*math.cos(ang); z = R_in*math.sin(ang)
-        pts.append(App.Vector(0,y,z))
-    wire = Part.Wire(Part.makePolygon(pts+[pts[0]]))
-    return Part.Face(wire)
+def make_annular_sector_face(R_out, R_in, theta_deg, nseg=64, thickness=None):
+    # Arcos exactos (nseg se conserva por compatibilidad, ya no se usa)
+    return annular_sector_face(R_out, R_in, theta_deg, thickness)
 
 def build_curved_radiators(doc):
     objs=[]
     R_out = caps_rad + rad_gap_from_hull + rad_radial_t
     R_in  = R_out - rad_radial_t
-    sector_face = make_annular_sector_face(R_out, R_in, rad_angle_deg, nseg=72)
-    panel = sector_face.extrude(App.Vector(rad_len_x, 0, 0)); panel.translate(App.Vector(-rad_len_x/2.0, 0, 0))
+    panel = annular_sector(R_out, R_in, rad_angle_deg, rad_len_x, rad_thickness_profile)  # 6 caras
     matRad = {"name":"C/C aletas + heatpipes Mo/Re", "TmaxC":900, "notes":"Radiador curvo alta T"}
 
     pY = add_part(doc, panel, "Radiator_PosY", color=(0.78,0.80,0.84), transparency=0, mat=matRad)
@@ -340,16 +305,14 @@ def build_tanks_and_pumps(doc):
 # ===================== Ensamblaje y exportación =====================
 def main():
     doc = App.newDocument("HighT_CapsuleCollector")
-    objs=[]
-    objs += build_capsule_multilayer(doc)
-    objs += build_intake_TPS(doc)
-    objs += build_plasma_filter(doc)
-    objs += build_thruster(doc)
-    objs += build_curved_radiators(doc)
-    objs += build_manifolds_and_pipes(doc)
-    objs += build_tanks_and_pumps(doc)
+    builders = [build_capsule_multilayer, build_intake_TPS, build_plasma_filter, build_thruster,
+                build_curved_radiators, build_manifolds_and_pipes, build_tanks_and_pumps]
+    objs = build_parallel(doc, builders, workers=None if parallel_build else 1)
 
     doc.recompute()
+    if not lod_wants("export"):
+        App.Console.PrintMessage("LOD %s: sin exportación STEP\n" % lod_level())
+        return doc
     try:
         Part.export([o for o in objs if o is not None], export_path)
         App.Console.PrintMessage("STEP exportado a: %s\n" % export_path)
@@ -357,5 +320,6 @@ def main():
         App.Console.PrintError("No se pudo exportar STEP: %s\n" % e)
     return doc
 
-# Ejecutar
-main()
+# Ejecutar (no al cargarse como módulo en un worker de build_parallel)
+if __name__ == "__main__":
+    main()
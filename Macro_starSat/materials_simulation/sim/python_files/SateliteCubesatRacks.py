@@ -1,8 +1,13 @@
 
 import math
+import os, sys
 import FreeCAD as App
 import Part
 
+_REPO = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", ".."))
+if _REPO not in sys.path: sys.path.insert(0, _REPO)
+from starsat import BuildTree, build_parallel, cut_all, fuse_all, paraboloid_shell, paraboloid_solid, polar_pattern, report_fuse_stats
+
 # ===================== Parámetros (mm) =====================
 # Bus principal
 p_bus_w = 160.0
@@ -80,43 +85,19 @@ ion_ring_R    = 42.0
 
 # Exportación
 export_path = App.getUserAppDataDir() + "Satellite_Complex.step"
+# Subconjuntos en workers FreeCADCmd paralelos (secuencial si no hay FreeCADCmd)
+parallel_build = True
 export_as_single_compound = False
+# Todas las piezas en un único objeto (compound + tabla de etiquetas/colores); exporta también <export>.bom.csv
+single_object = True
 
 # ===================== Funciones utilitarias =====================
-def parabola_r(z, d, depth):
-    if depth <= 0: return 0.0
-    f = (d*d) / (16.0*depth)
-    val = 4.0*f*z
-    return math.sqrt(val) if val > 0 else 0.0
-
 def make_revolved_solid_from_diameter(d, depth, steps=72, z0_eps_factor=1.0):
-    if d <= 0 or depth <= 0: return None
-    steps = max(24, int(steps))
-    z0 = depth / (steps * z0_eps_factor)
-    p_axis_bot = App.Vector(0,0,z0)
-    p_axis_top = App.Vector(0,0,depth)
-    e_axis = Part.makeLine(p_axis_bot, p_axis_top)
-    r_max = parabola_r(depth, d, depth)
-    p_top_out = App.Vector(r_max, 0, depth)
-    e_top = Part.makeLine(p_axis_top, p_top_out)
-    outer_pts = []
-    for i in range(steps+1):
-        z = depth - (depth - z0) * (i/steps)
-        r = parabola_r(z, d, depth)
-        outer_pts.append(App.Vector(r,0,z))
-    e_curve = Part.makePolygon(outer_pts)
-    p_bot_out = outer_pts[-1]
-    e_bot = Part.makeLine(p_bot_out, p_axis_bot)
-    wire = Part.Wire([e_axis, e_top, e_curve, e_bot])
-    face = Part.Face(wire)
-    return face.revolve(App.Vector(0,0,0), App.Vector(0,0,1), 360)
+    # Perfil parabólico exacto (Bézier): steps solo fija el recorte del vértice z0
+    return paraboloid_solid(d, depth, depth / (max(24, int(steps)) * z0_eps_factor))
 
 def make_dish_layer_solid(d, depth, t, steps=72):
-    outer = make_revolved_solid_from_diameter(d, depth, steps)
-    d_inner = d - 2.0*t
-    if d_inner <= 0.1: return outer
-    inner = make_revolved_solid_from_diameter(d_inner, depth, steps)
-    return outer.cut(inner)
+    return paraboloid_shell(d, depth, t, depth / max(24, int(steps)))
 
 def make_ring(r_outer, r_inner, h, base=App.Vector(0,0,0), axis=App.Vector(1,0,0)):
     return Part.makeCylinder(r_outer, h, base, axis).cut(Part.makeCylinder(r_inner, h, base, axis))
@@ -129,16 +110,9 @@ def place_shape(shape, pos=App.Vector(0,0,0), rot_axis=App.Vector(0,1,0), rot_de
     sh.Placement = pl
     return sh
 
-def add_part(doc, shape, name, color=(0.8,0.8,0.8), transparency=0):
-    if shape is None: return None
-    obj = doc.addObject("Part::Feature", name)
-    obj.Shape = shape
-    try:
-        obj.ViewObject.ShapeColor = color
-        obj.ViewObject.Transparency = int(max(0, min(100, round(transparency*100))))
-    except Exception:
-        pass
-    return obj
+def add_part(tree, group, shape, name, color=(0.8,0.8,0.8), transparency=0):
+    # Solo las piezas finales entran en el árbol; las herramientas de corte son formas sueltas
+    return tree.part(name, shape, color, int(max(0, min(100, round(transparency*100)))), parent=group)
 
 def make_trapezoid_plate(len_x, w_root, w_tip, t_y):
     pts = [
@@ -152,21 +126,15 @@ def make_trapezoid_plate(len_x, w_root, w_tip, t_y):
     solid = face.extrude(App.Vector(0, t_y, 0))
     return place_shape(solid, pos=App.Vector(0,-t_y/2.0,0))
 
-def fuse_safely(shapes):
-    shapes = [s for s in shapes if s is not None]
-    if not shapes: return None
-    acc = shapes[0]
-    for s in shapes[1:]:
-        try: acc = acc.fuse(s)
-        except Exception: pass
-    return acc
+def fuse_safely(shapes, label=None):
+    return fuse_all(shapes, label)
 
 def cut_safely(a, b):
     try: return a.cut(b)
     except Exception: return a
 
 # ===================== Bus estructural =====================
-def build_bus(doc):
+def build_bus(tree):
     objs = []
     # Caja exterior
     box = Part.makeBox(p_bus_w, p_bus_d, p_bus_h)
@@ -175,7 +143,7 @@ def build_bus(doc):
     inner = Part.makeBox(p_bus_w-2*bus_skin_t, p_bus_d-2*bus_skin_t, p_bus_h-2*bus_skin_t)
     inner.translate(App.Vector(- (p_bus_w-2*bus_skin_t)/2.0, - (p_bus_d-2*bus_skin_t)/2.0, - (p_bus_h-2*bus_skin_t)/2.0))
     shell = box.cut(inner)
-    objs.append(add_part(doc, shell, "BusShell", color=(0.35,0.35,0.40)))
+    objs.append(add_part(tree, "Bus", shell, "BusShell", color=(0.35,0.35,0.40)))
 
     # Marcos internos longitudinales
     frame_thickness = 1.5
@@ -185,23 +153,23 @@ def build_bus(doc):
         fr = Part.makeBox(frame_length, frame_thickness, frame_height)
         fr.translate(App.Vector(-frame_length/2.0, -frame_thickness/2.0, -frame_height/2.0))
         fr = place_shape(fr, pos=App.Vector(xi, 0, 0), rot_axis=App.Vector(0,0,1), rot_deg=90)
-        objs.append(add_part(doc, fr, f"BusFrame_{idx}", color=(0.45,0.45,0.48), transparency=0.6))
+        objs.append(add_part(tree, "Bus", fr, f"BusFrame_{idx}", color=(0.45,0.45,0.48), transparency=0.6))
 
     # Railes superiores/inferiores
     rail_w = 6.0
     for idx, z in enumerate((-p_bus_h/2.0 + 10.0, p_bus_h/2.0 - 10.0)):
         rail = Part.makeBox(p_bus_w - 12.0, rail_w, rail_w)
         rail.translate(App.Vector(-(p_bus_w - 12.0)/2.0, -rail_w/2.0, z - rail_w/2.0))
-        objs.append(add_part(doc, rail, f"BusRail_{idx}", color=(0.50,0.50,0.55), transparency=0.3))
+        objs.append(add_part(tree, "Bus", rail, f"BusRail_{idx}", color=(0.50,0.50,0.55), transparency=0.3))
 
     # Placa de montaje frontal para escudo térmico
     ring_mount = make_ring(r_outer=(shield_d/2.0 - 22.0), r_inner=(shield_d/2.0 - 28.0), h=3.0,
                            base=App.Vector(p_bus_w/2.0 - 1.0, 0, 0), axis=App.Vector(1,0,0))
-    objs.append(add_part(doc, ring_mount, "BusFrontMount", color=(0.65,0.65,0.68)))
+    objs.append(add_part(tree, "Bus", ring_mount, "BusFrontMount", color=(0.65,0.65,0.68)))
     return [o for o in objs if o]
 
 # ===================== Escudo térmico frontal (TPS) =====================
-def build_heat_shield(doc):
+def build_heat_shield(tree):
     objs = []
     r0 = shield_d/2.0
     r1 = shield_d/2.0 - shield_cone*0.25
@@ -217,23 +185,24 @@ def build_heat_shield(doc):
     backX  = place_shape(Part.makeCone(r2, r3, h_back),  pos=App.Vector(x0+h_front+h_core,0,0), rot_axis=App.Vector(0,1,0), rot_deg=90)
 
     objs += [
-        add_part(doc, frontX, "TPS_Front", color=(0.98,0.98,0.98)),
-        add_part(doc, coreX,  "TPS_Core",  color=(0.40,0.40,0.40)),
-        add_part(doc, backX,  "TPS_Back",  color=(0.05,0.05,0.05)),
+        add_part(tree, "HeatShield", frontX, "TPS_Front", color=(0.98,0.98,0.98)),
+        add_part(tree, "HeatShield", coreX,  "TPS_Core",  color=(0.40,0.40,0.40)),
+        add_part(tree, "HeatShield", backX,  "TPS_Back",  color=(0.05,0.05,0.05)),
     ]
 
     # Anillo soporte con aligeramientos
     ring_Z = make_ring(r_outer=(shield_d/2.0 - 12.0), r_inner=(shield_d/2.0 - 18.0), h=3.0)
     hole_r = 2.2
     hole_count = 12
+    holes = []
     for i in range(hole_count):
         a = math.radians(360.0/hole_count * i)
         y = (shield_d/2.0 - 15.0) * math.cos(a)
         z = (shield_d/2.0 - 15.0) * math.sin(a)
-        hole_cyl = Part.makeCylinder(hole_r, 4.0, App.Vector(0, y, z), App.Vector(1,0,0))
-        ring_Z = ring_Z.cut(hole_cyl)
+        holes.append(Part.makeCylinder(hole_r, 4.0, App.Vector(0, y, z), App.Vector(1,0,0)))
+    ring_Z = cut_all(ring_Z, holes, "tps_ring_holes")
     ring_X = place_shape(ring_Z, pos=App.Vector(x0 - shield_back_standoff, 0, 0), rot_axis=App.Vector(0,1,0), rot_deg=90)
-    objs.append(add_part(doc, ring_X, "TPS_SupportRing", color=(0.75,0.75,0.75)))
+    objs.append(add_part(tree, "HeatShield", ring_X, "TPS_SupportRing", color=(0.75,0.75,0.75)))
 
     # Puntales radiales al bus
     for a in range(0,360,60):
@@ -242,11 +211,11 @@ def build_heat_shield(doc):
         y = (shield_d/2.0 - 18.0) * math.cos(math.radians(a))
         z = (shield_d/2.0 - 18.0) * math.sin(math.radians(a))
         cyl.translate(App.Vector(x0 - shield_back_standoff, y, z))
-        objs.append(add_part(doc, cyl, f"TPS_Strut_{a}", color=(0.75,0.75,0.75)))
+        objs.append(add_part(tree, "HeatShield", cyl, f"TPS_Strut_{a}", color=(0.75,0.75,0.75)))
     return [o for o in objs if o]
 
 # ===================== Cortina lateral segmentada (protección micrometeoritos) =====================
-def build_side_curtain(doc):
+def build_side_curtain(tree):
     objs = []
     total_t = shield_cc_t + shield_kevl_t + shield_flex_t
     r_outer = max(p_bus_d, p_bus_h)/2.0 + shield_gap_side
@@ -257,24 +226,25 @@ def build_side_curtain(doc):
     # Segmentación: ranuras tangenciales
     slit_len = shield_rad_len + 2.0
     slab_h = 2.2 * r_outer
+    slots = []
     for i in range(shield_seg_count):
         ang = 360.0 * i / shield_seg_count
         slot = Part.makeBox(slit_len, shield_slot_w, slab_h,
                             App.Vector(x_base - shield_rad_len, -shield_slot_w/2.0, -slab_h/2.0))
-        slot = place_shape(slot, rot_axis=App.Vector(1,0,0), rot_deg=ang)
-        ring = cut_safely(ring, slot)
-    objs.append(add_part(doc, ring, "SideCurtain", color=(0.55,0.58,0.62), transparency=0.25))
+        slots.append(place_shape(slot, rot_axis=App.Vector(1,0,0), rot_deg=ang))
+    ring = cut_all(ring, slots, "curtain_slots")
+    objs.append(add_part(tree, "SideCurtain", ring, "SideCurtain", color=(0.55,0.58,0.62), transparency=0.25))
     # Puntales de soporte desde caras ±Y de bus a la cortina
     for j in range(shield_support_rods):
         ang = 360.0 * j / shield_support_rods
         y = r_outer * math.cos(math.radians(ang))
         z = r_outer * math.sin(math.radians(ang))
         rod = Part.makeCylinder(1.6, shield_rad_len * 0.45, App.Vector(x_base - shield_rad_len*0.45, y, z), App.Vector(1,0,0))
-        objs.append(add_part(doc, rod, f"CurtainRod_{j}", color=(0.7,0.7,0.72)))
+        objs.append(add_part(tree, "SideCurtain", rod, f"CurtainRod_{j}", color=(0.7,0.7,0.72)))
     return objs
 
 # ===================== Panel solar con bisagras =====================
-def build_paddle(doc, side=+1):
+def build_paddle(tree, side=+1):
     objs = []
     plate = make_trapezoid_plate(paddle_len, paddle_root_w, paddle_tip_w, paddle_t)
     hinge = Part.makeCylinder(2.4, 6.0, App.Vector(0,0,0), App.Vector(1,0,0))
@@ -300,15 +270,15 @@ def build_paddle(doc, side=+1):
     bracket.translate(App.Vector(p_bus_w/2.0 - 6.0, y - 4.0, -6.0))
 
     objs += [
-        add_part(doc, plate_rot, f"PaddlePlate_{'R' if side>0 else 'L'}", color=(0.16,0.36,0.76)),
-        add_part(doc, hinge_rot, f"PaddleHinge_{'R' if side>0 else 'L'}", color=(0.6,0.6,0.6)),
-        add_part(doc, arm_rot,   f"PaddleArm_{'R' if side>0 else 'L'}",   color=(0.5,0.5,0.5)),
-        add_part(doc, bracket,   f"PaddleBracket_{'R' if side>0 else 'L'}", color=(0.45,0.45,0.48)),
+        add_part(tree, "Paddles", plate_rot, f"PaddlePlate_{'R' if side>0 else 'L'}", color=(0.16,0.36,0.76)),
+        add_part(tree, "Paddles", hinge_rot, f"PaddleHinge_{'R' if side>0 else 'L'}", color=(0.6,0.6,0.6)),
+        add_part(tree, "Paddles", arm_rot,   f"PaddleArm_{'R' if side>0 else 'L'}",   color=(0.5,0.5,0.5)),
+        add_part(tree, "Paddles", bracket,   f"PaddleBracket_{'R' if side>0 else 'L'}", color=(0.45,0.45,0.48)),
     ]
     return objs
 
 # ===================== Radiadores con aletas =====================
-def build_radiators(doc):
+def build_radiators(tree):
     objs = []
     # Plano base (x detrás del bus, centrado en Y/Z)
     x0 = -p_bus_w/2.0 - radiator_back_offset
@@ -321,23 +291,23 @@ def build_radiators(doc):
         fin = Part.makeBox(radiator_fin_len, radiator_fin_w, radiator_fin_pitch*0.8)
         fin.translate(App.Vector(x0 - radiator_w/2.0 - radiator_fin_len, -radiator_fin_w/2.0, z - (radiator_fin_pitch*0.8)/2.0))
         fins.append(fin)
-    rad = fuse_safely([base] + fins)
-    objs.append(add_part(doc, rad, "Radiator_A", color=(0.9,0.3,0.2)))
+    rad = fuse_safely([base] + fins, "radiator_fins")
+    objs.append(add_part(tree, "Radiators", rad, "Radiator_A", color=(0.9,0.3,0.2)))
     # Duplicado desplazado en +Z
     rad2 = rad.copy()
     rad2.translate(App.Vector(0, 0, radiator_h + 22.0))
-    objs.append(add_part(doc, rad2, "Radiator_B", color=(0.88,0.32,0.22)))
+    objs.append(add_part(tree, "Radiators", rad2, "Radiator_B", color=(0.88,0.32,0.22)))
     return objs
 
 # ===================== Antenas y platos traseros =====================
-def build_antennas(doc):
+def build_antennas(tree):
     objs = []
     # Faraday (boom corto lateral +Y)
     far_boom = Part.makeCylinder(faraday_r/3.0, faraday_len, App.Vector(0, p_bus_d/2.0, 0), App.Vector(0,1,0))
-    objs.append(add_part(doc, far_boom, "FaradayBoom", color=(0.6,0.6,0.65)))
+    objs.append(add_part(tree, "Antennas", far_boom, "FaradayBoom", color=(0.6,0.6,0.65)))
     # Whip (vertical +Z)
     whip = Part.makeCylinder(whip_r, whip_len, App.Vector(0, 0, p_bus_h/2.0), App.Vector(0,0,1))
-    objs.append(add_part(doc, whip, "WhipAntenna", color=(0.2,0.2,0.2)))
+    objs.append(add_part(tree, "Antennas", whip, "WhipAntenna", color=(0.2,0.2,0.2)))
     # Plato trasero (paraboloide) con bumper-ring y boom
     dish = make_dish_layer_solid(back_dish_d, back_dish_depth, t=1.4, steps=steps_profile)
     dish = place_shape(dish, pos=App.Vector(-p_bus_w/2.0 - boom_len_back - back_dish_depth, 0, 0),
@@ -348,57 +318,59 @@ def build_antennas(doc):
     boom = Part.makeCylinder(boom_r, boom_len_back, App.Vector(-p_bus_w/2.0 - boom_len_back, 0, 0), App.Vector(1,0,0))
     tip  = Part.makeSphere(boom_tip_r, App.Vector(-p_bus_w/2.0 - boom_len_back - back_dish_depth - 2.0, 0, 0))
     objs += [
-        add_part(doc, dish, "BackDish", color=(0.75,0.75,0.78)),
-        add_part(doc, bumper, "DishRim", color=(0.5,0.5,0.55)),
-        add_part(doc, boom, "DishBoom", color=(0.55,0.55,0.6)),
-        add_part(doc, tip, "DishTip", color=(0.3,0.3,0.35)),
+        add_part(tree, "Antennas", dish, "BackDish", color=(0.75,0.75,0.78)),
+        add_part(tree, "Antennas", bumper, "DishRim", color=(0.5,0.5,0.55)),
+        add_part(tree, "Antennas", boom, "DishBoom", color=(0.55,0.55,0.6)),
+        add_part(tree, "Antennas", tip, "DishTip", color=(0.3,0.3,0.35)),
     ]
     return objs
 
 # ===================== Tanques, Rueda de reacción, RCS =====================
-def build_tanks_and_adcs(doc):
+def build_tanks_and_adcs(tree):
     objs = []
     # Dos tanques cilíndricos laterales en ±Y (eje X)
     x_base = -p_bus_w/2.0 - 10.0
     for sgn in (-1, +1):
         tank = Part.makeCylinder(tank_radius, tank_length, App.Vector(x_base - tank_length, sgn*(p_bus_d/2.0 + tank_radius + 6.0), 0), App.Vector(1,0,0))
-        objs.append(add_part(doc, tank, f"Tank_{'P' if sgn<0 else 'S'}", color=(0.82,0.82,0.88)))
+        objs.append(add_part(tree, "TanksADCS", tank, f"Tank_{'P' if sgn<0 else 'S'}", color=(0.82,0.82,0.88)))
     # Rueda de reacción (inside bus, eje X)
     rw = Part.makeCylinder(rwheel_r, rwheel_t, App.Vector(-rwheel_t/2.0, 0, 0), App.Vector(1,0,0))
-    objs.append(add_part(doc, rw, "ReactionWheel", color=(0.35,0.35,0.38)))
+    objs.append(add_part(tree, "TanksADCS", rw, "ReactionWheel", color=(0.35,0.35,0.38)))
     # RCS: 6 toberas (±Y y ±Z, en caras)
     # ±Y
     for sgn in (-1, +1):
         base = App.Vector(0, sgn*(p_bus_d/2.0 + 0.5), 0)
         cone = Part.makeCone(rcs_cone_r1, rcs_cone_r2, rcs_cone_h, base, App.Vector(0, sgn, 0))
-        objs.append(add_part(doc, cone, f"RCS_Y_{'N' if sgn<0 else 'P'}", color=(0.6,0.6,0.62)))
+        objs.append(add_part(tree, "TanksADCS", cone, f"RCS_Y_{'N' if sgn<0 else 'P'}", color=(0.6,0.6,0.62)))
     # ±Z
     for sgn in (-1, +1):
         base = App.Vector(0, 0, sgn*(p_bus_h/2.0 + 0.5))
         cone = Part.makeCone(rcs_cone_r1, rcs_cone_r2, rcs_cone_h, base, App.Vector(0, 0, sgn))
-        objs.append(add_part(doc, cone, f"RCS_Z_{'N' if sgn<0 else 'P'}", color=(0.6,0.6,0.62)))
+        objs.append(add_part(tree, "TanksADCS", cone, f"RCS_Z_{'N' if sgn<0 else 'P'}", color=(0.6,0.6,0.62)))
     return objs
 
 # ===================== Propulsión iónica trasera =====================
-def build_ion_ring(doc):
+def build_ion_ring(tree):
     objs = []
     x0 = -p_bus_w/2.0 - 16.0
     # Aro soporte
     ring = make_ring(ion_ring_R+6.0, ion_ring_R-6.0, 3.0, base=App.Vector(x0-3.0, 0, 0), axis=App.Vector(1,0,0))
-    objs.append(add_part(doc, ring, "IonSupportRing", color=(0.55,0.6,0.65)))
-    for i in range(ion_count):
-        ang = 2*math.pi*i/ion_count
-        y = ion_ring_R*math.cos(ang)
-        z = ion_ring_R*math.sin(ang)
-        body = Part.makeCylinder(ion_body_r, ion_body_L, App.Vector(x0-ion_body_L, y, z), App.Vector(1,0,0))
-        grid_o = Part.makeCylinder(ion_grid_r_o, ion_grid_t, App.Vector(x0, y, z), App.Vector(1,0,0))
-        grid_i = Part.makeCylinder(ion_grid_r_i, ion_grid_t, App.Vector(x0, y, z), App.Vector(1,0,0))
-        grid = cut_safely(grid_o, grid_i)
-        noz  = Part.makeCone(ion_nozzle_r1, ion_nozzle_r2, ion_nozzle_L, App.Vector(x0-ion_body_L-ion_nozzle_L, y, z), App.Vector(1,0,0))
+    objs.append(add_part(tree, "IonRing", ring, "IonSupportRing", color=(0.55,0.6,0.65)))
+    # Propulsor semilla en el eje (una sola construcción); instancias sobre el aro
+    body = Part.makeCylinder(ion_body_r, ion_body_L, App.Vector(x0-ion_body_L, 0, 0), App.Vector(1,0,0))
+    grid_o = Part.makeCylinder(ion_grid_r_o, ion_grid_t, App.Vector(x0, 0, 0), App.Vector(1,0,0))
+    grid_i = Part.makeCylinder(ion_grid_r_i, ion_grid_t, App.Vector(x0, 0, 0), App.Vector(1,0,0))
+    grid = cut_safely(grid_o, grid_i)
+    noz  = Part.makeCone(ion_nozzle_r1, ion_nozzle_r2, ion_nozzle_L, App.Vector(x0-ion_body_L-ion_nozzle_L, 0, 0), App.Vector(1,0,0))
+    ring_axis = App.Vector(1,0,0)
+    bodies = polar_pattern(body, ion_count, ring_axis, ion_ring_R)
+    grids  = polar_pattern(grid, ion_count, ring_axis, ion_ring_R)
+    nozs   = polar_pattern(noz,  ion_count, ring_axis, ion_ring_R)
+    for i, (body, grid, noz) in enumerate(zip(bodies, grids, nozs)):
         objs += [
-            add_part(doc, body, f"IonBody_{i}", color=(0.52,0.55,0.6)),
-            add_part(doc, grid, f"IonGrid_{i}", color=(0.62,0.65,0.7)),
-            add_part(doc, noz,  f"IonNoz_{i}",  color=(0.45,0.48,0.52)),
+            add_part(tree, "IonRing", body, f"IonBody_{i}", color=(0.52,0.55,0.6)),
+            add_part(tree, "IonRing", grid, f"IonGrid_{i}", color=(0.62,0.65,0.7)),
+            add_part(tree, "IonRing", noz,  f"IonNoz_{i}",  color=(0.45,0.48,0.52)),
         ]
     return objs
 
@@ -421,26 +393,31 @@ def export_step(objs, path, as_single=False):
     else:
         IG.export(objs, path)
 
-def build_spacecraft(doc):
-    parts = []
-    parts += build_bus(doc)
-    parts += build_heat_shield(doc)
-    parts += build_side_curtain(doc)
-    parts += build_paddle(doc, side=+1)
-    parts += build_paddle(doc, side=-1)
-    parts += build_radiators(doc)
-    parts += build_antennas(doc)
-    parts += build_tanks_and_adcs(doc)
-    parts += build_ion_ring(doc)
+def build_spacecraft(tree):
+    # Constructores independientes (solo geometría): cada uno puede ir a su propio worker
+    builders = [build_bus, build_heat_shield, build_side_curtain, (build_paddle, +1), (build_paddle, -1),
+                build_radiators, build_antennas, build_tanks_and_adcs, build_ion_ring]
+    parts = build_parallel(tree, builders, workers=None if parallel_build else 1)
     return [p for p in parts if p is not None]
 
 def main():
     doc = App.ActiveDocument
     if doc is None:
         doc = App.newDocument("Satellite_Compact")
-    objs = build_spacecraft(doc)
+    # Árbol en memoria; el documento solo recibe las piezas finales, de una vez
+    tree = BuildTree()
+    build_spacecraft(tree)
+    if single_object:
+        asm = tree.to_assembly()
+        objs = [asm.materialize(doc, "Satellite")]
+        doc.recompute()
+        asm.export(export_path)
+        report_fuse_stats()
+        return doc, objs
+    objs = tree.materialize(doc)
     doc.recompute()
     export_step(objs, export_path, export_as_single_compound)
+    report_fuse_stats()
     return doc, objs
 
 if __name__ == "__main__":
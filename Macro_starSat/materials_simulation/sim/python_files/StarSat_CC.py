@@ -1,6 +1,11 @@
 # StarSat_CC_Advanced — Satélite / nave modular con capas Carbon‑Carbon, ablativos y protección radiológica con blindaje fuerte
 
 import FreeCAD as App, FreeCADGui as Gui, Part, math, random
+import os, sys
+
+_REPO = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", ".."))
+if _REPO not in sys.path: sys.path.insert(0, _REPO)
+from starsat import add_greebles, sample_greebles
 doc = App.newDocument("StarSat_CC_Advanced")
 
 # ---------------------------
@@ -21,7 +26,7 @@ P = dict(
     thruster_h=18.0, thruster_r1=6.0, thruster_r2=2.4,
     turret_r=12.0, turret_h=15.0, cannon_len=36.0, cannon_r=3.3,
     turret_positions=[(15.0,27.0,"top"),(-15.0,-27.0,"top"),(-30.0,0.0,"bot")],
-    greeble_density=0.45, greeble_h=(1.8,6.0), greeble_a=(1.8,9.0),
+    greeble_density=0.45, greeble_h=(1.8,6.0), greeble_a=(1.8,9.0), greeble_seed=42,
     # Carbon-Carbon / ablative specifics (informational)
     cc_density_g_cm3=1.87,  # g/cm3 -> 1870 kg/m3
     cc_Tmax=2500.0,         # °C
@@ -314,21 +319,15 @@ def make_radiation_layers():
     tag_material_props(l2_o, MATS["POLY"]["name"], density=MATS["POLY"]["density"], emissivity=MATS["POLY"]["emissivity"], k=MATS["POLY"]["k"])
 
 def make_greebles():
+    # Un solo compound: posiciones Poisson sin solapes, deterministas por greeble_seed
     density = P['greeble_density']; 
     if density <= 0: return
     deck_len = P['bus_w']*P['hull_scale'] + P['prow_len'] + P['stern_len']; x_min = -deck_len/2.0 + 8.0; x_max = deck_len/2.0 - 8.0
     y_min = -P['bus_d']*0.35; y_max = P['bus_d']*0.35; z = P['bus_h']/2.0 + P['deck_thk']/2.0 + 0.6
     area = (x_max-x_min)*(y_max-y_min); n = int(area * 0.0025 * density)
-    for i in range(n):
-        w = random.uniform(*P['greeble_a']); d = random.uniform(*P['greeble_a'])*0.6; h = random.uniform(*P['greeble_h'])
-        x = random.uniform(x_min,x_max); y = random.uniform(y_min,y_max)
-        if abs(y) < 6.0 and abs(x) < 10.0: continue
-        g = centered_box(w,d,h); g = T(g,(x,y,z + h/2.0))
-        if random.random() < 0.25:
-            c = cyl(h*0.9, min(w,d)*0.35, axis='Z', center=True); c = T(c,(x + (w*0.15*(1 if random.random()<0.5 else -1)), y, z + h + h*0.45))
-            add_obj(Part.Compound([g,c]), f"GreebleCyl_{i}", P['col_greeble'], g_gree)
-        else:
-            add_obj(g, f"Greeble_{i}", P['col_greeble'], g_gree)
+    els = sample_greebles(x_min, x_max, y_min, y_max, n, P['greeble_a'], P['greeble_h'], seed=P['greeble_seed'],
+                          keep=lambda x, y: not (abs(y) < 6.0 and abs(x) < 10.0))
+    add_greebles(doc, "Greebles_Compound", els, z, P['col_greeble'], g_gree)
 
 # ...existing code...
 def box(w,d,h, p=(0,0,0)): 
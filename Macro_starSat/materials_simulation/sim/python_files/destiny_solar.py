@@ -1,12 +1,14 @@
 import FreeCAD as App
 import Part
+import os, sys
+
+_REPO = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", ".."))
+if _REPO not in sys.path: sys.path.insert(0, _REPO)
+from starsat import brep_cache, fillet_edges
 
 def safe_fillet(shape, radius):
-    """Apply fillet to shape edges safely."""
-    try:
-        return shape.makeFillet(radius, shape.Edges)
-    except:
-        return shape
+    """Fillet the sharp edges where the radius fits; unchanged shape if OCC fails."""
+    return fillet_edges(shape, radius, "sharp")
 
 def rot_to_x():
     """Rotation to align along x-axis."""
@@ -60,6 +62,7 @@ def make_stylized_hull():
     hull = Part.makeLoft([profile1, profile2], True)
     return safe_fillet(hull, 20.0)
 
+@brep_cache
 def make_solar_shield_layers(cx, cy, cz):
     """Create multi-layer solar shields with Destiny-style."""
     layers = []
@@ -2,10 +2,13 @@
 # Versión mejorada: carcasa CNC sólida, blindaje y amortiguación
 # Ejecutar dentro de FreeCAD (Python console / Macros)
 import FreeCAD as App, FreeCADGui as Gui, Part, math
+import os, sys
+_REPO = os.path.dirname(os.path.abspath(__file__))
+if _REPO not in sys.path: sys.path.insert(0, _REPO)
+from starsat import BuildGraph, axial_profile, fillet_edges, heal, inset_solid, laminate, report_healing, reuse_document, solidify
 doc_name="Direct_Fusion_Drive_enhanced"
-if App.ActiveDocument is None or App.ActiveDocument.Label!=doc_name:
-    App.newDocument(doc_name)
-doc=App.ActiveDocument
+# Se reutiliza el documento si ya existe: el grafo solo recalcula los bloques afectados
+doc=reuse_document(doc_name)
 
 # Parámetros base (heredados + nuevos)
 P={"nose_len":800.0,"nose_base_d":600.0,"mid_len":1400.0,"mid_d":900.0,"rear_len":800.0,"rear_d":1200.0,
@@ -42,165 +45,154 @@ MAT={'AL':{'name':'AA-2xxx','rho':2700.0,'E':72e9,'nu':0.33},
 # Vectores y utilidades
 X=App.Vector(1,0,0);Y=App.Vector(0,1,0);Z=App.Vector(0,0,1)
 def R(): return App.Rotation(Y,90)
-def O(s,l): 
-    o=doc.addObject("Part::Feature",l); o.Shape=s; return o
 def M(o,m):
+    # Idempotente: el objeto puede venir reutilizado de una ejecución anterior
     if not o: return
     d=MAT.get(m,{})
-    o.addProperty("App::PropertyString","Material","Meta","").Material=d.get("name","")
-    o.addProperty("App::PropertyFloat","Density","Meta","").Density=d.get("rho",0.0)
+    for p,t in (("Material","App::PropertyString"),("Density","App::PropertyFloat")):
+        if p not in o.PropertiesList: o.addProperty(t,p,"Meta","")
+    o.Material=d.get("name",""); o.Density=d.get("rho",0.0)
 
-# Primitivas básicas centradas en X eje
-def C(d,L,cx=0,cy=0,cz=0,l="C"): 
+# Primitivas básicas centradas en X eje (formas; los objetos los crea el grafo)
+def C(d,L,cx=0,cy=0,cz=0):
     s=Part.makeCylinder(d/2,L)
     s.Placement=App.Placement(App.Vector(cx-L/2,cy,cz),R())
-    return O(s,l)
+    return s
 
-def K(d1,d2,L,cx=0,cy=0,cz=0,l="K"):
+def K(d1,d2,L,cx=0,cy=0,cz=0):
     s=Part.makeCone(d1/2,d2/2,L)
     s.Placement=App.Placement(App.Vector(cx-L/2,cy,cz),R())
-    return O(s,l)
+    return s
 
-def fuse_shapes(list_objs, name="Fused"):
-    # fuse una lista de objetos (Part.Shape) y devuelve Part.Shape
-    if not list_objs: return None
-    s = list_objs[0].Shape
-    for o in list_objs[1:]:
+def fuse_shapes(shapes, name="Fused"):
+    # fuse una lista de Part.Shape y devuelve Part.Shape
+    if not shapes: return None
+    s = shapes[0]
+    for i, o in enumerate(shapes[1:], 1):
         try:
-            s = s.fuse(o.Shape)
+            s = s.fuse(o)
         except Exception as e:
-            print("Advertencia fuse fallo entre:", e)
+            # Operandos sospechosos: reparar (validez cacheada por forma) y reintentar
+            print("Advertencia fuse fallo en %s, se reparan los operandos:" % name, e)
+            s, o = heal(s, name), heal(o, "%s[%d]" % (name, i))
             try:
-                s = s.fuse(o.Shape.tessellate(1.0))
-            except:
-                pass
+                s = s.fuse(o)
+            except Exception as e2:
+                App.Console.PrintWarning("fuse_shapes[%s]: operando %d descartado tras reparar (%s)\n" % (name, i, e2))
     return s
 
 def fillet_large(solid, r=6):
-    try:
-        f = solid.makeFillet(r,[e for e in solid.Edges if e.Length>30])
-        return f
-    except:
-        return solid
+    return fillet_edges(solid, r, "sharp", min_length=30)
+
+def hull_profile(P):
+    # Perfil meridiano (x, r) del fuselaje, igual que Nose/Mid/Rear: cono con la base en x=0 y
+    # la punta en x=nose_len (apoyada en el cilindro medio) + cilindros medio y trasero
+    return axial_profile([(P["nose_len"],P["nose_base_d"]/2,0.0),(P["mid_len"],P["mid_d"]/2,P["mid_d"]/2),
+                          (P["rear_len"],P["rear_d"]/2,P["rear_d"]/2)])
+
+G = BuildGraph(doc, P)
 
 # 1) Construir fuselaje externo por primitivas (más robusto que offset único)
-nose_ext = K(P["nose_base_d"],0,P["nose_len"],P["nose_len"]/2,"nose_ext"); M(nose_ext,"AL")
-mid_ext  = C(P["mid_d"],P["mid_len"],P["nose_len"]+P["mid_len"]/2,"mid_ext"); M(mid_ext,"AL")
-rear_ext = C(P["rear_d"],P["rear_len"],P["nose_len"]+P["mid_len"]+P["rear_len"]/2,"rear_ext"); M(rear_ext,"AL")
-
-outer_shape = fuse_shapes([nose_ext, mid_ext, rear_ext],"outer_fuselage_shape")
-if outer_shape is None:
-    raise RuntimeError("No se pudo construir la forma externa del fuselaje.")
-
-outer_shape = fillet_large(outer_shape, r=12)
-OuterHull = O(outer_shape,"OuterHull"); M(OuterHull,"AL")
-
-# 2) Construir fuselaje interior (clearance para equipos) mediante primitives reducidas (evita offset problemático)
-def safe_positive(val):
-    return val if val>1.0 else 1.0
-
-h=P["hull_t"]
-nose_in_d = safe_positive(P["nose_base_d"]-2*(h+P["shield_t"]+P["impact_t"]))
-mid_in_d  = safe_positive(P["mid_d"]-2*(h+P["shield_t"]+P["impact_t"]))
-rear_in_d = safe_positive(P["rear_d"]-2*(h+P["shield_t"]+P["impact_t"]))
-nose_in_len = max(10.0, P["nose_len"]-2*h)
-mid_in_len  = max(10.0, P["mid_len"]-2*h)
-rear_in_len = max(10.0, P["rear_len"]-2*h)
-
-nose_int = K(nose_in_d,0,nose_in_len,P["nose_len"]/2,"nose_int"); M(nose_int,"AL")
-mid_int  = C(mid_in_d,mid_in_len,P["nose_len"]+P["mid_len"]/2,"mid_int"); M(mid_int,"AL")
-rear_int = C(rear_in_d,rear_in_len,P["nose_len"]+P["mid_len"]+P["rear_len"]/2,"rear_int"); M(rear_int,"AL")
-inner_shape = fuse_shapes([nose_int, mid_int, rear_int],"inner_fuselage_shape")
-inner_shape = fillet_large(inner_shape, r=8)
-InnerHull = O(inner_shape,"InnerHull"); M(InnerHull,"CFRP")
+@G.block
+def outer_shape(P):
+    nose_ext = K(P["nose_base_d"],0,P["nose_len"],P["nose_len"]/2)
+    mid_ext  = C(P["mid_d"],P["mid_len"],P["nose_len"]+P["mid_len"]/2)
+    rear_ext = C(P["rear_d"],P["rear_len"],P["nose_len"]+P["mid_len"]+P["rear_len"]/2)
+    outer_shape = fuse_shapes([nose_ext, mid_ext, rear_ext],"outer_fuselage_shape")
+    if outer_shape is None:
+        raise RuntimeError("No se pudo construir la forma externa del fuselaje.")
+    return fillet_large(outer_shape, r=12)
+
+# 2) Construir fuselaje interior (clearance para equipos): perfil exterior desplazado hacia dentro
+#    hull+shield+impact de forma exacta en cada cara (sin offset ni primitivas reducidas)
+@G.block
+def inner_shape(P):
+    inner_shape = inset_solid(hull_profile(P), P["hull_t"]+P["shield_t"]+P["impact_t"])
+    if inner_shape is None:
+        raise RuntimeError("El espesor hull+shield+impact agota el fuselaje.")
+    return fillet_large(inner_shape, r=8)
 
 # 3) Shell (hull) = OuterHull - InnerHull --> carcasa cerrada con espesor compuesto (hull + shield + impact)
-try:
-    hull_shell_shape = OuterHull.Shape.cut(InnerHull.Shape)
-    hull_shell_shape = fillet_large(hull_shell_shape, r=6)
-    HullShell = O(hull_shell_shape,"HullShell"); M(HullShell,"AL")
-except Exception as e:
-    print("Fallo al cortar Outer-Inner (intento fallback). Error:", e)
-    # Fallback: generar offset de outer si está disponible
+@G.block
+def hull_shell(P, outer_shape, inner_shape):
+    try:
+        return fillet_large(outer_shape.cut(inner_shape), r=6)
+    except Exception as e:
+        print("Fallo al cortar Outer-Inner (intento fallback). Error:", e)
+    # Fallback: cáscara analítica del perfil (sin redondeos)
     try:
-        inner_offset = outer_shape.makeOffsetShape(-(h+P["shield_t"]+P["impact_t"]), 0.01, join=2, fill=True)
-        hull_shell_shape = outer_shape.cut(inner_offset)
-        HullShell = O(hull_shell_shape,"HullShell_offset_fallback"); M(HullShell,"AL")
+        return laminate(hull_profile(P), [P["hull_t"]+P["shield_t"]+P["impact_t"]])[0]
     except Exception as e2:
-        print("Fallback offset también falló:", e2)
+        print("Fallback laminado también falló:", e2)
         # Si todo falla, mantenemos outer como carcasa sólida (más conservador para CNC)
-        HullShell = OuterHull
         print("Se usará OuterHull como carcasa (sólido simple).")
+        return outer_shape
 
 # 4) Capa de blindaje (alta densidad) — alrededor del reactor y sección frontal
-# Blindaje cilíndrico alrededor del reactor
-reactor_shield = C(P["reactor_d"]+2*P["shield_t"], P["reactor_l"]+2*P["shield_t"], P["reactor_cx"], "reactor_shield"); M(reactor_shield,"W")
-# Blindaje frontal (nose) — una conicidad interna
-nose_shield_ext = K(P["nose_base_d"]+2*P["shield_t"], P["nose_base_d"], P["nose_len"]+P["shield_t"], P["nose_len"]/2 + P["shield_t"]/2, "nose_shield_ext"); M(nose_shield_ext,"W")
-# Fusionar y recortar el hueco interior para tener layer sólido
-shield_merged_shape = fuse_shapes([reactor_shield, nose_shield_ext], "shield_merged")
-try:
-    # crear hueco interior para shield (espacio libre interno)
-    inner_for_shield = inner_shape.copy()
-    shield_layer_shape = shield_merged_shape.cut(inner_for_shield)
-    ShieldLayer = O(shield_layer_shape,"ShieldLayer"); M(ShieldLayer,"W")
-except Exception as e:
-    print("No se pudo construir ShieldLayer exacto:", e)
-    ShieldLayer = reactor_shield
+@G.block
+def shield_layer(P, inner_shape):
+    # Blindaje cilíndrico alrededor del reactor
+    reactor_shield = C(P["reactor_d"]+2*P["shield_t"], P["reactor_l"]+2*P["shield_t"], P["reactor_cx"])
+    # Blindaje frontal (nose) — una conicidad interna
+    nose_shield_ext = K(P["nose_base_d"]+2*P["shield_t"], P["nose_base_d"], P["nose_len"]+P["shield_t"], P["nose_len"]/2 + P["shield_t"]/2)
+    # Fusionar y recortar el hueco interior para tener layer sólido
+    shield_merged_shape = fuse_shapes([reactor_shield, nose_shield_ext], "shield_merged")
+    try:
+        # crear hueco interior para shield (espacio libre interno)
+        return shield_merged_shape.cut(inner_shape)
+    except Exception as e:
+        print("No se pudo construir ShieldLayer exacto:", e)
+        return reactor_shield
 
 # 5) Capa amortiguadora (kevlar/cfrp) interior continua
-# generamos una capa con grosor impact_t justo por dentro de hull_shell (aprox con primitivas reducidas)
-impact_inner_d = safe_positive(P["mid_d"] - 2*(P["hull_t"]+P["shield_t"]))
-impact_layer = C(impact_inner_d, P["mid_len"] + P["nose_len"] + P["rear_len"], (P["nose_len"] + P["mid_len"]/2), "impact_layer"); M(impact_layer,"KEVLAR")
-ImpactLayer = impact_layer
+# capa de grosor impact_t justo por dentro de hull+shield, exacta sobre todo el perfil
+@G.block
+def impact_layer(P):
+    return laminate(hull_profile(P), [P["hull_t"]+P["shield_t"], P["impact_t"]])[1]
 
 # 6) Añadir anillos estructurales alrededor del reactor y filetearlos (refuerzos para trusses)
-rings=[]
-x0=P["reactor_cx"]-P["reactor_l"]/2+P["ring_h"]/2
-for i in range(P["ring_n"]):
-    t=Part.makeTorus((P["ring_ro"]+P["ring_ri"])/2,(P["ring_ro"]-P["ring_ri"])/2)
-    t.Placement=App.Placement(App.Vector(x0+i*P["ring_pitch"],0,0),R())
-    rings.append(t)
-rs=rings[0]
-for r in rings[1:]:
-    try: rs=rs.fuse(r)
-    except: pass
-ringsO=O(rs,"RINGS"); M(ringsO,"STEEL")
+@G.block
+def rings(P):
+    rings=[]
+    x0=P["reactor_cx"]-P["reactor_l"]/2+P["ring_h"]/2
+    for i in range(P["ring_n"]):
+        t=Part.makeTorus((P["ring_ro"]+P["ring_ri"])/2,(P["ring_ro"]-P["ring_ri"])/2)
+        t.Placement=App.Placement(App.Vector(x0+i*P["ring_pitch"],0,0),R())
+        rings.append(t)
+    rs=rings[0]
+    for r in rings[1:]:
+        try: rs=rs.fuse(r)
+        except: pass
+    return rs
 
 # 7) Nozzle reforzado y fileteado
-noz_ext = K(P["nozzle_exit_d"], P["nozzle_throat_d"], P["nozzle_l"], P["nozzle_cx"], 0, 0, "nozzle_ext"); M(noz_ext,"STEEL")
-noz_f = fillet_large(noz_ext.Shape, r=P["nozzle_fillet_r"])
-Nozzle = O(noz_f,"Nozzle"); M(Nozzle,"STEEL")
+@G.block
+def nozzle(P):
+    noz_ext = K(P["nozzle_exit_d"], P["nozzle_throat_d"], P["nozzle_l"], P["nozzle_cx"], 0, 0)
+    return fillet_large(noz_ext, r=P["nozzle_fillet_r"])
 
 # 8) Fusiones finales: buscamos producir un único sólido sólido_cnc
-to_fuse_objs = [HullShell, ShieldLayer, ImpactLayer, ringsO, Nozzle]
-# limpiar None y duplicados
-to_fuse_shapes = [o.Shape for o in to_fuse_objs if o is not None]
+@G.block
+def solid_cnc(hull_shell, shield_layer, impact_layer, rings, nozzle):
+    to_fuse_shapes = [s for s in (hull_shell, shield_layer, impact_layer, rings, nozzle) if s is not None]
 
-final_shape = to_fuse_shapes[0]
-for s in to_fuse_shapes[1:]:
-    try:
-        final_shape = final_shape.fuse(s)
-    except Exception as e:
-        print("Aviso fuse parcial falló:", e)
-        try:
-            final_shape = final_shape.fuse(s.copy())
-        except:
-            pass
-
-# Intentar convertir en sólido si es shell
-try:
-    # Si es shell o compuesta, intentar makeSolid vía Shell de caras
-    if hasattr(final_shape, "Shells") and len(final_shape.Shells)>0:
-        solid_final = Part.makeSolid(final_shape.Shells[0])
+    final_shape = fuse_shapes(to_fuse_shapes, "solid_cnc")
+
+    # Un sólido por cada cáscara cerrada (antes solo Shells[0]: se perdían las demás)
+    solid_final = solidify(heal(final_shape, "solid_cnc"))
+    if solid_final.isValid():
+        print("Solid_CNC creado con éxito.")
     else:
-        solid_final = final_shape
-    Solid_CNC = O(solid_final,"Solid_CNC"); M(Solid_CNC,"STEEL")
-    print("Solid_CNC creado con éxito.")
-except Exception as e:
-    print("No se pudo generar Solid_CNC como sólido válido:", e)
-    # Fallback: presentar la fusión tal cual, útil para inspección
-    Solid_CNC = O(final_shape,"Solid_CNC_fallback"); M(Solid_CNC,"STEEL")
+        print("No se pudo generar Solid_CNC como sólido válido; se deja la fusión para inspección.")
+    return solid_final
+
+objs = G.build({"outer_shape":"OuterHull", "inner_shape":"InnerHull", "hull_shell":"HullShell",
+                "shield_layer":"ShieldLayer", "impact_layer":"impact_layer", "rings":"RINGS",
+                "nozzle":"Nozzle", "solid_cnc":"Solid_CNC"})
+for blk, m in (("outer_shape","AL"), ("inner_shape","CFRP"), ("hull_shell","AL"), ("shield_layer","W"),
+               ("impact_layer","KEVLAR"), ("rings","STEEL"), ("nozzle","STEEL"), ("solid_cnc","STEEL")):
+    M(objs[blk], m)
 
 doc.recompute()
+report_healing()
 print("Macro completada: DFD compacto, blindado y preparado para revisión CNC.")
@@ -0,0 +1,91 @@
+# starsat – utilidades compartidas por las macros StarSat / DFD de FreeCAD.
+# Los submódulos que dependen de FreeCAD se importan bajo demanda (PEP 562),
+# así las herramientas de línea de comandos pueden cargarse fuera de FreeCAD.
+
+import importlib
+
+_EXPORTS = {
+    # Booleanas
+    "boolean_options": "booleans",
+    "common": "booleans",
+    "cut": "booleans",
+    "cut_all": "booleans",
+    "fuse": "booleans",
+    "fuse_all": "booleans",
+    "overlap_clusters": "booleans",
+    "refine_shape": "booleans",
+    "report_fuse_stats": "booleans",
+    "set_boolean_options": "booleans",
+    # Caché BREP de constructores
+    "brep_cache": "cache",
+    "clear_cache": "cache",
+    # Validación y reparación de formas
+    "heal": "healing",
+    "heal_all": "healing",
+    "is_valid": "healing",
+    "report_healing": "healing",
+    "solidify": "healing",
+    # Componentes paramétricos (FeaturePython)
+    "make_capsule_layer": "features",
+    "make_finned_radiator": "features",
+    "make_ion_thruster_ring": "features",
+    "make_parabolic_dish": "features",
+    "make_tps_disc": "features",
+    "make_truss_ring": "features",
+    # Primitivas exactas
+    "annular_sector": "primitives",
+    "annular_sector_face": "primitives",
+    "paraboloid_shell": "primitives",
+    "paraboloid_solid": "primitives",
+    # Laminados analíticos (cáscaras multicapa sin offset)
+    "axial_profile": "meridian",
+    "split_profile": "meridian",
+    "capsule_layers": "laminate",
+    "inset_solid": "laminate",
+    "laminate": "laminate",
+    "laminate_torus": "laminate",
+    # Nivel de detalle (draft / normal / export)
+    "bbox_proxy": "lod",
+    "lod_level": "lod",
+    "lod_steps": "lod",
+    "lod_wants": "lod",
+    "proxy_array": "lod",
+    "set_lod": "lod",
+    # Redondeos dirigidos
+    "classify_edges": "fillets",
+    "fillet_edges": "fillets",
+    # Greebles en lote
+    "add_greebles": "greebles",
+    "sample_greebles": "greebles",
+    # Inserción masiva (sin deshacer, vistas en una pasada, un recompute)
+    "add_feature": "bulk",
+    "begin_bulk": "bulk",
+    "bulk_build": "bulk",
+    "end_bulk": "bulk",
+    "set_view": "bulk",
+    # Construcción en memoria y materialización única
+    "BuildTree": "buildtree",
+    # Ensamblado multimaterial en un solo objeto
+    "Assembly": "assembly",
+    # Propiedades másicas (masa, CG real, tensor de inercia) cacheadas por forma
+    "clear_massprops_cache": "massprops",
+    "mass_properties": "massprops",
+    "shape_props": "massprops",
+    # Grafo de construcción incremental
+    "BuildGraph": "params",
+    "reuse_document": "params",
+    # Construcción paralela (workers FreeCADCmd)
+    "build_parallel": "parallel",
+    # Matrices de instancias
+    "linear_pattern": "patterns",
+    "polar_pattern": "patterns",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    mod = _EXPORTS.get(name)
+    if mod is None:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    return getattr(importlib.import_module("." + mod, __name__), name)
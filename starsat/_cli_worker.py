@@ -0,0 +1,26 @@
+# Worker de starsat.cli: "FreeCADCmd _cli_worker.py" con los argumentos en STARSAT_CLI
+# (JSON: repo, macro, overrides, out, ...). Ejecuta la macro sin GUI y sale con su código.
+# Con "bench" hace las medidas de starsat.bench en lugar de una ejecución normal.
+
+import json
+import os
+import sys
+import traceback
+
+try:
+    _args = json.loads(os.environ["STARSAT_CLI"])
+    if _args["repo"] not in sys.path:
+        sys.path.insert(0, _args["repo"])
+    if _args.get("bench"):
+        from starsat.bench import measure as run
+    else:
+        from starsat.cli import run
+    code = run(_args)
+except SystemExit as e:
+    code = e.code if isinstance(e.code, int) else 1
+except Exception:
+    traceback.print_exc()
+    code = 1
+sys.stdout.flush()
+sys.stderr.flush()
+os._exit(code)
@@ -0,0 +1,65 @@
+# Worker de starsat.parallel: se ejecuta con "FreeCADCmd _worker.py" y lee el trabajo
+# de STARSAT_JOB (JSON: repo, script, func, args, out, boolean_options, overrides). Carga
+# la macro como módulo (con los --set de starsat-build, si los hay), aplica el contexto
+# booleano del padre, llama func(doc, *args) sobre un documento nuevo y guarda los
+# objetos creados en out.brep.gz / out.json con starsat.cache.save_objects. Con "tree"
+# la función recibe un BuildTree y se serializan directamente sus nodos (las piezas
+# finales) con su color.
+# FreeCADCmd no tiene ViewObject: sin árbol, el constructor corre dentro de una sesión
+# bulk_build abierta hasta después de save_objects, así los colores que fija con
+# set_view siguen encolados (pending_view) cuando se guardan.
+
+import importlib.util
+import json
+import os
+import sys
+import traceback
+
+
+def _run():
+    spec = json.loads(os.environ["STARSAT_JOB"])
+    if spec["repo"] not in sys.path:
+        sys.path.insert(0, spec["repo"])
+    import FreeCAD as App
+    from starsat.booleans import set_boolean_options
+    from starsat.bulk import begin_bulk, end_bulk
+    from starsat.cache import save_objects
+
+    doc = App.newDocument("starsat_worker")
+    App.setActiveDocument(doc.Name)
+    if spec.get("overrides"):
+        from starsat.cli import load_module, parse_overrides
+        mod = load_module(spec["script"], parse_overrides(spec["overrides"]))
+    else:
+        mspec = importlib.util.spec_from_file_location("starsat_job", spec["script"])
+        mod = importlib.util.module_from_spec(mspec)
+        mspec.loader.exec_module(mod)
+    # Tras cargar la macro: su nivel superior no debe pisar el contexto del padre
+    set_boolean_options(**spec.get("boolean_options", {}))
+
+    if spec.get("tree"):
+        from starsat.buildtree import BuildTree
+        tree = BuildTree()
+        result = getattr(mod, spec["func"])(tree, *spec["args"])
+        ok = save_objects(spec["out"], result, list(tree.nodes))
+    else:
+        before = set(o.Name for o in doc.Objects)
+        begin_bulk(doc)
+        try:
+            result = getattr(mod, spec["func"])(doc, *spec["args"])
+            created = [o for o in doc.Objects if o.Name not in before]
+            ok = save_objects(spec["out"], result, created)
+        finally:
+            end_bulk(doc, recompute=False)
+    if not ok:
+        raise RuntimeError("%s: resultado no serializable" % spec["func"])
+
+
+try:
+    _run()
+    code = 0
+except Exception:
+    traceback.print_exc()
+    code = 1
+sys.stdout.flush()
+os._exit(code)
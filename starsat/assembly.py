@@ -0,0 +1,317 @@
+# starsat.assembly – ensamblado multimaterial en un solo objeto del documento.
+# Antes: un Part::Feature por pieza (100–300 por macro), cada uno con sus addProperty de
+# Material / MaterialData / Density; recompute, guardar/abrir y el árbol de la GUI
+# escalan con ese número de objetos.
+# Ahora las piezas se acumulan en un Assembly y se materializan en UN Part::Feature cuyo
+# Shape es un compound (un hijo por pieza, en orden de alta) con una tabla lateral de
+# arrays paralelos, índice de pieza -> dato:
+#   SolidLabels    etiqueta
+#   SolidMaterial  índice en la tabla de materiales (-1 = sin material)
+#   SolidColor     (r, g, b, transparencia 0–1)
+#   SolidVisible   visibilidad (las ocultas se pintan transparentes)
+#   SolidFaces     nº de caras (colores por cara y separar piezas al releer)
+# y la tabla de materiales: MaterialKeys, MaterialNames, MaterialDensity (kg/m3),
+# MaterialData (JSON con el resto de propiedades).
+#
+#   asm = Assembly()
+#   hull = asm.add(shape, "Hull_Shell", color=(0.1, 0.3, 0.6))
+#   asm.set_material(hull, "AL", "AA-2xxx", 2700.0)
+#   hull.Shape.cut(...)             # la pieza se usa como un Part::Feature (Shape, Label,
+#                                   # Placement, ViewObject.ShapeColor/Visibility)
+#   asm.materialize(doc, "Assembly")
+#   asm.mass_rollup()               # masa (kg), CG y desglose por material desde la tabla
+#   asm.export("dfd_al.step", material="AL")   # + dfd_al.bom.csv
+#
+# Assembly.absorb(objs) recoge Part::Feature ya creados (p.ej. los que devuelven los
+# workers de build_parallel) y los quita del documento.
+
+import csv
+import json
+import os
+
+import FreeCAD as App
+import Part
+
+from .lod import lod_level, lod_wants
+
+DEFAULT_COLOR = (0.8, 0.8, 0.8)
+
+_TABLE = (("SolidLabels", "App::PropertyStringList", "Etiqueta de cada pieza"),
+          ("SolidMaterial", "App::PropertyIntegerList", "Material de cada pieza (índice, -1 sin material)"),
+          ("SolidColor", "App::PropertyColorList", "Color de cada pieza (r, g, b, transparencia)"),
+          ("SolidVisible", "App::PropertyBoolList", "Visibilidad de cada pieza"),
+          ("SolidFaces", "App::PropertyIntegerList", "Caras de cada pieza en el compound"),
+          ("MaterialKeys", "App::PropertyStringList", "Clave de cada material"),
+          ("MaterialNames", "App::PropertyStringList", "Nombre de cada material"),
+          ("MaterialDensity", "App::PropertyFloatList", "Densidad de cada material (kg/m3)"),
+          ("MaterialData", "App::PropertyStringList", "Propiedades de cada material (JSON)"))
+
+
+# ===================== Pieza =====================
+class _View(object):
+    # Sustituto de ViewObject: escribe en la tabla en lugar de en un objeto de vista
+    def __init__(self, item):
+        self.__dict__["_item"] = item
+
+    def __getattr__(self, name):
+        asm, i = self._item.asm, self._item.index
+        if name == "ShapeColor":
+            return tuple(asm.colors[i][:3])
+        if name == "Transparency":
+            return int(round(asm.colors[i][3] * 100))
+        if name == "Visibility":
+            return asm.visible[i]
+        raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        asm, i = self._item.asm, self._item.index
+        if name == "ShapeColor":
+            asm.colors[i] = tuple(value[:3]) + (asm.colors[i][3],)
+        elif name == "Transparency":
+            asm.colors[i] = asm.colors[i][:3] + (max(0, min(100, value)) / 100.0,)
+        elif name == "Visibility":
+            asm.visible[i] = bool(value)
+        # el resto de propiedades de vista no tiene sentido por pieza: se ignora
+
+
+class Item(object):
+    # Pieza del ensamblado con la parte de la interfaz de Part::Feature que usan las macros
+    __slots__ = ("asm", "index")
+
+    def __init__(self, asm, index):
+        self.asm = asm
+        self.index = index
+
+    @property
+    def Shape(self):
+        return self.asm.shapes[self.index]
+
+    @Shape.setter
+    def Shape(self, shape):
+        self.asm.shapes[self.index] = shape
+
+    @property
+    def Label(self):
+        return self.asm.labels[self.index]
+
+    Name = Label
+
+    @property
+    def Placement(self):
+        return self.Shape.Placement
+
+    @Placement.setter
+    def Placement(self, pl):
+        shp = self.Shape.copy()
+        shp.Placement = pl
+        self.Shape = shp
+
+    @property
+    def ViewObject(self):
+        return _View(self)
+
+    @property
+    def Material(self):
+        m = self.asm.material_of[self.index]
+        return self.asm.materials[m][1] if m >= 0 else ""
+
+    @property
+    def Density(self):
+        m = self.asm.material_of[self.index]
+        return self.asm.materials[m][2] if m >= 0 else 0.0
+
+    @property
+    def Mass(self):
+        return self.asm.mass_rollup([self])["mass"]
+
+    def __getattr__(self, name):
+        # Resto de propiedades de material (Corrosion_Resistance, E...) desde la tabla
+        if name in Item.__slots__:
+            raise AttributeError(name)
+        m = self.asm.material_of[self.index]
+        data = self.asm.materials[m][3] if m >= 0 else {}
+        if data.get(name) is None:
+            raise AttributeError(name)
+        return data[name]
+
+    def __repr__(self):
+        return "<Item %d %s>" % (self.index, self.Label)
+
+
+# ===================== Ensamblado =====================
+class Assembly(object):
+    def __init__(self):
+        self.shapes, self.labels, self.material_of, self.colors, self.visible = [], [], [], [], []
+        self.materials = []  # [(clave, nombre, densidad kg/m3, {datos})]
+        self._keys = {}
+
+    def __len__(self):
+        return len(self.shapes)
+
+    def items(self):
+        return [Item(self, i) for i in range(len(self.shapes))]
+
+    def get(self, label):
+        for i, l in enumerate(self.labels):
+            if l == label:
+                return Item(self, i)
+        return None
+
+    def add(self, shape, label, color=None, transparency=0.0, material=None):
+        self.shapes.append(shape)
+        self.labels.append(label)
+        self.material_of.append(-1)
+        self.colors.append(tuple(color or DEFAULT_COLOR)[:3] + (float(transparency),))
+        self.visible.append(True)
+        item = Item(self, len(self.shapes) - 1)
+        if material is not None:
+            self.set_material(item, material)
+        return item
+
+    # ---------- materiales ----------
+    def material(self, key, name=None, density=None, data=None):
+        # Registra (o actualiza) un material y devuelve su índice
+        i = self._keys.get(key)
+        if i is None:
+            if name is None and density is None:
+                return None
+            i = self._keys[key] = len(self.materials)
+            self.materials.append((key, name or key, float(density or 0.0), dict(data or {})))
+        elif name is not None or density is not None or data:
+            k, n, rho, d = self.materials[i]
+            d = dict(d, **(data or {}))
+            self.materials[i] = (k, name or n, rho if density is None else float(density), d)
+        return i
+
+    def set_material(self, item, key, name=None, density=None, data=None):
+        i = self.material(key, name, density, data)
+        if i is None:
+            App.Console.PrintWarning("Assembly: material %s no definido\n" % key)
+            return None
+        self.material_of[item.index if isinstance(item, Item) else item] = i
+        return i
+
+    def _indices(self, items=None, material=None):
+        idx = range(len(self.shapes)) if items is None else [
+            it.index if isinstance(it, Item) else it for it in items if it is not None]
+        if material is not None:
+            mats = set(i for i, m in enumerate(self.materials) if material in (m[0], m[1]))
+            idx = [i for i in idx if self.material_of[i] in mats]
+        return list(idx)
+
+    # ---------- geometría y tabla ----------
+    def compound(self, items=None, material=None):
+        return Part.makeCompound([self.shapes[i] for i in self._indices(items, material)])
+
+    def mass_rollup(self, items=None, material=None):
+        # rho en kg/m3 y longitudes en mm: masa = V[mm3]·1e-9·rho; CG en mm, inercia en kg·mm²
+        # respecto al CG (volúmenes, centros y tensores por pieza cacheados en massprops)
+        from .massprops import mass_properties  # diferido: massprops -> cache -> assembly
+        idx = self._indices(items, material)
+        rhos = [self.materials[self.material_of[i]][2] if self.material_of[i] >= 0 else 0.0 for i in idx]
+        mp = mass_properties([self.shapes[i] for i in idx], rhos)
+        by_mat, rows = {}, []
+        for i, (_, vol, mass, _c) in zip(idx, mp["rows"]):
+            m = self.material_of[i]
+            name = self.materials[m][1] if m >= 0 else ""
+            rows.append((i, self.labels[i], name, vol, mass))
+            if mass > 0:
+                by_mat[name] = by_mat.get(name, 0.0) + mass
+        return {"mass": mp["mass"], "cg": mp["cg"], "inertia": mp["inertia"], "by_material": by_mat, "rows": rows}
+
+    def materialize(self, doc, name="Assembly", group=None):
+        # Un único Part::Feature con el compound y la tabla; reutiliza el objeto si ya existe
+        o = doc.getObject(name)
+        if o is None or o.TypeId != "Part::Feature":
+            o = doc.addObject("Part::Feature", name)
+        for prop, kind, tip in _TABLE:
+            if prop not in o.PropertiesList:
+                o.addProperty(kind, prop, "Assembly", tip)
+        comp = self.compound()
+        o.Shape = comp
+        faces = [len(s.Faces) for s in self.shapes]
+        o.SolidLabels = list(self.labels)
+        o.SolidMaterial = list(self.material_of)
+        o.SolidColor = list(self.colors)
+        o.SolidVisible = list(self.visible)
+        o.SolidFaces = faces
+        o.MaterialKeys = [m[0] for m in self.materials]
+        o.MaterialNames = [m[1] for m in self.materials]
+        o.MaterialDensity = [m[2] for m in self.materials]
+        o.MaterialData = [json.dumps(m[3], sort_keys=True, default=str) for m in self.materials]
+        try:
+            if sum(faces) == len(comp.Faces):
+                o.ViewObject.DiffuseColor = [c if vis else c[:3] + (1.0,)
+                                             for c, n, vis in zip(self.colors, faces, self.visible)
+                                             for _ in range(n)]
+            elif self.colors:
+                o.ViewObject.ShapeColor = self.colors[0][:3]
+        except Exception:
+            pass
+        if group is not None:
+            group.addObject(o)
+        return o
+
+    @classmethod
+    def from_object(cls, obj):
+        # Reconstruye el ensamblado desde un objeto creado con materialize
+        asm = cls()
+        for k, n, rho, d in zip(obj.MaterialKeys, obj.MaterialNames, obj.MaterialDensity, obj.MaterialData):
+            asm.material(k, n, rho, json.loads(d) if d else {})
+        for shp, label, m, c, vis in zip(obj.Shape.childShapes(), obj.SolidLabels, obj.SolidMaterial,
+                                         obj.SolidColor, obj.SolidVisible):
+            it = asm.add(shp, label, c[:3], c[3])
+            asm.material_of[it.index] = m
+            asm.visible[it.index] = vis
+        return asm
+
+    def absorb(self, objs, remove=True):
+        # Pasa Part::Feature existentes al ensamblado (forma, etiqueta, color, material)
+        out = []
+        for o in objs:
+            if o is None or not hasattr(o, "Shape"):
+                continue
+            color, alpha, vis = None, 0.0, True
+            try:
+                color, alpha, vis = o.ViewObject.ShapeColor, o.ViewObject.Transparency / 100.0, o.ViewObject.Visibility
+            except Exception:
+                pass
+            it = self.add(o.Shape, o.Label, color, alpha)
+            self.visible[it.index] = vis
+            mat = getattr(o, "Material", None)
+            if mat:
+                data = dict(getattr(o, "MaterialData", None) or {})
+                self.set_material(it, mat, mat, getattr(o, "Density", 0.0), data)
+            out.append(it)
+            if remove:
+                try:
+                    o.Document.removeObject(o.Name)
+                except Exception:
+                    pass
+        return out
+
+    # ---------- exportación ----------
+    def export(self, path, items=None, material=None):
+        # Compound (filtrado por piezas o material) + lista de materiales <path>.bom.csv
+        if not lod_wants("export"):
+            App.Console.PrintMessage("Assembly.export: LOD %s, no se exporta %s\n" % (lod_level(), path))
+            return None
+        idx = self._indices(items, material)
+        comp = self.compound(idx)
+        ext = os.path.splitext(path)[1].lower()
+        if ext in (".step", ".stp"):
+            comp.exportStep(path)
+        elif ext == ".brep":
+            comp.exportBrep(path)
+        elif ext == ".stl":
+            comp.exportStl(path)
+        else:
+            raise ValueError("Assembly.export: formato no soportado: %s" % ext)
+        bom = os.path.splitext(path)[0] + ".bom.csv"
+        with open(bom, "w") as f:
+            w = csv.writer(f)
+            w.writerow(("index", "label", "material", "density", "volume_mm3", "mass_kg"))
+            for i, label, name, vol, mass in self.mass_rollup(idx)["rows"]:
+                m = self.material_of[i]
+                w.writerow((i, label, name, self.materials[m][2] if m >= 0 else "", "%.6g" % vol, "%.6g" % mass))
+        return path, bom
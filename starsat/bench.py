@@ -0,0 +1,256 @@
+# starsat.bench – banco de pruebas de todas las macros con historial de regresiones.
+# Cada macro se ejecuta sin GUI en su propio proceso FreeCADCmd (el mismo worker que
+# starsat-build) N veces seguidas:
+#   cold_s     primera ejecución en el proceso (sin módulos importados)
+#   warm_s     mediana de las siguientes (módulos importados)
+#   startup_s  arranque de FreeCADCmd + imports (tiempo del proceso menos las ejecuciones)
+#   rss_mb     pico de memoria del worker
+# y la huella geométrica de los objetos raíz: volumen, área, caja envolvente, característica
+# de Euler (V - E + F), número de objetos / caras / sólidos, más su hash.
+# Se mide la construcción, no la reutilización: el worker corre con STARSAT_CACHE=0 (sin
+# brep_cache en disco) y entre ejecuciones se vacían BuildGraph y las cachés en memoria
+# (reparación, redondeos, propiedades másicas); si no, warm_s y la comprobación de
+# determinismo medirían la reproducción de la caché.
+#
+#   python -m starsat.bench                       # todas las macros, 3 ejecuciones
+#   python -m starsat.bench DFDmacro.py -n 5 --threshold 0.10
+#   python -m starsat.bench --accept              # acepta cambios de geometría como nueva base
+#
+# Los resultados se añaden a ~/.cache/starsat/bench_history.jsonl (uno por macro y pasada;
+# otra ruta con --history o STARSAT_BENCH_HISTORY), fuera del repositorio. Se compara con
+# la última entrada correcta y sin regresiones de cada macro: sale con código 1 si warm_s
+# o cold_s empeoran más que --threshold (relativo, con un mínimo absoluto de --min-delta s),
+# si cambia la huella geométrica o si una macro que funcionaba falla. Una macro que no deja
+# documento activo queda como "no-doc" (sin huella) y no se usa como base.
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from .cli import REPO, WORKER, _freecadcmd
+
+HISTORY = os.environ.get("STARSAT_BENCH_HISTORY") or os.path.join(
+    os.path.expanduser("~"), ".cache", "starsat", "bench_history.jsonl")
+MACRO_GLOBS = ("*.py",
+               "Macro_starSat/materials_simulation/directFusin_Macraterials",
+               "Macro_starSat/materials_simulation/sim/python_files/*.py",
+               "Macro_starSat/materials_simulation/MACROS_TXT/*/Files/Simulation/*.py")
+
+
+def discover():
+    out = []
+    for pattern in MACRO_GLOBS:
+        out += sorted(glob.glob(os.path.join(REPO, pattern)))
+    return [os.path.relpath(p, REPO) for p in out if os.path.isfile(p)]
+
+
+# ======================================================
+# Medida (dentro de FreeCAD, en el worker)
+# ======================================================
+def geometry_fingerprint(doc):
+    from .cli import _root_objects
+    fp = {"objects": 0, "faces": 0, "solids": 0, "euler": 0, "volume": 0.0, "area": 0.0, "bbox": None}
+    bb = None
+    for o in _root_objects(doc):
+        shp = o.Shape
+        fp["objects"] += 1
+        fp["faces"] += len(shp.Faces)
+        fp["solids"] += len(shp.Solids)
+        fp["euler"] += len(shp.Vertexes) - len(shp.Edges) + len(shp.Faces)
+        try:
+            fp["volume"] += shp.Volume
+            fp["area"] += shp.Area
+        except Exception:
+            pass
+        bb = shp.BoundBox if bb is None else bb.united(shp.BoundBox)
+    if bb is not None:
+        fp["bbox"] = [bb.XMin, bb.YMin, bb.ZMin, bb.XMax, bb.YMax, bb.ZMax]
+    # redondeo a 6 cifras: el hash no debe cambiar por ruido numérico de OCC
+    canon = dict(fp, volume="%.6g" % fp["volume"], area="%.6g" % fp["area"],
+                 bbox=["%.4f" % v for v in fp["bbox"] or []])
+    fp["hash"] = hashlib.sha1(json.dumps(canon, sort_keys=True).encode()).hexdigest()[:16]
+    return fp
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+        kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return kb / (1024.0 * 1024.0) if sys.platform == "darwin" else kb / 1024.0
+    except ImportError:
+        return None
+
+
+def _reset(App):
+    # Documentos cerrados y estado en memoria olvidado: cada ejecución construye desde cero
+    from .fillets import clear_fillet_cache
+    from .healing import clear_heal_cache
+    from .massprops import clear_massprops_cache
+    from .params import forget
+    for name, doc in list(App.listDocuments().items()):
+        forget(doc)
+        App.closeDocument(name)
+    clear_heal_cache()
+    clear_fillet_cache()
+    clear_massprops_cache()
+
+
+def measure(args):
+    # Worker: ejecuta la macro args["bench"]["runs"] veces y escribe el JSON de resultados
+    import FreeCAD as App
+    from .cli import execute
+    spec = args["bench"]
+    runs, fps = [], []
+    for i in range(spec["runs"]):
+        _reset(App)
+        t0 = time.perf_counter()
+        doc, times = execute(args["macro"], [])
+        runs.append(time.perf_counter() - t0)
+        fps.append(geometry_fingerprint(doc) if doc is not None else None)
+    out = {"runs": runs, "rss_mb": _peak_rss_mb(), "fingerprint": fps[0],
+           "deterministic": all((f or {}).get("hash") == (fps[0] or {}).get("hash") for f in fps)}
+    with open(spec["out"], "w") as f:
+        json.dump(out, f)
+    return 0
+
+
+# ======================================================
+# Ejecución y comparación (proceso padre)
+# ======================================================
+def run_macro(cmd, macro, runs, timeout):
+    fd, out = tempfile.mkstemp(prefix="starsat_bench_", suffix=".json")
+    os.close(fd)
+    args = {"repo": REPO, "macro": os.path.join(REPO, macro), "overrides": [], "out": None,
+            "bench": {"runs": runs, "out": out}}
+    rec = {"macro": macro, "status": "ok"}
+    t0 = time.perf_counter()
+    try:
+        proc = subprocess.run(cmd, env=dict(os.environ, STARSAT_CLI=json.dumps(args), STARSAT_CACHE="0"),
+                              stdout=subprocess.PIPE, stderr=subprocess.STDOUT, timeout=timeout)
+        wall = time.perf_counter() - t0
+        with open(out) as f:
+            res = json.load(f) if proc.returncode == 0 and os.path.getsize(out) else None
+        if res is None:
+            log = proc.stdout.decode("utf-8", "replace").strip().splitlines()
+            rec.update(status="error", error=(log or ["código %s" % proc.returncode])[-1][:300])
+        else:
+            rec.update(cold_s=res["runs"][0],
+                       warm_s=statistics.median(res["runs"][1:]) if len(res["runs"]) > 1 else None,
+                       startup_s=wall - sum(res["runs"]), rss_mb=res["rss_mb"],
+                       deterministic=res["deterministic"], fingerprint=res["fingerprint"])
+            if res["fingerprint"] is None:
+                # sin documento activo no hay geometría que comparar: tiempos sí, huella no
+                rec.update(status="no-doc", error="la macro no deja documento activo")
+    except subprocess.TimeoutExpired:
+        rec.update(status="timeout", error="> %s s" % timeout)
+    finally:
+        os.remove(out)
+    return rec
+
+
+def load_history(path):
+    hist = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                try:
+                    r = json.loads(line)
+                except ValueError:
+                    continue
+                if r.get("status") == "ok" and not r.get("issues"):
+                    hist[r["macro"]] = r
+    return hist
+
+
+def compare(rec, base, threshold, min_delta):
+    # Lista de problemas de rec frente a la entrada base (None si no hay historial)
+    if base is None:
+        return []
+    if rec["status"] != "ok":
+        return ["%s (antes funcionaba)" % rec["status"]]
+    issues = []
+    for k in ("cold_s", "warm_s"):
+        new, old = rec.get(k), base.get(k)
+        if new is not None and old and new - old > max(threshold * old, min_delta):
+            issues.append("%s %.2f -> %.2f s (+%.0f%%)" % (k, old, new, 100.0 * (new - old) / old))
+    a, b = base.get("fingerprint") or {}, rec["fingerprint"]
+    if a and b["hash"] != a["hash"]:
+        diff = [k for k in ("objects", "faces", "solids", "euler", "volume", "area", "bbox") if a.get(k) != b.get(k)]
+        issues.append("geometría cambiada (%s)" % ", ".join(diff))
+    return issues
+
+
+def _git_rev():
+    try:
+        return subprocess.check_output(["git", "-C", REPO, "rev-parse", "--short", "HEAD"],
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+
+def bench(macros=None, runs=3, history=HISTORY, threshold=0.15, min_delta=0.5, accept=False,
+          timeout=1800, freecadcmd=None):
+    exe = _freecadcmd(freecadcmd)
+    if exe is None:
+        raise RuntimeError("bench: FreeCADCmd no encontrado (usa --freecadcmd o STARSAT_FREECADCMD)")
+    cmd = [exe, WORKER]
+    macros = [os.path.relpath(os.path.abspath(m), REPO) for m in macros] if macros else discover()
+    base = load_history(history)
+    stamp, rev = time.strftime("%Y-%m-%dT%H:%M:%S"), _git_rev()
+    failures = 0
+    os.makedirs(os.path.dirname(os.path.abspath(history)), exist_ok=True)
+    with open(history, "a") as hf:
+        for macro in macros:
+            rec = run_macro(cmd, macro, runs, timeout)
+            rec.update(time=stamp, git=rev, runs=runs)
+            issues = compare(rec, base.get(macro), threshold, min_delta)
+            if rec["status"] == "ok":
+                fp = rec["fingerprint"]
+                line = "%-60s cold %7.2f  warm %7s  rss %6.0f MB  obj %4d  caras %6d  %s" % (
+                    macro[-60:], rec["cold_s"], "%.2f" % rec["warm_s"] if rec["warm_s"] is not None else "-",
+                    rec["rss_mb"] or 0, fp["objects"], fp["faces"], fp["hash"])
+                if not rec["deterministic"]:
+                    issues.append("geometría distinta entre ejecuciones")
+            else:
+                line = "%-60s %s: %s" % (macro[-60:], rec["status"], rec.get("error", ""))
+            geometry_only = issues and all(i.startswith("geometría cambiada") for i in issues)
+            if accept and geometry_only:
+                issues = []
+            rec["issues"] = issues
+            hf.write(json.dumps(rec) + "\n")
+            hf.flush()
+            failures += bool(issues)
+            print(line + ("\n    REGRESIÓN: " + "; ".join(issues) if issues else ""))
+    print("bench: %d macros, %d con regresiones -> %s" % (len(macros), failures, history))
+    return failures
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m starsat.bench")
+    ap.add_argument("macros", nargs="*", help="por defecto todas (raíz, sim/python_files, MACROS_TXT/.../Simulation)")
+    ap.add_argument("-n", "--runs", type=int, default=3)
+    ap.add_argument("--history", default=HISTORY)
+    ap.add_argument("--threshold", type=float, default=0.15, help="empeoramiento relativo tolerado")
+    ap.add_argument("--min-delta", type=float, default=0.5, help="empeoramiento absoluto mínimo (s)")
+    ap.add_argument("--accept", action="store_true", help="acepta cambios de huella geométrica")
+    ap.add_argument("--timeout", type=float, default=1800)
+    ap.add_argument("--freecadcmd")
+    ns = ap.parse_args(argv)
+    try:
+        failures = bench(ns.macros, ns.runs, ns.history, ns.threshold, ns.min_delta, ns.accept,
+                         ns.timeout, ns.freecadcmd)
+    except RuntimeError as e:
+        sys.stderr.write("%s\n" % e)
+        return 2
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
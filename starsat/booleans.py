@@ -0,0 +1,328 @@
+# starsat.booleans – planificador de fusiones para las macros.
+# Sustituye los pliegues lineales "acc = acc.fuse(x)" (coste cuadrático: cada paso
+# vuelve a intersecar el resultado creciente) por:
+#   1) un grafo de solape de cajas envolventes (AABB) entre operandos,
+#   2) grupos disjuntos -> Part.Compound, sin booleana,
+#   3) cada cluster conexo -> una única fusión multi-argumento (general fuse).
+# cut_all hace lo propio con patrones de agujeros/ranuras: un objetivo, N herramientas,
+# una sola booleana con las herramientas como argumentos separados (general cut): pueden
+# solaparse entre sí (ranuras de filas y columnas que se cruzan), cosa que un único
+# compound de herramientas no admite.
+# Cada llamada queda registrada por punto de llamada en FUSE_STATS. Si la fusión de un
+# cluster falla, sus operandos pasan por healing.heal antes del pliegue lineal; en el
+# pliegue, un operando que no se fusiona se repara y se reintenta y, si aun así falla, se
+# avisa y su índice queda en FUSE_STATS["dropped"].
+#
+# Contexto booleano común (OPTIONS) aplicado a todas las fuse/cut/common de los helpers:
+#   fuzzy     tolerancia difusa (mm) de OCC: operandos que se tocan en caras coplanares
+#             (capas de escudo, rim sobre la placa trasera) se fusionan sin solapes
+#             artificiales (P['overlap'])
+#   parallel  una sola booleana multi-argumento por cluster: FreeCAD ejecuta su
+#             BRepAlgoAPI con RunParallel, así que es la que aprovecha varios núcleos;
+#             False -> pliegue lineal (depuración)
+#   glue      operandos que solo se tocan: si no hay fuzzy explícito se usa GLUE_FUZZY
+#             (la API Python no expone SetGlue; la tolerancia difusa es su equivalente)
+#   refine    tras cada fusión, removeSplitter (unify same domain): une las caras
+#             coplanares / cilíndricas partidas y elimina las costuras de cada operando,
+#             así las booleanas, los redondeos y el STEP posteriores ven la topología real.
+#             Por constructor: fuse_all(..., refine=False) o boolean_options(refine=...)
+#   nudge     último reintento del pliegue lineal con el operando desplazado NUDGE (el
+#             micro-solape de DFDmacro); cambia la geometría, así que está desactivado
+#             salvo que la macro lo pida con boolean_options(nudge=True)
+#
+#   with boolean_options(fuzzy=1e-3):
+#       shield = fuse_all([cer, foam, back, rim], "shield")
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+import FreeCAD as App
+import Part
+
+from .healing import heal, heal_all
+from .lod import lod_wants
+
+# Holgura absoluta (mm) para considerar que dos cajas se tocan
+BBOX_TOL = 1e-6
+
+# Si está activo, cada fuse_all cronometra también el pliegue lineal equivalente
+# para informar del tiempo ahorrado real (duplica el trabajo: solo para medir)
+MEASURE_BASELINE = os.environ.get("STARSAT_FUSE_BASELINE", "") not in ("", "0")
+
+# Tolerancia difusa mínima con glue activo (mm)
+GLUE_FUZZY = 1e-4
+
+# Desplazamiento del reintento con nudge: rompe coplanaridades estrictas
+NUDGE = App.Vector(0, 0, 0.2)
+
+OPTIONS = {
+    "fuzzy": float(os.environ.get("STARSAT_FUZZY", "") or 0.0),
+    "parallel": os.environ.get("STARSAT_BOOL_PARALLEL", "1") not in ("", "0"),
+    "glue": False,
+    "refine": os.environ.get("STARSAT_REFINE", "1") not in ("", "0"),
+    "nudge": False,
+}
+
+# label -> {calls, operands, clusters, booleans, linear_booleans, t_plan, t_linear,
+#           faces_raw, faces, edges_raw, edges, t_refine, nudged, dropped}
+FUSE_STATS = {}
+
+
+def set_boolean_options(**kw):
+    # Cambia el contexto para el resto de la sesión; devuelve los valores anteriores
+    bad = [k for k in kw if k not in OPTIONS]
+    if bad:
+        raise KeyError("opciones booleanas desconocidas: %s" % ", ".join(bad))
+    old = dict((k, OPTIONS[k]) for k in kw)
+    OPTIONS.update(kw)
+    return old
+
+
+@contextmanager
+def boolean_options(**kw):
+    old = set_boolean_options(**kw)
+    try:
+        yield OPTIONS
+    finally:
+        OPTIONS.update(old)
+
+
+def _fuzzy():
+    f = OPTIONS["fuzzy"] or 0.0
+    if OPTIONS["glue"]:
+        f = max(f, GLUE_FUZZY)
+    return f
+
+
+def _op(method, a, tools):
+    # a.fuse/cut/common(tools) con la tolerancia difusa del contexto
+    tools = tools if isinstance(tools, (list, tuple)) else [tools]
+    f = _fuzzy()
+    return getattr(a, method)(list(tools), f) if f > 0 else getattr(a, method)(list(tools))
+
+
+def fuse(a, b):
+    return _op("fuse", a, b)
+
+
+def cut(a, b):
+    return _op("cut", a, b)
+
+
+def common(a, b):
+    return _op("common", a, b)
+
+
+def _call_site(depth=2):
+    f = sys._getframe(depth)
+    return "%s:%d" % (os.path.basename(f.f_code.co_filename), f.f_lineno)
+
+
+def _boxes_overlap(a, b, tol):
+    return (a.XMin <= b.XMax + tol and b.XMin <= a.XMax + tol and
+            a.YMin <= b.YMax + tol and b.YMin <= a.YMax + tol and
+            a.ZMin <= b.ZMax + tol and b.ZMin <= a.ZMax + tol)
+
+
+def overlap_clusters(shapes, tol=BBOX_TOL):
+    # Barrido y poda sobre X + union-find: O(n log n + k) comprobaciones de cajas
+    boxes = [s.BoundBox for s in shapes]
+    parent = list(range(len(shapes)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    active = []
+    for i in sorted(range(len(shapes)), key=lambda k: boxes[k].XMin):
+        bi = boxes[i]
+        active = [j for j in active if boxes[j].XMax + tol >= bi.XMin]
+        for j in active:
+            if _boxes_overlap(bi, boxes[j], tol):
+                ri, rj = find(i), find(j)
+                if ri != rj:
+                    parent[ri] = rj
+        active.append(i)
+
+    groups = {}
+    for i in range(len(shapes)):
+        groups.setdefault(find(i), []).append(i)
+    return sorted(groups.values(), key=lambda g: g[0])
+
+
+def _linear_fold(shapes, label=None, index=None):
+    # acc.fuse(x) en orden; index: índices de los operandos en la llamada a fuse_all.
+    # Sin label (medida de MEASURE_BASELINE) no se avisa ni se anota nada.
+    index = index or list(range(len(shapes)))
+    acc = shapes[0]
+    for i, s in zip(index[1:], shapes[1:]):
+        try:
+            acc = _op("fuse", acc, s)
+            continue
+        except Exception as e:
+            err = e
+        fixed = heal(s, "%s[%d]" % (label or "?", i))
+        if fixed is not s:
+            try:
+                acc = _op("fuse", acc, fixed)
+                continue
+            except Exception as e:
+                err = e
+        if OPTIONS["nudge"]:
+            moved = fixed.copy()
+            moved.translate(NUDGE)
+            try:
+                acc = _op("fuse", acc, moved)
+                if label is not None:
+                    _stats(label)["nudged"].append(i)
+                    App.Console.PrintWarning("fuse_all[%s]: operando %d fusionado desplazado %.1f mm\n"
+                                             % (label, i, NUDGE.Length))
+                continue
+            except Exception as e:
+                err = e
+        if label is not None:
+            _stats(label)["dropped"].append(i)
+            App.Console.PrintWarning("fuse_all[%s]: operando %d descartado, la fusión falla (%s)\n"
+                                     % (label, i, err))
+    return acc
+
+
+def _fuse_cluster(shapes, label, index):
+    if not OPTIONS["parallel"]:
+        return _linear_fold(shapes, label, index)
+    try:
+        return _op("fuse", shapes[0], shapes[1:])
+    except Exception as e:
+        App.Console.PrintWarning("fuse_all[%s]: fusión múltiple falló (%s); se reparan los operandos\n" % (label, e))
+    # Operandos sospechosos: validar/reparar (cacheado) y reintentar antes del pliegue lineal
+    shapes = heal_all(shapes, label)
+    try:
+        return _op("fuse", shapes[0], shapes[1:])
+    except Exception as e:
+        App.Console.PrintWarning("fuse_all[%s]: sigue fallando tras reparar (%s); pliegue lineal\n" % (label, e))
+        return _linear_fold(shapes, label, index)
+
+
+def refine_shape(shape):
+    # -> (forma refinada, (caras, aristas) antes, (caras, aristas) después, tiempo)
+    t0 = time.perf_counter()
+    before = (len(shape.Faces), len(shape.Edges))
+    try:
+        out = shape.removeSplitter()
+        if out.isNull() or not out.isValid():
+            raise ValueError("resultado no válido")
+    except Exception as e:
+        App.Console.PrintWarning("refine: removeSplitter falló (%s); se conserva la fusión\n" % e)
+        out = shape
+    after = (len(out.Faces), len(out.Edges))
+    return out, before, after, time.perf_counter() - t0
+
+
+def _stats(label):
+    return FUSE_STATS.setdefault(label, {"calls": 0, "operands": 0, "clusters": 0, "booleans": 0,
+                                         "linear_booleans": 0, "t_plan": 0.0, "t_linear": None,
+                                         "faces_raw": 0, "faces": 0, "edges_raw": 0, "edges": 0,
+                                         "t_refine": None, "nudged": [], "dropped": []})
+
+
+def _record(label, operands, clusters, booleans, t_plan, t_linear, refined=None):
+    st = _stats(label)
+    st["calls"] += 1
+    st["operands"] += operands
+    st["clusters"] += clusters
+    st["booleans"] += booleans
+    st["linear_booleans"] += max(0, operands - 1)
+    st["t_plan"] += t_plan
+    if t_linear is not None:
+        st["t_linear"] = (st["t_linear"] or 0.0) + t_linear
+    if refined is not None:
+        before, after, t_ref = refined
+        st["faces_raw"] += before[0]
+        st["edges_raw"] += before[1]
+        st["faces"] += after[0]
+        st["edges"] += after[1]
+        st["t_refine"] = (st["t_refine"] or 0.0) + t_ref
+
+
+def fuse_all(shapes, label=None, refine=None):
+    shapes = [s for s in shapes if s is not None]
+    if not shapes:
+        return None
+    label = label or _call_site()
+    t0 = time.perf_counter()
+    clusters = overlap_clusters(shapes, max(BBOX_TOL, _fuzzy()))
+    parts = []
+    n_bool = 0
+    for idx in clusters:
+        if len(idx) == 1:
+            parts.append(shapes[idx[0]])
+        else:
+            parts.append(_fuse_cluster([shapes[i] for i in idx], label, idx))
+            n_bool += 1
+    result = parts[0] if len(parts) == 1 else Part.makeCompound(parts)
+    t_plan = time.perf_counter() - t0
+
+    refined = None
+    if n_bool and (OPTIONS["refine"] if refine is None else refine):
+        result, before, after, t_ref = refine_shape(result)
+        refined = (before, after, t_ref)
+
+    t_linear = None
+    if MEASURE_BASELINE and len(shapes) > 1:
+        t1 = time.perf_counter()
+        _linear_fold(shapes)
+        t_linear = time.perf_counter() - t1
+    _record(label, len(shapes), len(clusters), n_bool, t_plan, t_linear, refined)
+    return result
+
+
+def cut_all(target, tools, label=None, cosmetic=False):
+    # Resta N herramientas en una sola pasada booleana: las herramientas cuya caja
+    # no toca al objetivo se descartan y el resto va como lista de argumentos.
+    # cosmetic=True (ranuras, grabados...): con LOD draft no se corta
+    if target is None:
+        return None
+    if cosmetic and not lod_wants("cosmetic"):
+        return target
+    bb = target.BoundBox
+    tol = max(BBOX_TOL, _fuzzy())
+    tools = [t for t in tools if t is not None and _boxes_overlap(bb, t.BoundBox, tol)]
+    if not tools:
+        return target
+    label = label or _call_site()
+    try:
+        return _op("cut", target, tools)
+    except Exception as e:
+        App.Console.PrintWarning("cut_all[%s]: corte único falló (%s); cortes secuenciales\n" % (label, e))
+    for i, t in enumerate(tools):
+        try:
+            target = _op("cut", target, t)
+        except Exception as e:
+            App.Console.PrintWarning("cut_all[%s]: herramienta %d/%d no se pudo restar (%s)\n"
+                                     % (label, i, len(tools), e))
+    return target
+
+
+def report_fuse_stats(reset=True):
+    if not FUSE_STATS:
+        return
+    App.Console.PrintMessage("fuse_all: operandos / clusters / booleanas (plan vs lineal) / tiempo\n")
+    for label, st in sorted(FUSE_STATS.items()):
+        line = "  %-28s %4d ops %3d cl %3d vs %3d bool  %.3f s" % (
+            label, st["operands"], st["clusters"], st["booleans"], st["linear_booleans"], st["t_plan"])
+        if st["t_linear"] is not None:
+            line += "  (lineal %.3f s, ahorro %.3f s)" % (st["t_linear"], st["t_linear"] - st["t_plan"])
+        if st["t_refine"] is not None:
+            line += "  refine caras %d->%d aristas %d->%d %.3f s" % (
+                st["faces_raw"], st["faces"], st["edges_raw"], st["edges"], st["t_refine"])
+        App.Console.PrintMessage(line + "\n")
+        if st["nudged"]:
+            App.Console.PrintMessage("    desplazados %.1f mm: %s\n" % (NUDGE.Length, st["nudged"]))
+        if st["dropped"]:
+            App.Console.PrintWarning("  %s: operandos descartados %s\n" % (label, st["dropped"]))
+    if reset:
+        FUSE_STATS.clear()
@@ -0,0 +1,124 @@
+# starsat.buildtree – construcción en memoria y materialización de una sola vez.
+# Antes los constructores (build_bus, build_heat_shield, ...) mezclaban geometría y
+# escrituras en el documento: cada forma intermedia que solo servía de herramienta
+# (Toro_Solid, Cryostat_O/I, ...) acababa como Part::Feature visible para poder hacer
+# .Shape.cut, y el .FCStd guardaba todas.
+# Ahora los constructores trabajan sobre un BuildTree: las herramientas son formas
+# sueltas y solo las piezas finales pasan por tree.part(...). El árbol (nombre, forma,
+# material, color, grupo padre) se escribe después con un único materialize(doc) dentro
+# de bulk_build, o se vuelca a un Assembly.
+#
+#   tree = BuildTree()
+#   tree.group("Bus")
+#   tree.part("BusShell", box.cut(inner), color=(0.35, 0.35, 0.4), parent="Bus", material="AL")
+#   objs = tree.materialize(doc)          # o: tree.to_assembly().materialize(doc, "Sat")
+#
+# build_parallel acepta un BuildTree como destino: los workers construyen su propio árbol
+# y devuelven solo los nodos.
+
+from .assembly import Assembly
+from .bulk import bulk_build, set_view
+
+_PROP_TYPES = ((bool, "App::PropertyBool"), (int, "App::PropertyInteger"),
+               (float, "App::PropertyFloat"), (str, "App::PropertyString"))
+
+
+class Node:
+    __slots__ = ("index", "Name", "Shape", "material", "color", "transparency", "parent", "props")
+
+    def __init__(self, index, name, shape, material, color, transparency, parent, props):
+        self.index = index
+        self.Name, self.Shape = name, shape
+        self.material, self.color, self.transparency = material, color, transparency
+        self.parent, self.props = parent, props
+
+    @property
+    def Label(self):
+        return self.Name
+
+    def __repr__(self):
+        return "<Node %s>" % self.Name
+
+
+class BuildTree:
+    def __init__(self):
+        self.nodes = []
+        self.groups = {}  # nombre -> grupo padre (o None)
+        self._by_name = {}
+
+    # ---------- construcción ----------
+    def group(self, name, parent=None):
+        self.groups.setdefault(name, parent)
+        return name
+
+    def part(self, name, shape, color=None, transparency=0, material=None, parent=None, **props):
+        # transparency en % (0-100) como ViewObject.Transparency
+        if shape is None:
+            return None
+        if parent is not None:
+            self.group(parent)
+        n = Node(len(self.nodes), name, shape, material, color, int(transparency or 0), parent, props)
+        self.nodes.append(n)
+        self._by_name.setdefault(name, n)
+        return n
+
+    def get(self, name):
+        return self._by_name.get(name)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    # ---------- materialización ----------
+    def _group_obj(self, doc, name, made, root):
+        if name in made:
+            return made[name]
+        g = doc.addObject("App::DocumentObjectGroup", name)
+        made[name] = g
+        parent = self.groups.get(name)
+        owner = self._group_obj(doc, parent, made, root) if parent is not None else root
+        if owner is not None:
+            owner.addObject(g)
+        return g
+
+    def materialize(self, doc, group=None, groups=True):
+        # Un Part::Feature por nodo (en orden) y sus grupos; devuelve los objetos.
+        # groups=False (workers): el grupo padre queda en la propiedad BuildParent
+        out, made = [], {}
+        with bulk_build(doc, recompute=False):
+            for n in self.nodes:
+                o = doc.addObject("Part::Feature", n.Name)
+                o.Shape = n.Shape
+                props = dict(n.props)
+                if n.material is not None:
+                    props.setdefault("Material", n.material)
+                if n.parent is not None and not groups:
+                    props["BuildParent"] = n.parent
+                for k, v in props.items():
+                    if k not in o.PropertiesList:
+                        typ = next((t for cls, t in _PROP_TYPES if isinstance(v, cls)), None)
+                        if typ is None:
+                            continue
+                        o.addProperty(typ, k, "Meta", "")
+                    setattr(o, k, v)
+                view = {}
+                if n.color is not None:
+                    view["ShapeColor"] = tuple(n.color)
+                if n.transparency:
+                    view["Transparency"] = n.transparency
+                if view:
+                    set_view(o, **view)
+                owner = self._group_obj(doc, n.parent, made, group) if n.parent is not None and groups else group
+                if owner is not None:
+                    owner.addObject(o)
+                out.append(o)
+        return out
+
+    def to_assembly(self, asm=None, materials=None):
+        # Vuelca los nodos a un Assembly; materials: {clave: (nombre, densidad, datos)}
+        asm = Assembly() if asm is None else asm
+        for n in self.nodes:
+            it = asm.add(n.Shape, n.Name, n.color, n.transparency / 100.0)
+            if n.material is not None:
+                name, rho, data = (materials or {}).get(n.material, (n.material, n.props.get("Density", 0.0), None))
+                asm.set_material(it, n.material, name, rho, data)
+        return asm
@@ -0,0 +1,149 @@
+# starsat.bulk – inserción masiva de objetos en un documento.
+# Antes: cada add_obj/add_part hacía addObject + Shape + ShapeColor + Transparency +
+# varios addProperty con la pila de deshacer activa, y el árbol y la vista 3D se
+# actualizaban tras cada llamada.
+# Ahora, dentro de bulk_build(doc):
+#   - UndoMode = 0 (sin transacciones de deshacer) y RecomputesFrozen = True,
+#   - set_view() no toca el ViewProvider: encola color / transparencia / visibilidad,
+#   - al salir: una sola pasada sobre los ViewProviders, un solo recompute() y se
+#     restaura el estado del documento; BULK_STATS guarda objetos, vistas y tiempo.
+#
+#   with bulk_build(doc):
+#       o = add_feature(doc, "Hull", shape, color=(0.7, 0.7, 0.75))
+#       set_view(o, Transparency=40)
+#
+# Las macros de script plano pueden usar begin_bulk(doc) ... end_bulk(doc), siempre con
+# end_bulk en un finally: una sesión que no se cierra deja el documento sin deshacer ni
+# recompute, y la siguiente ejecución solo se anidaría en ella. Las sesiones se anidan
+# (solo la exterior actúa).
+
+import time
+from contextlib import contextmanager
+
+import FreeCAD as App
+
+_SESSIONS = {}  # doc.Name -> sesión activa
+# doc.Name -> {objects, views, t}
+BULK_STATS = {}
+
+
+class _Session:
+    def __init__(self, doc):
+        self.doc = doc
+        self.depth = 1
+        self.pending = []
+        self.t0 = time.perf_counter()
+        self.n0 = len(doc.Objects)
+        self.undo = getattr(doc, "UndoMode", None)
+        self.frozen = getattr(doc, "RecomputesFrozen", None)
+
+
+def _apply(obj, props):
+    try:
+        vo = obj.ViewObject
+    except Exception:
+        return
+    if vo is None:
+        return
+    for k, v in props.items():
+        try:
+            setattr(vo, k, v)
+        except Exception:
+            pass
+
+
+def set_view(obj, **props):
+    # ShapeColor=, Transparency=, Visibility=, ...; diferido si hay sesión en su documento
+    if obj is None:
+        return obj
+    doc = getattr(obj, "Document", None)
+    s = _SESSIONS.get(doc.Name) if doc is not None else None
+    if s is None:
+        _apply(obj, props)
+    else:
+        s.pending.append((obj, props))
+    return obj
+
+
+def pending_view(obj):
+    # Propiedades de vista encoladas para obj (las que verá tras end_bulk)
+    doc = getattr(obj, "Document", None)
+    s = _SESSIONS.get(doc.Name) if doc is not None else None
+    out = {}
+    for o, props in (s.pending if s is not None else ()):
+        if o.Name == obj.Name:
+            out.update(props)
+    return out
+
+
+def add_feature(doc, name, shape, color=None, transparency=None, group=None):
+    o = doc.addObject("Part::Feature", name)
+    o.Shape = shape
+    view = {}
+    if color is not None:
+        view["ShapeColor"] = color
+    if transparency:
+        view["Transparency"] = transparency
+    if view:
+        set_view(o, **view)
+    if group is not None:
+        group.addObject(o)
+    return o
+
+
+def begin_bulk(doc):
+    s = _SESSIONS.get(doc.Name)
+    if s is not None:
+        s.depth += 1
+        return s
+    s = _SESSIONS[doc.Name] = _Session(doc)
+    for attr, value in (("UndoMode", 0), ("RecomputesFrozen", True)):
+        try:
+            setattr(doc, attr, value)
+        except Exception:
+            pass
+    return s
+
+
+def end_bulk(doc, recompute=True):
+    s = _SESSIONS.get(doc.Name)
+    if s is None:
+        if recompute:
+            doc.recompute()
+        return
+    s.depth -= 1
+    if s.depth > 0:
+        return
+    del _SESSIONS[doc.Name]
+    for obj, props in s.pending:
+        _apply(obj, props)
+    if s.frozen is not None:
+        try:
+            doc.RecomputesFrozen = s.frozen
+        except Exception:
+            pass
+    if recompute:
+        doc.recompute()
+    if s.undo is not None:
+        try:
+            doc.UndoMode = s.undo
+        except Exception:
+            pass
+    dt = time.perf_counter() - s.t0
+    n = len(doc.Objects) - s.n0
+    st = BULK_STATS.setdefault(doc.Name, {"objects": 0, "views": 0, "t": 0.0})
+    st["objects"] += n
+    st["views"] += len(s.pending)
+    st["t"] += dt
+    if n or s.pending:
+        App.Console.PrintMessage("bulk_build[%s]: %d objetos, %d vistas en una pasada, %.3f s\n"
+                                 % (doc.Name, n, len(s.pending), dt))
+
+
+@contextmanager
+def bulk_build(doc, recompute=True):
+    begin_bulk(doc)
+    try:
+        yield doc
+    finally:
+        end_bulk(doc, recompute)
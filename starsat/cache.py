@@ -0,0 +1,629 @@
+# starsat.cache – caché en disco, direccionada por contenido, para constructores de subconjuntos.
+# @brep_cache envuelve funciones como build_capsule_multilayer o create_advanced_tps:
+#   clave = hash(fuente de la función + funciones del mismo módulo que llama,
+#                fuentes del paquete starsat (fillets, laminate, booleans...),
+#                argumentos, globales escalares/formas que lee,
+#                SOLO las claves de los dicts de parámetros (P, TPS, TK...) que lee,
+#                y el contexto: LOD, opciones booleanas (fuzzy, glue, refine...), GUI/consola)
+#   valor = compound .brep comprimido con gzip + JSON con los objetos que la llamada
+#           añadió al documento (nombre, etiqueta, color, propiedades de material) y las
+#           piezas / nodos que añadió a un Assembly o BuildTree recibido como argumento o
+#           leído como global (ASM = Assembly() en las macros); en un acierto se vuelven a
+#           añadir a ese mismo destino.
+# Las claves leídas de cada dict se rastrean en la primera ejecución (manifiesto
+# .deps.json por versión de la fuente), así un cambio en P['mid_d'] no invalida un
+# constructor que no la lee. Expulsión LRU por tamaño total del directorio (entradas y
+# manifiestos).
+# Un argumento o global leído sin huella estable (lambdas, objetos propios, formas cuya
+# huella falla) no se puede meter en la clave: esa llamada se ejecuta sin caché.
+#   STARSAT_CACHE=0             desactiva la caché
+#   STARSAT_CACHE_DIR=ruta      directorio (por defecto ~/.cache/starsat/brep)
+#   STARSAT_CACHE_MAX_MB=512    límite de tamaño
+
+import contextlib
+import functools
+import gzip
+import hashlib
+import inspect
+import json
+import marshal
+import os
+import time
+import types
+from collections import OrderedDict
+
+import FreeCAD as App
+import Part
+
+from .assembly import Assembly, Item
+from .buildtree import _PROP_TYPES, BuildTree, Node
+from .bulk import bulk_build, pending_view, set_view
+from .lod import lod_level
+
+CACHE_VERSION = 1
+ENABLED = os.environ.get("STARSAT_CACHE", "1") not in ("", "0")
+CACHE_DIR = os.environ.get("STARSAT_CACHE_DIR") or os.path.join(
+    os.path.expanduser("~"), ".cache", "starsat", "brep")
+MAX_BYTES = int(float(os.environ.get("STARSAT_CACHE_MAX_MB", "512")) * 1024 * 1024)
+
+# Propiedades de metadatos que las macros añaden a los Part::Feature
+META_PROPS = ("Material", "MaterialNotes", "TmaxC", "Density", "MaterialData",
+              "Corrosion_Resistance", "Thermal_Conductivity", "Mass", "BuildParent")
+
+# nombre de función -> {"hits", "misses", "bypassed", "t_saved"}
+CACHE_STATS = {}
+
+_ALL = "*"
+_SCALARS = (type(None), bool, int, float, str)
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_LIB_HASH = []
+
+
+# ===================== Rastreo de lecturas en dicts de parámetros =====================
+class TrackedDict(dict):
+    # Copia del dict de parámetros que anota qué claves se leen
+    def __init__(self, *a, **kw):
+        dict.__init__(self, *a, **kw)
+        self.reads = set()
+
+    def __getitem__(self, k):
+        self.reads.add(k)
+        return dict.__getitem__(self, k)
+
+    def get(self, k, default=None):
+        self.reads.add(k)
+        return dict.get(self, k, default)
+
+    def __contains__(self, k):
+        self.reads.add(k)
+        return dict.__contains__(self, k)
+
+    def setdefault(self, k, default=None):
+        self.reads.add(k)
+        return dict.setdefault(self, k, default)
+
+    def _all(self):
+        self.reads.add(_ALL)
+
+    def __iter__(self):
+        self._all()
+        return dict.__iter__(self)
+
+    def keys(self):
+        self._all()
+        return dict.keys(self)
+
+    def values(self):
+        self._all()
+        return dict.values(self)
+
+    def items(self):
+        self._all()
+        return dict.items(self)
+
+    def copy(self):
+        self._all()
+        return dict(self)
+
+
+# ===================== Huellas =====================
+def shape_fingerprint(sh):
+    try:
+        if sh.isNull():
+            return "null"
+        bb = sh.BoundBox
+        return "%s|%d|%d|%d|%.9g|%.9g|%.6f,%.6f,%.6f,%.6f,%.6f,%.6f" % (
+            sh.ShapeType, len(sh.Faces), len(sh.Edges), len(sh.Vertexes), sh.Volume, sh.Area,
+            bb.XMin, bb.YMin, bb.ZMin, bb.XMax, bb.YMax, bb.ZMax)
+    except Exception:
+        return "shape?"
+
+
+def shape_key(sh):
+    # Identidad de la forma (TShape + ubicación + orientación), sin tocar OCC: para cachés en
+    # memoria. shape_fingerprint describe el contenido (caja, volumen, conteos) y sirve para
+    # la caché en disco, pero confunde piezas simétricas o reparadas con el mismo resumen.
+    try:
+        return "%d|%s|%r" % (sh.hashCode(), sh.Orientation, sh.Placement)
+    except Exception:
+        return None
+
+
+def _same(a, b):
+    try:
+        return a.isEqual(b)
+    except Exception:
+        return a is b
+
+
+class ShapeCache(object):
+    # LRU en memoria por identidad de forma (+ extra: radio, aristas...). Guarda la forma
+    # junto al valor: su TShape sigue vivo y hashCode no se reutiliza para otra pieza.
+    def __init__(self, size):
+        self.size = size
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, shape, extra=None, default=None):
+        k = shape_key(shape)
+        hit = self._data.get((k, extra)) if k is not None else None
+        if hit is None or not _same(hit[0], shape):
+            return default
+        self._data.move_to_end((k, extra))
+        return hit[1]
+
+    def put(self, shape, value, extra=None):
+        k = shape_key(shape)
+        if k is None:
+            return
+        self._data[(k, extra)] = (shape, value)
+        self._data.move_to_end((k, extra))
+        if len(self._data) > self.size:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+
+
+def fingerprint(v):
+    # Representación estable de un valor; None si no aporta a la clave (documento, Assembly /
+    # BuildTree de destino, módulos, clases). TypeError si no tiene huella: la llamada no es cacheable
+    if isinstance(v, _SCALARS):
+        return repr(v)
+    if isinstance(v, (list, tuple)):
+        return "[%s]" % ",".join(str(fingerprint(x)) for x in v)
+    if isinstance(v, (set, frozenset)):
+        return "{%s}" % ",".join(sorted(str(fingerprint(x)) for x in v))
+    if isinstance(v, dict):
+        return "{%s}" % ",".join("%r:%s" % (k, fingerprint(v[k])) for k in sorted(v, key=repr))
+    if isinstance(v, (App.Vector, App.Placement, App.Rotation)):
+        return repr(v)
+    if isinstance(v, (App.Document, Assembly, BuildTree, types.ModuleType, type)):
+        return None
+    if isinstance(v, (App.DocumentObject, Item)) and hasattr(v, "Shape"):
+        v = v.Shape
+    if isinstance(v, Part.Shape):
+        fp = shape_fingerprint(v)
+        if fp == "shape?":
+            raise TypeError("forma sin huella")
+        return fp
+    raise TypeError("sin huella estable: %s" % type(v).__name__)
+
+
+def _code_objects(code):
+    yield code
+    for c in code.co_consts:
+        if isinstance(c, types.CodeType):
+            for sub in _code_objects(c):
+                yield sub
+
+
+def _closure(fn):
+    # Funciones del mismo módulo alcanzables desde fn y globales de datos que leen
+    g = fn.__globals__
+    funcs, data, todo = [], set(), [fn]
+    seen = set()
+    while todo:
+        f = todo.pop()
+        if id(f) in seen:
+            continue
+        seen.add(id(f))
+        funcs.append(f)
+        for code in _code_objects(f.__code__):
+            for n in code.co_names:
+                if n not in g:
+                    continue
+                v = getattr(g[n], "__wrapped__", g[n])
+                if isinstance(v, types.FunctionType):
+                    if v.__globals__ is g:
+                        todo.append(v)
+                elif not isinstance(v, (types.ModuleType, type, types.BuiltinFunctionType)):
+                    data.add(n)
+    return funcs, sorted(data)
+
+
+def _source(f):
+    try:
+        return inspect.getsource(f)
+    except Exception:
+        return marshal.dumps(f.__code__).hex()
+
+
+def _library_hash():
+    # Fuentes del paquete starsat, una vez por proceso: cambiar un helper invalida la caché
+    if not _LIB_HASH:
+        h = hashlib.sha1()
+        for n in sorted(os.listdir(_HERE)):
+            if n.endswith(".py"):
+                h.update(n.encode())
+                with open(os.path.join(_HERE, n), "rb") as fh:
+                    h.update(fh.read())
+        _LIB_HASH.append(h.hexdigest())
+    return _LIB_HASH[0]
+
+
+def _context():
+    # Estado global que cambia la geometría sin pasar por los argumentos
+    from .booleans import OPTIONS  # diferido: booleans -> healing -> cache
+    return "lod=%s|bool=%s|gui=%d" % (lod_level(), fingerprint(OPTIONS), bool(getattr(App, "GuiUp", 0)))
+
+
+def _source_hash(fn, funcs):
+    h = hashlib.sha1(("v%d|%s|%s" % (CACHE_VERSION, App.Version()[:3], _library_hash())).encode())
+    for f in sorted(funcs, key=lambda f: f.__qualname__):
+        h.update(f.__qualname__.encode())
+        h.update(_source(f).encode())
+    return h.hexdigest()
+
+
+# ===================== Almacenamiento =====================
+def _paths(base):
+    return base + ".brep.gz", base + ".json"
+
+
+def _manifest_path(fn, src_hash):
+    return os.path.join(CACHE_DIR, "%s-%s.deps.json" % (fn.__name__, src_hash[:16]))
+
+
+def _load_manifest(path):
+    try:
+        with open(path) as fh:
+            manifest = json.load(fh)
+        os.utime(path, None)  # en uso: al final de la cola LRU
+        return manifest
+    except Exception:
+        return None
+
+
+def _evict():
+    # LRU sobre entradas (.brep.gz + .json) y manifiestos (.deps.json): un manifiesto de
+    # una versión vieja de la fuente o del paquete no vuelve a leerse y acaba expulsado
+    try:
+        entries = []
+        for n in os.listdir(CACHE_DIR):
+            p = os.path.join(CACHE_DIR, n)
+            if n.endswith(".brep.gz"):
+                meta = p[:-len(".brep.gz")] + ".json"
+                size = os.path.getsize(p) + (os.path.getsize(meta) if os.path.exists(meta) else 0)
+                entries.append((os.path.getmtime(p), size, (p, meta)))
+            elif n.endswith(".deps.json"):
+                entries.append((os.path.getmtime(p), os.path.getsize(p), (p,)))
+        total = sum(e[1] for e in entries)
+        for _, size, paths in sorted(entries):
+            if total <= MAX_BYTES:
+                break
+            for q in paths:
+                try:
+                    os.remove(q)
+                except OSError:
+                    pass
+            total -= size
+    except OSError:
+        pass
+
+
+def _obj_record(o):
+    rec = {"name": o.Name, "label": o.Label, "color": None, "transparency": 0, "props": []}
+    try:
+        rec["color"] = list(o.ViewObject.ShapeColor[:3])
+        rec["transparency"] = o.ViewObject.Transparency
+    except Exception:
+        pass
+    view = pending_view(o)
+    if "ShapeColor" in view:
+        rec["color"] = list(view["ShapeColor"][:3])
+    rec["transparency"] = view.get("Transparency", rec["transparency"])
+    for p in META_PROPS:
+        if p in o.PropertiesList:
+            rec["props"].append([p, o.getTypeIdOfProperty(p), o.getGroupOfProperty(p), getattr(o, p)])
+    return rec
+
+
+def _node_record(n, dest):
+    # Los nodos ya llevan color y transparencia: no hace falta ViewObject (FreeCADCmd no tiene)
+    props = dict(n.props)
+    if n.material is not None:
+        props["Material"] = n.material
+    if n.parent is not None:
+        props["BuildParent"] = n.parent
+    rec = {"kind": "node", "dest": dest, "name": n.Name, "label": n.Name,
+           "color": list(n.color[:3]) if n.color is not None else None,
+           "transparency": n.transparency, "props": []}
+    for k, v in props.items():
+        typ = next((t for cls, t in _PROP_TYPES if isinstance(v, cls)), None)
+        if typ is not None:
+            rec["props"].append([k, typ, "Meta", v])
+    return rec
+
+
+def _item_record(it, dest):
+    asm, i = it.asm, it.index
+    m = asm.material_of[i]
+    c = asm.colors[i]
+    return {"kind": "item", "dest": dest, "name": asm.labels[i], "label": asm.labels[i],
+            "color": list(c[:3]), "transparency": int(round(c[3] * 100)), "visible": asm.visible[i],
+            "material": list(asm.materials[m]) if m >= 0 else None, "props": []}
+
+
+def _ref(o):
+    # Identidad de un objeto creado: Part::Feature por nombre, nodo por objeto, pieza por índice
+    if isinstance(o, Node):
+        return ("node", id(o))
+    if isinstance(o, Item):
+        return ("item", id(o.asm), o.index)
+    if isinstance(o, App.DocumentObject):
+        return ("obj", o.Name)
+    return None
+
+
+def save_objects(base, result, created, dests=None):
+    # Serializa resultado + objetos creados (Part::Feature, nodos de BuildTree o piezas de
+    # Assembly) en base.brep.gz / base.json; dests: destino de cada nodo / pieza (índice en
+    # los targets de load_objects). Devuelve False si el resultado no es serializable. También lo usan
+    # los workers de parallel.
+    shapes, objs = [], []
+    index = {}
+    for i, o in enumerate(created):
+        if isinstance(o, Node):
+            rec = _node_record(o, dests[i] if dests else 0)
+        elif isinstance(o, Item):
+            rec = _item_record(o, dests[i] if dests else 0)
+        elif o.TypeId != "Part::Feature":
+            return False
+        else:
+            rec = _obj_record(o)
+        index[_ref(o)] = len(objs)
+        rec["shape"] = len(shapes)
+        shapes.append(o.Shape)
+        objs.append(rec)
+
+    if result is None:
+        spec = ["none"]
+    elif isinstance(result, Part.Shape):
+        spec = ["shape", len(shapes)]
+        shapes.append(result)
+    elif _ref(result) in index:
+        spec = ["obj", index[_ref(result)]]
+    elif isinstance(result, (list, tuple)) and all(o is None or _ref(o) in index for o in result):
+        spec = ["objs", [-1 if o is None else index[_ref(o)] for o in result]]
+    else:
+        return False
+
+    brep_path, meta_path = _paths(base)
+    data = Part.makeCompound(shapes).exportBrepToString() if shapes else ""
+    with gzip.open(brep_path + ".tmp", "wt") as fh:
+        fh.write(data)
+    with open(meta_path, "w") as fh:
+        json.dump({"result": spec, "objects": objs, "n_shapes": len(shapes)}, fh)
+    os.replace(brep_path + ".tmp", brep_path)
+    return True
+
+
+def _load_obj(doc, rec, shapes):
+    o = doc.addObject("Part::Feature", rec["name"])
+    o.Label = rec["label"]
+    o.Shape = shapes[rec["shape"]]
+    view = {"Transparency": rec["transparency"]}
+    if rec["color"] is not None:
+        view["ShapeColor"] = tuple(rec["color"])
+    set_view(o, **view)
+    for name, typ, group, value in rec["props"]:
+        try:
+            if name not in o.PropertiesList:
+                o.addProperty(typ, name, group, "")
+            setattr(o, name, value)
+        except Exception:
+            pass
+    return o
+
+
+def _load_node(tree, rec, shapes):
+    props = dict((name, value) for name, typ, group, value in rec["props"])
+    parent = props.pop("BuildParent", None) or None
+    material = props.pop("Material", None)
+    return tree.part(rec["label"], shapes[rec["shape"]], rec["color"], rec["transparency"], material, parent, **props)
+
+
+def _load_item(asm, rec, shapes):
+    it = asm.add(shapes[rec["shape"]], rec["label"], rec["color"], rec["transparency"] / 100.0)
+    asm.visible[it.index] = rec.get("visible", True)
+    if rec.get("material"):
+        key, name, rho, data = rec["material"]
+        asm.set_material(it, key, name, rho, data)
+    return it
+
+
+def load_objects(base, doc, targets=None):
+    # Recrea en doc (o en un BuildTree) los objetos guardados por save_objects y devuelve el resultado original;
+    # targets: destinos de los nodos / piezas (por defecto el propio doc si es un BuildTree)
+    brep_path, meta_path = _paths(base)
+    with open(meta_path) as fh:
+        meta = json.load(fh)
+    shapes = []
+    if meta["n_shapes"]:
+        with gzip.open(brep_path, "rt") as fh:
+            comp = Part.Shape()
+            comp.importBrepFromString(fh.read())
+        shapes = comp.childShapes()
+        if len(shapes) != meta["n_shapes"]:
+            raise ValueError("compound con %d formas, se esperaban %d" % (len(shapes), meta["n_shapes"]))
+
+    if targets is None:
+        targets = [doc] if isinstance(doc, BuildTree) else []
+    objs = []
+    with bulk_build(doc, recompute=False) if isinstance(doc, App.Document) else contextlib.nullcontext():
+        for rec in meta["objects"]:
+            kind = rec.get("kind", "obj")
+            if kind == "node":
+                objs.append(_load_node(targets[rec["dest"]], rec, shapes))
+            elif kind == "item":
+                objs.append(_load_item(targets[rec["dest"]], rec, shapes))
+            elif isinstance(doc, BuildTree):
+                objs.append(_load_node(doc, rec, shapes))
+            else:
+                objs.append(_load_obj(doc, rec, shapes))
+
+    spec = meta["result"]
+    if spec[0] == "shape":
+        return shapes[spec[1]]
+    if spec[0] == "obj":
+        return objs[spec[1]]
+    if spec[0] == "objs":
+        return [objs[i] if i >= 0 else None for i in spec[1]]
+    return None
+
+
+# ===================== Decorador =====================
+def _entry_key(src_hash, args, kwargs, g, data, manifest):
+    h = hashlib.sha1(("%s|%s" % (src_hash, _context())).encode())
+    for a in args:
+        h.update(str(fingerprint(a)).encode())
+    for k in sorted(kwargs):
+        h.update(("%s=%s" % (k, fingerprint(kwargs[k]))).encode())
+    for n in data:
+        v = g.get(n)
+        if isinstance(v, dict) and not isinstance(v, TrackedDict):
+            keys = manifest.get(n, [])
+            if _ALL in keys:
+                h.update(("%s:%s" % (n, fingerprint(v))).encode())
+            else:
+                for k in keys:
+                    h.update(("%s[%r]=%s" % (n, k, fingerprint(v[k]) if k in v else "<missing>")).encode())
+        else:
+            h.update(("%s=%s" % (n, fingerprint(v))).encode())
+    return h.hexdigest()
+
+
+def _run_traced(fn, args, kwargs, data):
+    # Ejecuta fn con los dicts globales sustituidos por TrackedDict y devuelve (resultado, manifiesto)
+    g = fn.__globals__
+    swapped = {}
+    for n in data:
+        v = g.get(n)
+        if type(v) is dict:
+            swapped[n] = (v, TrackedDict(v))
+            g[n] = swapped[n][1]
+    try:
+        result = fn(*args, **kwargs)
+    finally:
+        manifest = {}
+        for n, (orig, td) in swapped.items():
+            g[n] = orig
+            if dict.__ne__(td, orig):
+                orig.clear()
+                orig.update(dict(dict.items(td)))
+            simple = all(isinstance(k, (str, int)) for k in td.reads)
+            manifest[n] = sorted(td.reads, key=repr) if simple and _ALL not in td.reads else [_ALL]
+    return result, manifest
+
+
+def _doc_from_args(args):
+    for a in args:
+        if isinstance(a, App.Document):
+            return a
+    return App.ActiveDocument
+
+
+def _targets(args, kwargs, g, data):
+    # Assembly / BuildTree a los que el constructor puede añadir piezas (argumentos o globales leídos)
+    out = []
+    for v in list(args) + list(kwargs.values()) + [g.get(n) for n in data]:
+        if isinstance(v, (Assembly, BuildTree)) and not any(v is t for t in out):
+            out.append(v)
+    return out
+
+
+def _target_parts(t, start=0):
+    return t.nodes[start:] if isinstance(t, BuildTree) else t.items()[start:]
+
+
+def _bypass(fn, stats, err):
+    # Llamada con un argumento / global sin huella: se construye sin leer ni guardar la caché
+    stats["bypassed"] += 1
+    App.Console.PrintWarning("brep_cache[%s]: llamada sin caché (%s)\n" % (fn.__name__, err))
+
+
+def brep_cache(fn):
+    stats = CACHE_STATS.setdefault(fn.__name__, {"hits": 0, "misses": 0, "bypassed": 0, "t_saved": 0.0})
+    closure = []
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not ENABLED:
+            return fn(*args, **kwargs)
+        # El cierre se resuelve en la primera llamada: las funciones auxiliares pueden
+        # definirse en la macro después del constructor decorado
+        if not closure:
+            funcs, data = _closure(fn)
+            closure.extend([data, _source_hash(fn, funcs)])
+        data, src_hash = closure
+        g = fn.__globals__
+        doc = _doc_from_args(args)
+        targets = _targets(args, kwargs, g, data)
+        mpath = _manifest_path(fn, src_hash)
+        manifest = _load_manifest(mpath)
+
+        if manifest is not None:
+            try:
+                key = _entry_key(src_hash, args, kwargs, g, data, manifest["deps"])
+            except TypeError as e:
+                _bypass(fn, stats, e)
+                return fn(*args, **kwargs)
+            base = os.path.join(CACHE_DIR, key)
+            if os.path.exists(_paths(base)[1]):
+                try:
+                    t0 = time.perf_counter()
+                    result = load_objects(base, doc, targets)
+                    os.utime(_paths(base)[0], None)
+                    t = time.perf_counter() - t0
+                    stats["hits"] += 1
+                    stats["t_saved"] += max(0.0, manifest.get("t_build", 0.0) - t)
+                    App.Console.PrintMessage("brep_cache[%s]: acierto (%.2f s)\n" % (fn.__name__, t))
+                    return result
+                except Exception as e:
+                    App.Console.PrintWarning("brep_cache[%s]: entrada ilegible (%s); reconstruyendo\n"
+                                             % (fn.__name__, e))
+
+        before = set(o.Name for o in doc.Objects) if doc else set()
+        sizes = [len(t.nodes) if isinstance(t, BuildTree) else len(t) for t in targets]
+        t0 = time.perf_counter()
+        result, deps = _run_traced(fn, args, kwargs, data)
+        t_build = time.perf_counter() - t0
+        created = [o for o in doc.Objects if o.Name not in before] if doc else []
+        dests = [0] * len(created)
+        for j, (t, n0) in enumerate(zip(targets, sizes)):
+            parts = _target_parts(t, n0)
+            created += parts
+            dests += [j] * len(parts)
+        try:
+            key = _entry_key(src_hash, args, kwargs, g, data, deps)
+        except TypeError as e:
+            _bypass(fn, stats, e)
+            return result
+        stats["misses"] += 1
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(mpath, "w") as fh:
+                json.dump({"deps": deps, "t_build": t_build}, fh)
+            if save_objects(os.path.join(CACHE_DIR, key), result, created, dests):
+                _evict()
+            else:
+                App.Console.PrintWarning("brep_cache[%s]: resultado no cacheable\n" % fn.__name__)
+        except Exception as e:
+            App.Console.PrintWarning("brep_cache[%s]: no se pudo guardar (%s)\n" % (fn.__name__, e))
+        return result
+
+    return wrapper
+
+
+def clear_cache():
+    if not os.path.isdir(CACHE_DIR):
+        return
+    for n in os.listdir(CACHE_DIR):
+        if n.endswith((".brep.gz", ".json", ".tmp")):
+            try:
+                os.remove(os.path.join(CACHE_DIR, n))
+            except OSError:
+                pass
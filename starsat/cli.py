@@ -0,0 +1,339 @@
+# starsat.cli – ejecución por lotes de cualquier macro sin interfaz gráfica:
+#
+#   starsat-build DFDmacro.py --set scale=2.5 --set truss_count=12 --out model.step
+#   starsat-build sim/python_files/HexShieldToImprove.py --set TK.panel_t=3 --out hex.brep
+#
+# Si el intérprete actual no tiene FreeCAD, se relanza bajo FreeCADCmd (los argumentos
+# viajan en STARSAT_CLI, porque FreeCADCmd interpreta los suyos como ficheros a abrir).
+# Dentro de FreeCAD la macro se compila con dos cambios en su AST:
+#   - tras cada asignación de primer nivel a P / TPS / TK (o a una de sus claves) se
+#     aplican los --set; una clave sin prefijo va al primer dict que la contenga y, si
+#     ninguno la tiene, a la variable global del mismo nombre. Con prefijo (P.clave) solo
+#     se cambian claves que el dict ya tiene: una errata se avisa, no crea una clave nueva
+#   - las sentencias que tocan .ViewObject se eliminan (no hay proveedores de vista)
+# FreeCADGui se sustituye por un módulo nulo, así Gui.activeView()... no hace nada.
+# Los --set activos viajan también a los workers de build_parallel, que cargan la macro
+# con load_module y los mismos cambios.
+#   --out  .step/.stp (Import), .brep (compound de los objetos raíz) o .FCStd
+#   --profile trace.json  perfil por operación (starsat.profiling), también STARSAT_PROFILE
+
+import argparse
+import ast
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+import types
+
+DICTS = ("P", "TPS", "TK")
+# Overrides de la macro en ejecución (execute), para los workers de starsat.parallel
+_ACTIVE = []
+_HERE = os.path.dirname(os.path.abspath(__file__))
+REPO = os.path.dirname(_HERE)
+WORKER = os.path.join(_HERE, "_cli_worker.py")
+
+
+def _parser():
+    ap = argparse.ArgumentParser(prog="starsat-build",
+                                 description="Ejecuta una macro FreeCAD sin GUI con parámetros modificados")
+    ap.add_argument("macro")
+    ap.add_argument("--set", dest="overrides", action="append", default=[], metavar="[DICT.]clave=valor",
+                    help="valor literal de Python (2.5, 12, (1,0,0), 'texto'); repetible")
+    ap.add_argument("--out", help="exporta el resultado (.step/.stp, .brep, .FCStd)")
+    ap.add_argument("--profile", default=os.environ.get("STARSAT_PROFILE"),
+                    help="escribe un trace Chrome (.json) y pilas colapsadas (.folded) de booleanas/fillets")
+    ap.add_argument("--freecadcmd", help="ejecutable FreeCADCmd (por defecto STARSAT_FREECADCMD o PATH)")
+    return ap
+
+
+def parse_overrides(items):
+    # ["P.scale=2.5", "truss_count=12"] -> [(dict o None, clave, valor), ...]
+    out = []
+    for item in items:
+        key, sep, raw = item.partition("=")
+        if not sep or not key.strip():
+            raise ValueError("--set espera clave=valor: %r" % item)
+        key = key.strip()
+        try:
+            value = ast.literal_eval(raw.strip())
+        except (ValueError, SyntaxError):
+            value = raw.strip()
+        target, dot, rest = key.partition(".")
+        if dot and target in DICTS:
+            out.append((target, rest, value))
+        else:
+            out.append((None, key, value))
+    return out
+
+
+def format_overrides(items):
+    # Inversa de parse_overrides: [(dict o None, clave, valor)] -> ["P.scale=2.5", ...]
+    return ["%s%s=%r" % (t + "." if t else "", k, v) for t, k, v in items]
+
+
+def active_overrides():
+    return list(_ACTIVE)
+
+
+# ======================================================
+# Overrides y limpieza de la macro (AST)
+# ======================================================
+class _Overrides:
+    def __init__(self, items):
+        self.items = items
+        self.owner = {}  # índice de --set sin prefijo -> dict o global que lo recibió
+
+    def apply_dict(self, name, d):
+        if not isinstance(d, dict):
+            return
+        for i, (target, key, value) in enumerate(self.items):
+            if key not in d:
+                continue
+            if target is None:
+                if self.owner.setdefault(i, name) != name:
+                    continue
+            elif target != name:
+                continue
+            d[key] = value
+            self.owner[i] = name
+
+    def apply_global(self, key, value):
+        for i, (target, k, v) in enumerate(self.items):
+            if target is None and k == key and self.owner.setdefault(i, "") == "":
+                return v
+        return value
+
+    def pending(self):
+        return ["%s%s" % (t + "." if t else "", k) for i, (t, k, v) in enumerate(self.items)
+                if i not in self.owner]
+
+
+def _touches_view(node):
+    return any(isinstance(n, ast.Attribute) and n.attr == "ViewObject" for n in ast.walk(node))
+
+
+class _StripView(ast.NodeTransformer):
+    def _strip(self, node):
+        return ast.copy_location(ast.Pass(), node) if _touches_view(node) else node
+
+    visit_Assign = visit_AugAssign = visit_AnnAssign = visit_Expr = _strip
+
+
+def _names(target, out):
+    # x = ..., a, b = ..., P["k"] = ... (solo la base de subíndices/atributos de P/TPS/TK)
+    if isinstance(target, ast.Name):
+        out.add(target.id)
+    elif isinstance(target, (ast.Tuple, ast.List)):
+        for e in target.elts:
+            _names(e, out)
+    elif isinstance(target, ast.Starred):
+        _names(target.value, out)
+    elif isinstance(target, (ast.Subscript, ast.Attribute)):
+        base = target.value
+        if isinstance(base, ast.Name) and base.id in DICTS:
+            out.add(base.id)
+    return out
+
+
+def _assigned(stmt):
+    if isinstance(stmt, ast.Assign):
+        targets = stmt.targets
+    elif isinstance(stmt, (ast.AugAssign, ast.AnnAssign)):
+        targets = [stmt.target]
+    else:
+        return set()
+    out = set()
+    for t in targets:
+        _names(t, out)
+    return out
+
+
+def _hook(fn, name):
+    return ast.Call(ast.Name(fn, ast.Load()), [ast.Constant(name), ast.Name(name, ast.Load())], [])
+
+
+def transform(source, filename, overrides):
+    tree = _StripView().visit(ast.parse(source, filename))
+    scalars = set(k for t, k, v in overrides.items if t is None)
+    body = []
+    for stmt in tree.body:
+        body.append(stmt)
+        for name in sorted(_assigned(stmt)):
+            if name in DICTS:
+                body.append(ast.Expr(_hook("__starsat_dict__", name)))
+            elif name in scalars:
+                body.append(ast.Assign([ast.Name(name, ast.Store())], _hook("__starsat_global__", name)))
+    tree.body = body
+    return compile(ast.fix_missing_locations(tree), filename, "exec")
+
+
+def _globals(overrides, **kw):
+    return dict(kw, __starsat_dict__=overrides.apply_dict, __starsat_global__=overrides.apply_global)
+
+
+def load_module(path, items, name="starsat_job"):
+    # La macro como módulo (sin su bloque __main__) con los overrides aplicados
+    overrides = _Overrides(items)
+    with open(path, encoding="utf-8") as f:
+        code = transform(f.read(), path, overrides)
+    mod = types.ModuleType(name)
+    mod.__dict__.update(_globals(overrides, __file__=path))
+    exec(code, mod.__dict__)
+    return mod
+
+
+# ======================================================
+# FreeCADGui nulo
+# ======================================================
+class _Null:
+    def __getattr__(self, name):
+        return self
+
+    def __setattr__(self, name, value):
+        pass
+
+    def __call__(self, *a, **k):
+        return self
+
+    def __iter__(self):
+        return iter(())
+
+    def __bool__(self):
+        return False
+
+
+def install_headless_gui():
+    mod = types.ModuleType("FreeCADGui")
+    null = _Null()
+    mod.__getattr__ = lambda name: null
+    sys.modules["FreeCADGui"] = mod
+    return mod
+
+
+# ======================================================
+# Ejecución dentro de FreeCAD
+# ======================================================
+def _root_objects(doc):
+    out = []
+    for o in doc.Objects:
+        shp = getattr(o, "Shape", None)
+        if shp is None or shp.isNull() or any(hasattr(p, "Shape") for p in o.InList):
+            continue
+        out.append(o)
+    return out
+
+
+def export(doc, path):
+    import Part
+    objs = _root_objects(doc)
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".step", ".stp"):
+        import Import
+        Import.export(objs, path)
+    elif ext in (".brep", ".brp"):
+        Part.makeCompound([o.Shape for o in objs]).exportBrep(path)
+    elif ext == ".fcstd":
+        doc.saveAs(path)
+    else:
+        raise ValueError("formato de salida no soportado: %s" % ext)
+    return len(objs)
+
+
+def execute(path, items, profile=None):
+    # Ejecuta la macro con los overrides ya parseados; devuelve (doc activo, tiempos)
+    import FreeCAD as App
+    if not App.GuiUp:
+        install_headless_gui()
+    path = os.path.abspath(path)
+    overrides = _Overrides(items)
+    t0 = time.perf_counter()
+    with open(path, encoding="utf-8") as f:
+        code = transform(f.read(), path, overrides)
+    g = _globals(overrides, __name__="__main__", __file__=path, __builtins__=__builtins__)
+    if os.path.dirname(path) not in sys.path:
+        sys.path.insert(0, os.path.dirname(path))
+    if profile:
+        from .profiling import enable
+        enable(profile)
+    t1 = time.perf_counter()
+    _ACTIVE[:] = items
+    try:
+        exec(code, g)
+    finally:
+        del _ACTIVE[:]
+    t2 = time.perf_counter()
+
+    for key in overrides.pending():
+        App.Console.PrintWarning("starsat-build: --set %s no se aplicó (no está en %s ni es global)\n"
+                                 % (key, "/".join(DICTS)))
+    doc = App.ActiveDocument
+    if doc is not None:
+        doc.recompute()
+    t3 = time.perf_counter()
+    if profile:
+        from .profiling import disable
+        disable()
+    return doc, {"compile": t1 - t0, "macro": t2 - t1, "recompute": t3 - t2}
+
+
+def run(args):
+    import FreeCAD as App
+    path = os.path.abspath(args["macro"])
+    t0 = time.perf_counter()
+    doc, times = execute(path, parse_overrides(args["overrides"]), args.get("profile"))
+    if doc is None:
+        App.Console.PrintWarning("starsat-build: la macro no dejó ningún documento activo\n")
+        return 1 if (args.get("out") or args.get("metrics")) else 0
+    t1 = time.perf_counter()
+    n_out = export(doc, os.path.abspath(args["out"])) if args.get("out") else 0
+    times["export"] = time.perf_counter() - t1
+    times["total"] = time.perf_counter() - t0
+    if args.get("metrics"):
+        from .sweep import doc_metrics
+        with open(args["metrics"], "w") as f:
+            json.dump(dict(doc_metrics(doc), **times), f)
+
+    App.Console.PrintMessage(
+        "starsat-build: %s  compilar %.2f s, macro %.2f s, recompute %.2f s%s, total %.2f s (%d objetos)\n"
+        % (os.path.basename(path), times["compile"], times["macro"], times["recompute"],
+           ", export %.2f s -> %s (%d)" % (times["export"], args["out"], n_out) if args.get("out") else "",
+           times["total"], len(doc.Objects)))
+    return 0
+
+
+# ======================================================
+# Punto de entrada
+# ======================================================
+def _freecadcmd(explicit=None):
+    exe = explicit or os.environ.get("STARSAT_FREECADCMD")
+    if exe:
+        return exe
+    for name in ("FreeCADCmd", "freecadcmd", "FreeCADCmd.exe"):
+        exe = shutil.which(name)
+        if exe:
+            return exe
+    return None
+
+
+def main(argv=None):
+    ns = _parser().parse_args(argv)
+    try:
+        parse_overrides(ns.overrides)
+    except ValueError as e:
+        _parser().error(str(e))
+    args = {"macro": os.path.abspath(ns.macro), "overrides": ns.overrides,
+            "out": os.path.abspath(ns.out) if ns.out else None,
+            "profile": os.path.abspath(ns.profile) if ns.profile else None}
+    try:
+        import FreeCAD  # noqa: F401
+    except ImportError:
+        exe = _freecadcmd(ns.freecadcmd)
+        if exe is None:
+            sys.stderr.write("starsat-build: FreeCAD no es importable y no se encontró FreeCADCmd "
+                             "(usa --freecadcmd o STARSAT_FREECADCMD)\n")
+            return 2
+        env = dict(os.environ, STARSAT_CLI=json.dumps(dict(args, repo=REPO)))
+        return subprocess.call([exe, WORKER], env=env)
+    return run(args)
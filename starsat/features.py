@@ -0,0 +1,244 @@
+# starsat.features – componentes recurrentes como objetos FeaturePython paramétricos.
+# En lugar de congelar una forma en un Part::Feature, cada componente guarda sus
+# parámetros como propiedades y reconstruye su Shape en execute(); el grafo de
+# dependencias de FreeCAD solo recalcula las features tocadas y la macro ya no
+# tiene que borrar y volver a crear objetos para cambiar una cota.
+#
+#   disc = make_tps_disc(doc, "TPS", Diameter=2600, FoamThickness=120)
+#   disc.FoamThickness = 90; doc.recompute()      # solo se recalcula "TPS"
+#
+# Todas las cotas en mm. La Placement del objeto se aplica sobre la geometría local.
+# El módulo debe poder importarse (repo en sys.path) al reabrir un .FCStd que las use.
+
+import FreeCAD as App
+import Part
+
+from .booleans import cut, cut_all, fuse, fuse_all
+from .patterns import polar_pattern
+from .laminate import capsule_layers
+from .primitives import paraboloid_shell
+
+X = App.Vector(1, 0, 0)
+Z = App.Vector(0, 0, 1)
+
+
+def _v(q):
+    return getattr(q, "Value", q)
+
+
+# ===================== Base =====================
+class _Feature:
+    TYPE = "StarSat::Feature"
+    # (tipo de propiedad, nombre, grupo, descripción, valor por defecto)
+    PROPS = ()
+
+    def __init__(self, obj, **kw):
+        obj.Proxy = self
+        for typ, name, group, tip, default in self.PROPS:
+            if name not in obj.PropertiesList:
+                obj.addProperty(typ, name, group, tip)
+            setattr(obj, name, kw.pop(name, default))
+        if kw:
+            raise TypeError("%s: propiedades desconocidas %s" % (self.__class__.__name__, sorted(kw)))
+
+    def p(self, obj):
+        return dict((name, _v(getattr(obj, name))) for _, name, _, _, _ in self.PROPS)
+
+    def execute(self, obj):
+        pl = obj.Placement
+        obj.Shape = self.build(**self.p(obj))
+        obj.Placement = pl
+
+    def build(self, **p):
+        raise NotImplementedError
+
+    # Serialización del proxy (no guarda estado: todo vive en las propiedades)
+    def dumps(self):
+        return None
+
+    def loads(self, state):
+        return None
+
+    __getstate__ = dumps
+
+    def __setstate__(self, state):
+        return None
+
+
+# ===================== Disco TPS multicapa =====================
+class TPSDisc(_Feature):
+    # Cara cerámica con flecha + núcleo foam + capa C/C + rim; cara trasera en z=0, escudo hacia -Z.
+    # Las capas se apilan a tope (sin solape): las une el contexto booleano (fuzzy/glue).
+    # Los documentos antiguos conservan una propiedad Overlap que ya no se lee.
+    TYPE = "StarSat::TPSDisc"
+    PROPS = (
+        ("App::PropertyLength", "Diameter", "TPS", "Diámetro del escudo", 2600.0),
+        ("App::PropertyLength", "Crown", "TPS", "Flecha/abombamiento frontal", 80.0),
+        ("App::PropertyLength", "CeramicThickness", "TPS", "Espesor cara cerámica", 4.0),
+        ("App::PropertyLength", "FoamThickness", "TPS", "Espesor núcleo foam", 120.0),
+        ("App::PropertyLength", "CCThickness", "TPS", "Espesor capa trasera C/C", 12.0),
+        ("App::PropertyLength", "RimWidth", "TPS", "Ancho del rim perimetral", 60.0),
+        ("App::PropertyLength", "RimHeight", "TPS", "Altura del rim perimetral", 80.0),
+    )
+
+    def build(self, Diameter, Crown, CeramicThickness, FoamThickness, CCThickness,
+              RimWidth, RimHeight):
+        R = Diameter / 2.0
+        cer = Part.makeCylinder(R, CeramicThickness)
+        if Crown > 0:
+            cer = fuse(cer, Part.makeCone(R, R - 40.0, Crown, App.Vector(0, 0, -Crown)))
+        foam = Part.makeCylinder(R, FoamThickness, App.Vector(0, 0, CeramicThickness))
+        back = Part.makeCylinder(R, CCThickness, App.Vector(0, 0, CeramicThickness + FoamThickness))
+        z_rim = CeramicThickness + FoamThickness + CCThickness - RimHeight
+        rim = cut(Part.makeCylinder(R, RimHeight, App.Vector(0, 0, z_rim)),
+                  Part.makeCylinder(R - RimWidth, RimHeight, App.Vector(0, 0, z_rim)))
+        disc = fuse_all([cer, foam, back, rim], "tps_disc")
+        disc.translate(App.Vector(0, 0, -(CeramicThickness + FoamThickness + CCThickness)))
+        return disc
+
+
+# ===================== Capa de cápsula =====================
+class CapsuleLayer(_Feature):
+    # Cáscara (exterior - interior) de espesor constante en cilindro y hemisferios
+    TYPE = "StarSat::CapsuleLayer"
+    PROPS = (
+        ("App::PropertyLength", "OuterRadius", "Capsule", "Radio exterior de la capa", 105.0),
+        ("App::PropertyLength", "Thickness", "Capsule", "Espesor de la capa", 6.0),
+        ("App::PropertyLength", "CylinderLength", "Capsule", "Longitud del tramo cilíndrico", 360.0),
+    )
+
+    def build(self, OuterRadius, Thickness, CylinderLength):
+        return capsule_layers(OuterRadius, CylinderLength, [min(Thickness, OuterRadius - 1.0)])[0]
+
+
+# ===================== Plato parabólico =====================
+class ParabolicDish(_Feature):
+    # Cáscara paraboloidal de espesor radial constante, vértice en el origen, abre hacia +Z
+    TYPE = "StarSat::ParabolicDish"
+    PROPS = (
+        ("App::PropertyLength", "Diameter", "Dish", "Diámetro de la boca", 1600.0),
+        ("App::PropertyLength", "Depth", "Dish", "Profundidad", 180.0),
+        ("App::PropertyLength", "Thickness", "Dish", "Espesor de pared", 6.0),
+        ("App::PropertyInteger", "Steps", "Dish", "Recorte del vértice: z0 = Depth/Steps (perfil exacto)", 128),
+    )
+
+    def build(self, Diameter, Depth, Thickness, Steps):
+        return paraboloid_shell(Diameter, Depth, Thickness, Depth / max(1, Steps))
+
+
+# ===================== Radiador con aletas =====================
+class FinnedRadiator(_Feature):
+    # Placa W x T x H (X, Y, Z) con aletas sobre la cara +Y repartidas en Z
+    TYPE = "StarSat::FinnedRadiator"
+    PROPS = (
+        ("App::PropertyLength", "Width", "Radiator", "Ancho (X)", 1200.0),
+        ("App::PropertyLength", "Height", "Radiator", "Alto (Z)", 750.0),
+        ("App::PropertyLength", "Thickness", "Radiator", "Espesor de la placa (Y)", 18.0),
+        ("App::PropertyLength", "FinThickness", "Radiator", "Espesor de aleta", 4.0),
+        ("App::PropertyLength", "FinGap", "Radiator", "Paso libre entre aletas", 20.0),
+    )
+
+    def build(self, Width, Height, Thickness, FinThickness, FinGap):
+        base = Part.makeBox(Width, Thickness, Height)
+        pitch = FinGap + FinThickness
+        fins = [Part.makeBox(Width, FinThickness, FinGap, App.Vector(0, Thickness, i*pitch))
+                for i in range(int(Height / pitch))]
+        return fuse_all([base] + fins, "finned_radiator")
+
+
+# ===================== Anillo de truss =====================
+class TrussRing(_Feature):
+    # N vigas paralelas a Z repartidas en un círculo, con agujeros de interfaz opcionales
+    TYPE = "StarSat::TrussRing"
+    PROPS = (
+        ("App::PropertyInteger", "Count", "Truss", "Número de vigas", 8),
+        ("App::PropertyLength", "RingRadius", "Truss", "Radio del círculo de vigas", 900.0),
+        ("App::PropertyLength", "BeamRadius", "Truss", "Radio de viga", 80.0),
+        ("App::PropertyLength", "BeamLength", "Truss", "Longitud de viga", 6000.0),
+        ("App::PropertyInteger", "HoleCount", "Truss", "Agujeros de interfaz por viga", 0),
+        ("App::PropertyLength", "HoleDiameter", "Truss", "Diámetro de agujero", 50.0),
+    )
+
+    def build(self, Count, RingRadius, BeamRadius, BeamLength, HoleCount, HoleDiameter):
+        beam = Part.makeCylinder(BeamRadius, BeamLength)
+        beams = polar_pattern(beam, Count, Z, RingRadius)
+        truss = fuse_all(beams, "truss_ring")
+        if HoleCount > 0:
+            holes = [Part.makeCylinder(HoleDiameter/2.0, BeamRadius*2, App.Vector(0, 0, j*BeamLength/HoleCount))
+                     for j in range(HoleCount)]
+            tools = []
+            for h in holes:
+                tools += polar_pattern(h, Count, Z, RingRadius)
+            truss = cut_all(truss, tools, "truss_ring_holes")
+        return truss
+
+
+# ===================== Anillo de propulsores iónicos =====================
+class IonThrusterRing(_Feature):
+    # Propulsores (cuerpo + rejilla anular + tobera) sobre un aro alrededor de X; rejilla en x=0
+    TYPE = "StarSat::IonThrusterRing"
+    PROPS = (
+        ("App::PropertyInteger", "Count", "Ion", "Número de propulsores", 8),
+        ("App::PropertyLength", "RingRadius", "Ion", "Radio del aro", 120.0),
+        ("App::PropertyLength", "BodyRadius", "Ion", "Radio del cuerpo", 22.0),
+        ("App::PropertyLength", "BodyLength", "Ion", "Longitud del cuerpo", 38.0),
+        ("App::PropertyLength", "GridOuterRadius", "Ion", "Radio exterior de rejilla", 26.0),
+        ("App::PropertyLength", "GridInnerRadius", "Ion", "Radio interior de rejilla", 18.0),
+        ("App::PropertyLength", "GridThickness", "Ion", "Espesor de rejilla", 2.0),
+        ("App::PropertyLength", "NozzleRadius1", "Ion", "Radio de tobera (salida)", 20.0),
+        ("App::PropertyLength", "NozzleRadius2", "Ion", "Radio de tobera (cuello)", 12.0),
+        ("App::PropertyLength", "NozzleLength", "Ion", "Longitud de tobera", 20.0),
+        ("App::PropertyBool", "SupportRing", "Ion", "Incluir aro soporte", True),
+    )
+
+    def build(self, Count, RingRadius, BodyRadius, BodyLength, GridOuterRadius, GridInnerRadius,
+              GridThickness, NozzleRadius1, NozzleRadius2, NozzleLength, SupportRing):
+        body = Part.makeCylinder(BodyRadius, BodyLength, App.Vector(-BodyLength, 0, 0), X)
+        grid = Part.makeCylinder(GridOuterRadius, GridThickness, App.Vector(0, 0, 0), X).cut(
+            Part.makeCylinder(GridInnerRadius, GridThickness, App.Vector(0, 0, 0), X))
+        noz = Part.makeCone(NozzleRadius1, NozzleRadius2, NozzleLength,
+                            App.Vector(-BodyLength - NozzleLength, 0, 0), X)
+        parts = []
+        for seed in (body, grid, noz):
+            parts += polar_pattern(seed, Count, X, RingRadius)
+        if SupportRing:
+            parts.append(Part.makeCylinder(RingRadius + 6.0, 3.0, App.Vector(-3.0, 0, 0), X).cut(
+                Part.makeCylinder(RingRadius - 6.0, 3.0, App.Vector(-3.0, 0, 0), X)))
+        return Part.makeCompound(parts)
+
+
+# ===================== Fábricas =====================
+def _make(cls, doc, name, props):
+    doc = doc or App.ActiveDocument
+    obj = doc.addObject("Part::FeaturePython", name)
+    cls(obj, **props)
+    if App.GuiUp:
+        try:
+            obj.ViewObject.Proxy = 0
+        except Exception:
+            pass
+    return obj
+
+
+def make_tps_disc(doc=None, name="TPSDisc", **props):
+    return _make(TPSDisc, doc, name, props)
+
+
+def make_capsule_layer(doc=None, name="CapsuleLayer", **props):
+    return _make(CapsuleLayer, doc, name, props)
+
+
+def make_parabolic_dish(doc=None, name="ParabolicDish", **props):
+    return _make(ParabolicDish, doc, name, props)
+
+
+def make_finned_radiator(doc=None, name="FinnedRadiator", **props):
+    return _make(FinnedRadiator, doc, name, props)
+
+
+def make_truss_ring(doc=None, name="TrussRing", **props):
+    return _make(TrussRing, doc, name, props)
+
+
+def make_ion_thruster_ring(doc=None, name="IonThrusterRing", **props):
+    return _make(IonThrusterRing, doc, name, props)
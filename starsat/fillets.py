@@ -0,0 +1,190 @@
+# starsat.fillets – redondeos dirigidos en lugar de makeFillet(r, shape.Edges) + fallback.
+# Cada arista del sólido se clasifica por las dos caras que la comparten:
+#   convex   arista viva exterior (esquina de caja)
+#   concave  arista viva interior (rincón entre dos operandos, fondo de ranura)
+#   smooth   las caras son tangentes: no hay nada que redondear
+#   seam     arista nueva de la intersección entre operandos fusionados (operands=[A, B, ...])
+#   sliver   arista diminuta (< sliver mm, por defecto r/2): suele romper makeFillet
+#   free     arista con una sola cara (cáscaras abiertas)
+# "sharp" = convex + concave. Las sliver se excluyen salvo que se pidan.
+#
+#   body = fillet_edges(nose.fuse(mid), 20.0, "convex")
+#   tps  = fillet_edges(support.fuse(disk), 6.0, "seam", operands=[support, disk])
+#
+# Antes de llamar a OCC se comprueba el radio contra el ancho de las caras adyacentes
+# (2·área / perímetro: w en una tira, R en un disco): las aristas donde no cabe se
+# descartan con un aviso en vez de dejar que makeFillet falle tras varios segundos.
+# La selección de aristas se guarda por (identidad de la forma, radio, clase, operandos,
+# filtros) y el resultado (o el fallo) por (forma, radio, aristas), así volver a redondear
+# la misma forma (bloques reutilizados por BuildGraph, reintentos) no repite ni la
+# clasificación (adyacencias, convexidad, distToShape de las costuras) ni los redondeos
+# buenos ni los que ya fallaron; dos formas distintas con la misma caja y volumen nunca
+# comparten entrada. Con LOD draft no se redondea nada.
+
+import FreeCAD as App
+import Part
+
+from .cache import ShapeCache, shape_key
+from .lod import lod_wants
+
+CLASSES = ("convex", "concave", "smooth", "seam", "sliver", "free")
+GROUPS = {"sharp": ("convex", "concave")}
+ANGLE_TOL = 1e-3  # |n1 x n2| por debajo -> caras tangentes
+CACHE_SIZE = 256
+
+_CACHE = ShapeCache(CACHE_SIZE)  # (forma, r, aristas) -> forma redondeada o None si falló
+_SELECTED = ShapeCache(CACHE_SIZE)  # (forma, r, clase, operandos, filtros) -> (operandos, aristas)
+_MISS = object()
+STATS = {"calls": 0, "hits": 0, "failures": 0, "dropped": 0}
+
+
+def _edge_faces(shape):
+    # índice de arista -> índices de las caras que la contienen
+    by_hash = {}
+    edges = shape.Edges
+    for i, e in enumerate(edges):
+        by_hash.setdefault(e.hashCode(), []).append(i)
+    out = dict((i, []) for i in range(len(edges)))
+    for fi, f in enumerate(shape.Faces):
+        for fe in f.Edges:
+            for i in by_hash.get(fe.hashCode(), ()):
+                if edges[i].isSame(fe) and fi not in out[i]:
+                    out[i].append(fi)
+    return out
+
+
+def _midpoint(e):
+    t = 0.5 * (e.FirstParameter + e.LastParameter)
+    return e.valueAt(t), e.tangentAt(t)
+
+
+def _normal(face, p):
+    u, v = face.Surface.parameter(p)
+    return face.normalAt(u, v)
+
+
+def _convexity(e, f1, f2):
+    # Dirección d1 que entra en f1 desde la arista; si apunta contra la normal exterior
+    # de f2 la arista es convexa
+    p, t = _midpoint(e)
+    n1, n2 = _normal(f1, p), _normal(f2, p)
+    if n1.cross(n2).Length < ANGLE_TOL:
+        return "smooth"
+    d = n1.cross(t)
+    d.normalize()
+    eps = max(1e-4, 1e-3 * e.Length)
+    u, v = f1.Surface.parameter(p + d * eps)
+    if not f1.isPartOfDomain(u, v):
+        d = d * -1
+    return "convex" if d.dot(n2) < 0 else "concave"
+
+
+def _on_boundary(shape, p, tol):
+    try:
+        return shape.distToShape(Part.Vertex(p))[0] <= tol
+    except Exception:
+        return False
+
+
+def classify_edges(shape, operands=None, sliver=0.0, tol=1e-4, adj=None):
+    # {clase: [índices de shape.Edges]}; seam solo si se pasan los operandos de la fusión
+    out = dict((c, []) for c in CLASSES)
+    faces, edges = shape.Faces, shape.Edges
+    for i, fa in (adj or _edge_faces(shape)).items():
+        e = edges[i]
+        if e.Length < sliver:
+            out["sliver"].append(i)
+            continue
+        if len(fa) < 2:
+            out["free"].append(i)
+            continue
+        try:
+            out[_convexity(e, faces[fa[0]], faces[fa[1]])].append(i)
+        except Exception:
+            out["convex"].append(i)
+        if operands:
+            p = _midpoint(e)[0]
+            if sum(_on_boundary(o, p, tol) for o in operands) >= 2:
+                out["seam"].append(i)
+    return out
+
+
+def _width(face):
+    per = sum(e.Length for e in face.Edges)
+    return 2.0 * face.Area / per if per > 0 else 0.0
+
+
+def select_edges(shape, r, kind="sharp", operands=None, sliver=None, min_length=0.0, max_length=None):
+    kinds = GROUPS.get(kind, (kind,)) if isinstance(kind, str) else tuple(kind)
+    sliver = 0.5 * r if sliver is None else sliver
+    adj = _edge_faces(shape)
+    cls = classify_edges(shape, operands if "seam" in kinds else None, sliver, adj=adj)
+    if "seam" in kinds:
+        picked = set(cls["seam"])
+        picked &= set(cls["convex"] + cls["concave"])  # una costura tangente no se redondea
+        picked |= set(i for k in kinds if k != "seam" for i in cls[k])
+    else:
+        picked = set(i for k in kinds for i in cls[k])
+    edges, faces, width = shape.Edges, shape.Faces, {}
+    out, dropped = [], 0
+    for i in sorted(picked):
+        e = edges[i]
+        if e.Length < min_length or (max_length is not None and e.Length > max_length):
+            continue
+        for fi in adj[i]:
+            if fi not in width:
+                width[fi] = _width(faces[fi])
+        if any(r >= width[fi] for fi in adj[i]):
+            dropped += 1
+            continue
+        out.append(i)
+    if dropped:
+        STATS["dropped"] += dropped
+        App.Console.PrintWarning("fillet_edges: %d aristas descartadas, r=%.3g no cabe en sus caras\n"
+                                 % (dropped, r))
+    return out
+
+
+def _selected(shape, r, kind, operands, sliver, min_length, max_length):
+    # select_edges cacheada; la entrada guarda los operandos para que sus hashCode sigan vivos
+    ops = tuple(operands or ())
+    extra = (round(r, 9), kind if isinstance(kind, str) else tuple(kind),
+             tuple(shape_key(o) for o in ops), sliver, min_length, max_length)
+    hit = _SELECTED.get(shape, extra)
+    if hit is not None:
+        return hit[1]
+    idx = select_edges(shape, r, kind, operands, sliver, min_length, max_length)
+    _SELECTED.put(shape, (ops, idx), extra)
+    return idx
+
+
+def fillet_edges(shape, r, kind="sharp", operands=None, sliver=None, min_length=0.0, max_length=None):
+    # Redondea solo las aristas de la clase pedida; si OCC falla devuelve la forma original
+    STATS["calls"] += 1
+    if not lod_wants("fillets") or r <= 0:
+        return shape
+    idx = _selected(shape, r, kind, operands, sliver, min_length, max_length)
+    if not idx:
+        return shape
+    extra = (round(r, 9), tuple(idx))
+    res = _CACHE.get(shape, extra, _MISS)
+    if res is not _MISS:
+        STATS["hits"] += 1
+        return shape if res is None else res
+    edges = shape.Edges
+    try:
+        res = shape.makeFillet(r, [edges[i] for i in idx])
+        if res.isNull() or not res.isValid():
+            raise ValueError("resultado no válido")
+    except Exception as ex:
+        STATS["failures"] += 1
+        App.Console.PrintWarning("fillet_edges: r=%.3g sobre %d aristas %s falló (%s)\n"
+                                 % (r, len(idx), kind, ex))
+        res = None
+    _CACHE.put(shape, res, extra)
+    return shape if res is None else res
+
+
+def clear_fillet_cache():
+    _CACHE.clear()
+    _SELECTED.clear()
@@ -0,0 +1,144 @@
+# starsat.greebles – detalle de superficie ("greebles") en lote.
+# Antes: un Part::Feature (con su ViewObject) por greeble y sin control de solapes.
+# Ahora:
+#   1) posiciones por muestreo de disco de Poisson (dart throwing) sobre una rejilla
+#      hash uniforme: cada candidato solo se compara con las celdas vecinas -> O(n);
+#      el radio de exclusión es la semidiagonal de la caja de cada greeble + gap,
+#   2) la región se divide en teselas con semilla propia (seed, ix, iy): el resultado es
+#      determinista por semilla e independiente del orden; un pase final en orden de
+#      tesela descarta los pocos solapes en las fronteras. Las teselas se muestrean en
+#      secuencia: es Python puro (con hilos lo serializa el GIL) y un ProcessPool dentro
+#      de FreeCAD relanzaría el ejecutable de FreeCAD y no puede recibir keep (lambda),
+#   3) todas las cajas y cilindros salen en un único compound con una tabla de etiquetas
+#      por elemento (ElementTags: "box"/"cyl", ElementGreeble: índice de greeble).
+#      Con LOD draft el campo entero es una sola losa envolvente (ElementTags: "proxy").
+#
+#   els = sample_greebles(x0, x1, y0, y1, 400, a=(1.8, 9.0), h=(1.8, 6.0), seed=42)
+#   add_greebles(doc, "Greebles", els, z_deck, color, group)
+
+import math
+import random
+
+import FreeCAD as App
+import Part
+
+from .bulk import set_view
+from .lod import lod_wants
+
+V = App.Vector
+TILE = 200.0  # mm, lado de tesela por defecto
+ATTEMPTS = 30  # candidatos por greeble pedido antes de rendirse (región saturada)
+
+
+def _cell(x, y, size):
+    return int(math.floor(x / size)), int(math.floor(y / size))
+
+
+def _conflict(grid, size, x, y, rho, gap):
+    i, j = _cell(x, y, size)
+    for di in (-1, 0, 1):
+        for dj in (-1, 0, 1):
+            for (px, py, pr) in grid.get((i + di, j + dj), ()):
+                lim = rho + pr + gap
+                if (px - x) ** 2 + (py - y) ** 2 < lim * lim:
+                    return True
+    return False
+
+
+def _sample_tile(spec):
+    x0, x1, y0, y1, n, a, h, depth_ratio, cyl_frac, gap, key, keep, cell = spec
+    rng = random.Random(key)
+    grid, out = {}, []
+    for _ in range(ATTEMPTS * n):
+        if len(out) >= n:
+            break
+        w = rng.uniform(*a)
+        d = rng.uniform(*a) * depth_ratio
+        hh = rng.uniform(*h)
+        x, y = rng.uniform(x0, x1), rng.uniform(y0, y1)
+        if keep is not None and not keep(x, y):
+            continue
+        rho = 0.5 * math.hypot(w, d)
+        if _conflict(grid, cell, x, y, rho, gap):
+            continue
+        cyl_dx = None
+        if rng.random() < cyl_frac:
+            cyl_dx = w * 0.15 * (1 if rng.random() < 0.5 else -1)
+        grid.setdefault(_cell(x, y, cell), []).append((x, y, rho))
+        out.append((x, y, w, d, hh, cyl_dx))
+    return out
+
+
+def sample_greebles(x_min, x_max, y_min, y_max, count, a=(1.8, 9.0), h=(1.8, 6.0), depth_ratio=0.6,
+                    cyl_frac=0.25, gap=0.5, seed=0, keep=None, tile=TILE):
+    # -> [(x, y, w, d, h, cyl_dx o None)]; keep(x, y) False excluye la posición
+    if count <= 0 or x_max <= x_min or y_max <= y_min:
+        return []
+    cell = 2.0 * (0.5 * math.hypot(a[1], a[1] * depth_ratio) + gap)
+    nx = max(1, int(math.ceil((x_max - x_min) / tile)))
+    ny = max(1, int(math.ceil((y_max - y_min) / tile)))
+    tw, th = (x_max - x_min) / nx, (y_max - y_min) / ny
+    per_tile = count / float(nx * ny)
+    specs = []
+    for iy in range(ny):
+        for ix in range(nx):
+            k = int(round(per_tile * (iy * nx + ix + 1))) - int(round(per_tile * (iy * nx + ix)))
+            specs.append((x_min + ix * tw, x_min + (ix + 1) * tw, y_min + iy * th, y_min + (iy + 1) * th,
+                          k, a, h, depth_ratio, cyl_frac, gap, "%s:%d:%d" % (seed, ix, iy), keep, cell))
+    tiles = [_sample_tile(s) for s in specs]
+
+    # Fronteras entre teselas: se conserva el primero en orden de tesela
+    grid, out = {}, []
+    for els in tiles:
+        for el in els:
+            x, y, w, d = el[:4]
+            rho = 0.5 * math.hypot(w, d)
+            if _conflict(grid, cell, x, y, rho, gap):
+                continue
+            grid.setdefault(_cell(x, y, cell), []).append((x, y, rho))
+            out.append(el)
+    return out
+
+
+def greeble_compound(elements, z):
+    # Caja apoyada en z (de z a z+h) y, si hay, cilindro encima desplazado cyl_dx en X
+    shapes, tags, owner = [], [], []
+    for i, (x, y, w, d, hh, cyl_dx) in enumerate(elements):
+        shapes.append(Part.makeBox(w, d, hh, V(x - 0.5 * w, y - 0.5 * d, z)))
+        tags.append("box")
+        owner.append(i)
+        if cyl_dx is not None:
+            shapes.append(Part.makeCylinder(min(w, d) * 0.35, 0.9 * hh, V(x + cyl_dx, y, z + hh)))
+            tags.append("cyl")
+            owner.append(i)
+    return Part.makeCompound(shapes), tags, owner
+
+
+def greeble_proxy(elements, z):
+    # Caja que envuelve todos los greebles (cilindros incluidos), sin construirlos
+    x0 = min(x - 0.5 * w for x, y, w, d, hh, c in elements)
+    x1 = max(x + 0.5 * w + abs(c or 0.0) for x, y, w, d, hh, c in elements)
+    y0 = min(y - 0.5 * d for x, y, w, d, hh, c in elements)
+    y1 = max(y + 0.5 * d for x, y, w, d, hh, c in elements)
+    h = max(hh * (1.9 if c is not None else 1.0) for x, y, w, d, hh, c in elements)
+    return Part.makeBox(x1 - x0, y1 - y0, h, V(x0, y0, z))
+
+
+def add_greebles(doc, name, elements, z, color=None, group=None):
+    if not elements:
+        return None
+    if lod_wants("proxies"):
+        comp, tags, owner = greeble_proxy(elements, z), ["proxy"], [-1]
+    else:
+        comp, tags, owner = greeble_compound(elements, z)
+    o = doc.addObject("Part::Feature", name)
+    o.Shape = comp
+    o.addProperty("App::PropertyStringList", "ElementTags", "Greebles", "Tipo de cada sólido del compound")
+    o.addProperty("App::PropertyIntegerList", "ElementGreeble", "Greebles", "Greeble al que pertenece cada sólido")
+    o.ElementTags = tags
+    o.ElementGreeble = owner
+    if color:
+        set_view(o, ShapeColor=color)
+    if group is not None:
+        group.addObject(o)
+    return o
@@ -0,0 +1,152 @@
+# starsat.healing – validación y reparación de formas antes de las booleanas.
+# Antes: si una fusión fallaba se reintentaba con o.tessellate(1.0) (una tupla de puntos
+# de malla: lento y sin sentido como operando) o se saltaba la pieza en silencio, y al
+# final Part.makeSolid(shape.Shells[0]) descartaba todas las demás cáscaras.
+# Ahora:
+#   1) is_valid: isValid() + check(True), cacheado por identidad de la forma (nunca se
+#      vuelve a comprobar la misma forma; no por huella: fix() suele conservar caja,
+#      volumen y conteos y la reparada ocultaría a la original),
+#   2) heal: fix() -> cosido (sewShape) -> eliminación de aristas y caras diminutas
+#      (ShapeFix) -> un sólido por cada cáscara cerrada,
+#   3) HEAL_STATS por etiqueta: piezas comprobadas, reparadas, irreparables y tiempo;
+#      report_healing lo imprime.
+#
+#   a, b = heal(a, "nose"), heal(b, "mid")     # no-op si ya son válidas
+#   final = solidify(fused)                     # todas las cáscaras, no solo Shells[0]
+
+import time
+
+import FreeCAD as App
+import Part
+
+from .cache import ShapeCache
+
+TOL = 1e-3        # mm, precisión de fix/cosido
+MIN_SIZE = 1e-2   # mm, aristas/caras por debajo se eliminan
+CACHE_SIZE = 512
+
+_VALID = ShapeCache(CACHE_SIZE)   # forma -> bool
+_HEALED = ShapeCache(CACHE_SIZE)  # forma -> forma reparada
+_MISS = object()
+# label -> {checked, cache_hits, healed, failed, t}
+HEAL_STATS = {}
+
+
+def _stats(label):
+    return HEAL_STATS.setdefault(label, {"checked": 0, "cache_hits": 0, "healed": 0, "failed": 0, "t": 0.0})
+
+
+def _check(shape):
+    try:
+        if shape.isNull() or not shape.isValid():
+            return False
+        shape.check(True)
+        return True
+    except Exception:
+        return False
+
+
+def is_valid(shape, label="?"):
+    st = _stats(label)
+    ok = _VALID.get(shape, default=_MISS)
+    if ok is not _MISS:
+        st["cache_hits"] += 1
+        return ok
+    st["checked"] += 1
+    ok = _check(shape)
+    _VALID.put(shape, ok)
+    return ok
+
+
+def _fix_small(shape, min_size):
+    # ShapeFix_Wireframe (aristas) y ShapeFix_FixSmallFace; no todas las versiones los exponen
+    fix = getattr(Part, "ShapeFix", None)
+    if fix is None:
+        return shape
+    try:
+        wf = fix.Wireframe(shape)
+        wf.ModeDropSmallEdges = True
+        wf.setPrecision(min_size)
+        wf.fixSmallEdges()
+        wf.fixWireGaps()
+        shape = wf.shape()
+    except Exception:
+        pass
+    try:
+        sf = fix.FixSmallFace()
+        sf.init(shape)
+        sf.setPrecision(min_size)
+        sf.perform()
+        shape = sf.shape()
+    except Exception:
+        pass
+    return shape
+
+
+def solidify(shape):
+    # Un sólido por cada cáscara suelta cerrada (las abiertas se conservan tal cual)
+    if shape is None or shape.isNull() or shape.ShapeType == "Solid":
+        return shape
+    owned = [sh for so in shape.Solids for sh in so.Shells]
+    free = [sh for sh in shape.Shells if not any(sh.isSame(o) for o in owned)]
+    if not free:
+        return shape.Solids[0] if len(shape.Solids) == 1 else shape
+    parts = list(shape.Solids)
+    for sh in free:
+        try:
+            parts.append(Part.makeSolid(sh) if sh.isClosed() else sh)
+        except Exception:
+            parts.append(sh)
+    return parts[0] if len(parts) == 1 else Part.makeCompound(parts)
+
+
+def heal(shape, label="?", tol=TOL, min_size=MIN_SIZE):
+    # Devuelve la forma reparada; si ya era válida, la misma forma sin copiar
+    if shape is None or is_valid(shape, label):
+        return shape
+    out = _HEALED.get(shape)
+    if out is not None:
+        _stats(label)["cache_hits"] += 1
+        return out
+    t0 = time.perf_counter()
+    st = _stats(label)
+    out = shape.copy()
+    try:
+        out.fix(tol, tol, tol)
+    except Exception:
+        pass
+    if not out.Solids or not _check(out):
+        try:
+            out.sewShape(tol)
+        except Exception:
+            pass
+        out = _fix_small(out, min_size)
+        out = solidify(out)
+    ok = _check(out)
+    st["healed" if ok else "failed"] += 1
+    st["t"] += time.perf_counter() - t0
+    if not ok:
+        App.Console.PrintWarning("heal[%s]: la forma sigue sin ser válida tras la reparación\n" % label)
+    _VALID.put(out, ok)
+    _HEALED.put(shape, out)
+    return out
+
+
+def heal_all(shapes, label="?"):
+    return [heal(s, "%s[%d]" % (label, i)) for i, s in enumerate(shapes)]
+
+
+def report_healing(reset=True):
+    if not HEAL_STATS:
+        return
+    App.Console.PrintMessage("heal: comprobadas / en caché / reparadas / irreparables / tiempo\n")
+    for label, st in sorted(HEAL_STATS.items()):
+        App.Console.PrintMessage("  %-28s %4d chk %4d cache %3d ok %3d ko  %.3f s\n" % (
+            label, st["checked"], st["cache_hits"], st["healed"], st["failed"], st["t"]))
+    if reset:
+        HEAL_STATS.clear()
+
+
+def clear_heal_cache():
+    _VALID.clear()
+    _HEALED.clear()
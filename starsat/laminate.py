@@ -0,0 +1,153 @@
+# starsat.laminate – cáscaras multicapa analíticas para cascos de primitivas.
+# Antes: make_hollow_from_offset / shell_from_solid llamaban a makeOffsetShape(-t) sobre
+# el casco fusionado o el toro; lento, falla a menudo y el fallback (sólido macizo
+# "_fallback") falsea las masas.
+# Ahora el casco se describe por su perfil meridiano (x, r) alrededor del eje X
+# (nariz cónica + cilindros = polilínea que empieza y acaba sobre el eje) y cada capa es
+# la región entre dos perfiles desplazados hacia dentro: cada segmento se traslada t
+# según su normal interior y los vecinos se cortan entre sí (unión por intersección,
+# como join=2; los perfiles viven en starsat.meridian, Python puro). Una sola revolución
+# por capa, espesor exacto en cada cara, sin núcleo de offset ni booleanas.
+#
+#   prof = axial_profile([(800, 0, 300), (1400, 450, 450), (800, 600, 600)])  # (L, r0, r1)
+#   cer, al, kev = laminate(prof, [2.0, 10.0, 40.0])       # de fuera hacia dentro
+#   inner = inset_solid(prof, 120.0)                       # hueco interior a 120 mm
+#   wall, liner = laminate_torus(300, 90, [8.0, 6.0], placement)
+#   hot, ins, struct = capsule_layers(105, 360, [6.0, 22.0, 4.0])   # cilindro + hemisferios
+#
+# Si una capa agota la sección (espesor mayor que la pieza) esa capa es la región
+# restante entera y las siguientes son None.
+
+import FreeCAD as App
+import Part
+
+from .meridian import TOL, Collapsed, inset_profile, split_profile
+
+V = App.Vector
+O = V(0, 0, 0)
+X = V(1, 0, 0)
+
+
+# ===================== Sólidos =====================
+def _revolve(pts):
+    vs = [V(x, max(r, 0.0), 0) for x, r in pts]
+    if (vs[0] - vs[-1]).Length > TOL:
+        vs.append(vs[0])
+    return Part.Face(Part.makePolygon(vs)).revolve(O, X, 360)
+
+
+def _placed(shape, placement):
+    if shape is not None and placement is not None:
+        shape.Placement = placement
+    return shape
+
+
+def _joined(shapes):
+    # Un trozo por tramo de split_profile; varios -> compound (solo se tocan en el eje)
+    shapes = [s for s in shapes if s is not None]
+    if not shapes:
+        return None
+    return shapes[0] if len(shapes) == 1 else Part.makeCompound(shapes)
+
+
+def inset_solid(points, d, placement=None):
+    # Sólido de revolución del perfil desplazado d hacia dentro (None si se agota)
+    def piece(pts):
+        try:
+            return _revolve(inset_profile(pts, d))
+        except Collapsed:
+            return None
+    return _placed(_joined([piece(pts) for pts in split_profile(points)]), placement)
+
+
+def laminate(points, thicknesses, placement=None, core=False):
+    # Capas de fuera hacia dentro (+ núcleo restante si core=True); un perfil que vuelve al
+    # eje se lamina por trozos y cada capa junta los de todos
+    pieces = [_laminate(pts, thicknesses, core) for pts in split_profile(points)]
+    n = len(thicknesses) + (1 if core else 0)
+    return [_placed(_joined([p[k] for p in pieces]), placement) for k in range(n)]
+
+
+def _laminate(points, thicknesses, core):
+    out, outer, depth = [], list(points), 0.0
+    for t in thicknesses:
+        if outer is None:
+            out.append(None)
+            continue
+        depth += t
+        try:
+            inner = inset_profile(points, depth)
+        except Collapsed:
+            inner = None
+        # región entre ambos perfiles; los tramos sobre el eje cierran el polígono
+        pts = outer + (list(reversed(inner)) if inner is not None else [])
+        out.append(_revolve(pts))
+        outer = inner
+    if core:
+        out.append(_revolve(outer) if outer is not None else None)
+    return out
+
+
+def laminate_torus(R, r, thicknesses, placement=None, core=False):
+    # Toro de eje Z (como Part.makeTorus): capas de fuera hacia dentro por revolución de anillos
+    def section(ro, ri):
+        c_out = Part.Wire(Part.makeCircle(ro, V(R, 0, 0), V(0, 1, 0)))
+        if ri <= TOL:
+            return Part.Face(c_out)
+        c_in = Part.Wire(Part.makeCircle(ri, V(R, 0, 0), V(0, 1, 0)))
+        return Part.makeFace([c_out, c_in], "Part::FaceMakerBullseye")
+
+    out, ro = [], r
+    for t in thicknesses:
+        if ro <= TOL:
+            out.append(None)
+            continue
+        ri = ro - t
+        out.append(_placed(section(ro, ri).revolve(O, V(0, 0, 1), 360), placement))
+        ro = max(ri, 0.0)
+    if core:
+        out.append(_placed(section(ro, 0.0).revolve(O, V(0, 0, 1), 360), placement) if ro > TOL else None)
+    return out
+
+
+# ===================== Cápsulas =====================
+# Cilindro de longitud L sobre X, centrado en el origen, con hemisferios de radio R en los
+# extremos. Las capas son concéntricas (centros de los hemisferios fijos): el perfil de
+# cada una son los arcos + la generatriz a R_ext y a R_int, cerrados sobre el eje, y
+# R_int de una capa es exactamente R_ext de la siguiente (interfaces compartidas).
+def _capsule_edges(R, L):
+    # Semiperfil exterior en el plano XY (y = r), de x=+L/2+R a x=-L/2-R
+    h, c = 0.5 * L, R * 0.5 ** 0.5
+    front = Part.Arc(V(h + R, 0, 0), V(h + c, c, 0), V(h, R, 0)).toShape()
+    back = Part.Arc(V(-h, R, 0), V(-h - c, c, 0), V(-h - R, 0, 0)).toShape()
+    if L > TOL:
+        return [front, Part.makeLine(V(h, R, 0), V(-h, R, 0)), back]
+    return [front, back]
+
+
+def _capsule_section(R_out, R_in, L):
+    edges = _capsule_edges(R_out, L)
+    h = 0.5 * L
+    if R_in <= TOL:
+        edges.append(Part.makeLine(V(-h - R_out, 0, 0), V(h + R_out, 0, 0)))
+    else:
+        inner = _capsule_edges(R_in, L)
+        edges.append(Part.makeLine(V(-h - R_out, 0, 0), V(-h - R_in, 0, 0)))
+        edges += list(reversed(inner))
+        edges.append(Part.makeLine(V(h + R_in, 0, 0), V(h + R_out, 0, 0)))
+    return Part.Face(Part.Wire(edges))
+
+
+def capsule_layers(R, L, thicknesses, placement=None, core=False):
+    # Capas de fuera hacia dentro; una revolución por capa, sin booleanas
+    out, ro = [], R
+    for t in thicknesses:
+        if ro <= TOL:
+            out.append(None)
+            continue
+        ri = max(ro - t, 0.0)
+        out.append(_placed(_capsule_section(ro, ri, L).revolve(O, X, 360), placement))
+        ro = ri
+    if core:
+        out.append(_placed(_capsule_section(ro, 0.0, L).revolve(O, X, 360), placement) if ro > TOL else None)
+    return out
@@ -0,0 +1,83 @@
+# starsat.lod – nivel de detalle global para iterar rápido en la GUI.
+#   draft   facetas reducidas, sin redondeos ni cortes cosméticos (ranuras, ondulaciones,
+#           discos de relleno), matrices de tornillería/greebles como cajas envolventes,
+#           sin exportación
+#   normal  geometría completa, sin exportación
+#   export  geometría de siempre + exportación (por defecto: sin STARSAT_LOD nada cambia)
+#
+#   STARSAT_LOD=draft freecad macro.py          o desde la consola: set_lod("draft")
+#
+# Los helpers compartidos lo consultan por su cuenta (fillet_edges, cut_all(cosmetic=True),
+# add_greebles, polar/linear_pattern(proxy=True), Assembly.export); las macros usan
+# lod_wants("cosmetic") y lod_wants("export") en sus bucles propios, y lod_steps(n) para las
+# repeticiones que sí se construyen en draft (pernos, separadores): lo que lod_wants ya
+# quita no necesita lod_steps. El nivel entra en la clave de brep_cache y en el estado de
+# BuildGraph, y se hereda en los workers.
+
+import os
+
+import FreeCAD as App
+import Part
+
+LEVELS = ("draft", "normal", "export")
+PROFILES = {
+    "draft": {"steps": 0.25, "fillets": False, "cosmetic": False, "proxies": True, "export": False},
+    "normal": {"steps": 1.0, "fillets": True, "cosmetic": True, "proxies": False, "export": False},
+    "export": {"steps": 1.0, "fillets": True, "cosmetic": True, "proxies": False, "export": True},
+}
+
+_LEVEL = [None]
+
+
+def _check(name):
+    name = (name or "export").strip().lower()
+    if name not in PROFILES:
+        raise ValueError("LOD desconocido '%s' (draft / normal / export)" % name)
+    return name
+
+
+def lod_level():
+    if _LEVEL[0] is None:
+        try:
+            _LEVEL[0] = _check(os.environ.get("STARSAT_LOD"))
+        except ValueError as e:
+            App.Console.PrintWarning("%s; se usa export\n" % e)
+            _LEVEL[0] = "export"
+    return _LEVEL[0]
+
+
+def set_lod(name):
+    # Cambia el nivel para la sesión (y los workers que se lancen después); devuelve el anterior
+    old = lod_level()
+    _LEVEL[0] = _check(name)
+    os.environ["STARSAT_LOD"] = _LEVEL[0]
+    return old
+
+
+def lod_wants(key):
+    # "fillets", "cosmetic", "proxies", "export"
+    return PROFILES[lod_level()][key]
+
+
+def lod_steps(n, minimum=8):
+    # Número de pasos/facetas/repeticiones escalado al nivel actual (en draft n/4, nunca
+    # menos de minimum salvo que n ya lo sea)
+    return max(min(int(n), minimum), int(round(n * PROFILES[lod_level()]["steps"])))
+
+
+def bbox_proxy(shape):
+    # Caja envolvente de la forma (None si está vacía)
+    if shape is None or shape.isNull():
+        return None
+    bb = shape.BoundBox
+    if bb.XLength <= 0 and bb.YLength <= 0 and bb.ZLength <= 0:
+        return None
+    e = 1e-3
+    return Part.makeBox(max(bb.XLength, e), max(bb.YLength, e), max(bb.ZLength, e),
+                        App.Vector(bb.XMin, bb.YMin, bb.ZMin))
+
+
+def proxy_array(shapes):
+    # Una caja envolvente por pieza, todas en un compound (None si no hay piezas)
+    boxes = [b for b in (bbox_proxy(s) for s in shapes if s is not None) if b is not None]
+    return Part.makeCompound(boxes) if boxes else None
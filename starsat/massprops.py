@@ -0,0 +1,154 @@
+# starsat.massprops – propiedades másicas de ensamblados (masa, CG real, tensor de inercia).
+# Antes: compute_center_of_gravity ponderaba o.Placement.Base (el origen del objeto, no su
+# centroide: falso en toda cáscara o toro) y set_mat / assign_props volvían a pedir
+# Shape.Volume a OCC en cada objeto.
+# Ahora:
+#   1) shape_props(shape): volumen, centro de masas y tensor de inercia por unidad de
+#      densidad (mm^5, respecto al centro de masas) de todos los sólidos de la forma,
+#      calculados una vez y cacheados por identidad de la forma (hashCode + Placement: una
+#      consulta no vuelve a pedir Volume / Area a OCC y dos piezas simétricas con la misma
+#      caja y volumen no comparten centro ni tensor),
+#   2) mass_properties(objs): masa total, CG y tensor de inercia del conjunto respecto al
+#      CG por el teorema de Steiner, vectorizado con NumPy (bucle Python si no está).
+# Unidades: mm y kg/m3 -> masa en kg, CG en mm, inercia en kg·mm².
+#
+#   mp = mass_properties(all_objects)       # densidad de o.Density (Part::Feature, Item, Node)
+#   mp["mass"], mp["cg"], mp["inertia"]
+
+from collections import namedtuple
+
+import FreeCAD as App
+
+from .cache import ShapeCache
+
+try:
+    import numpy as np
+except ImportError:  # FreeCAD sin NumPy: mismas sumas en Python
+    np = None
+
+V = App.Vector
+CACHE_SIZE = 4096
+RHO_SCALE = 1e-9  # kg/m3 -> kg/mm3
+
+Props = namedtuple("Props", "volume center inertia")  # mm3, (x, y, z) mm, 3x3 mm^5 en el CG
+
+_CACHE = ShapeCache(CACHE_SIZE)
+STATS = {"calls": 0, "hits": 0}
+
+_ZERO = ((0.0, 0.0, 0.0), (0.0, 0.0, 0.0), (0.0, 0.0, 0.0))
+
+
+def _matrix3(m):
+    return ((m.A11, m.A12, m.A13), (m.A21, m.A22, m.A23), (m.A31, m.A32, m.A33))
+
+
+def _steiner(d, w):
+    # w·(|d|²·E - d·dᵀ): término de traslado de ejes para peso w y desplazamiento d
+    dd = d[0] * d[0] + d[1] * d[1] + d[2] * d[2]
+    return tuple(tuple(w * ((dd if i == j else 0.0) - d[i] * d[j]) for j in range(3)) for i in range(3))
+
+
+def _add(a, b):
+    return tuple(tuple(a[i][j] + b[i][j] for j in range(3)) for i in range(3))
+
+
+def _solid_props(shape):
+    solids = list(shape.Solids)
+    parts = []
+    for s in solids:
+        vol = s.Volume
+        if vol <= 0:
+            continue
+        c = s.CenterOfMass
+        parts.append((vol, (c.x, c.y, c.z), _matrix3(s.MatrixOfInertia)))
+    if not parts:
+        c = shape.BoundBox.Center
+        return Props(0.0, (c.x, c.y, c.z), _ZERO)
+    if len(parts) == 1:
+        return Props(*parts[0])
+    vol = sum(p[0] for p in parts)
+    center = tuple(sum(p[0] * p[1][k] for p in parts) / vol for k in range(3))
+    inertia = _ZERO
+    for v, c, I in parts:
+        inertia = _add(inertia, _add(I, _steiner([c[k] - center[k] for k in range(3)], v)))
+    return Props(vol, center, inertia)
+
+
+def shape_props(shape):
+    STATS["calls"] += 1
+    hit = _CACHE.get(shape)
+    if hit is not None:
+        STATS["hits"] += 1
+        return hit
+    try:
+        props = _solid_props(shape)
+    except Exception:
+        props = Props(0.0, (0.0, 0.0, 0.0), _ZERO)
+    _CACHE.put(shape, props)
+    return props
+
+
+def volume(shape):
+    return shape_props(shape).volume
+
+
+def center_of_mass(shape):
+    return V(*shape_props(shape).center)
+
+
+def _density(o, density):
+    if density is None:
+        return float(getattr(o, "Density", 0.0) or 0.0)
+    if callable(density):
+        return float(density(o) or 0.0)
+    return float(density)
+
+
+def mass_properties(objs, density=None):
+    # objs: objetos con .Shape (Part::Feature, Item, Node) o formas sueltas.
+    # density: None -> o.Density; número; función o -> kg/m3; o lista alineada con objs
+    objs = list(objs)
+    if isinstance(density, (list, tuple)):
+        rhos = [float(r or 0.0) for r in density]
+    else:
+        rhos = [_density(o, density) if o is not None else 0.0 for o in objs]
+    rows, m, c, I = [], [], [], []
+    for o, rho in zip(objs, rhos):
+        if o is None:
+            continue
+        shape = getattr(o, "Shape", o)
+        p = shape_props(shape)
+        mass = p.volume * RHO_SCALE * rho
+        rows.append((getattr(o, "Label", ""), p.volume, mass, V(*p.center)))
+        if mass <= 0:
+            continue
+        m.append(mass)
+        c.append(p.center)
+        I.append((rho * RHO_SCALE, p.inertia))
+    if not m:
+        return {"mass": 0.0, "cg": V(0, 0, 0), "inertia": _ZERO, "rows": rows}
+
+    if np is not None:
+        mm = np.array(m)
+        cc = np.array(c)
+        total = mm.sum()
+        cg = (mm[:, None] * cc).sum(axis=0) / total
+        d = cc - cg
+        own = (np.array([s for s, _ in I])[:, None, None] * np.array([t for _, t in I])).sum(axis=0)
+        dd = (d * d).sum(axis=1)
+        shift = np.eye(3) * (mm * dd).sum() - np.einsum("i,ij,ik->jk", mm, d, d)
+        inertia = tuple(tuple(float(x) for x in row) for row in own + shift)
+        cg = V(float(cg[0]), float(cg[1]), float(cg[2]))
+    else:
+        total = sum(m)
+        cgt = tuple(sum(mi * ci[k] for mi, ci in zip(m, c)) / total for k in range(3))
+        inertia = _ZERO
+        for mi, ci, (s, t) in zip(m, c, I):
+            own = tuple(tuple(s * t[a][b] for b in range(3)) for a in range(3))
+            inertia = _add(inertia, _add(own, _steiner([ci[k] - cgt[k] for k in range(3)], mi)))
+        cg = V(*cgt)
+    return {"mass": float(total), "cg": cg, "inertia": inertia, "rows": rows}
+
+
+def clear_massprops_cache():
+    _CACHE.clear()
@@ -0,0 +1,128 @@
+# starsat.meridian – perfiles meridianos (x, r) alrededor del eje X y su desplazamiento
+# hacia dentro. Python puro (sin FreeCAD): laminate revoluciona estos perfiles y los tests
+# los comprueban sin OCC.
+#
+#   prof = axial_profile([(800, 0, 300), (1400, 450, 450), (800, 600, 600)])  # (L, r0, r1)
+#   inner = inset_profile(prof, 120.0)
+#
+# Un perfil puede volver al eje en medio (un cono con la punta hacia atrás apoyada en el
+# cilindro siguiente): split_profile lo separa en trozos y cada trozo se desplaza aparte,
+# que es exacto porque solo se tocan en un punto.
+#
+# Cada segmento se traslada d según su normal interior y los vecinos se cortan entre sí
+# (unión por intersección). Los segmentos que se invierten desaparecen; si dos vecinos
+# quedan paralelos en sentidos opuestos, el tramo entre ellos tiene ancho nulo o negativo
+# (p.ej. la sección trasera cuando d llega a la mitad de su longitud) y se elimina uno de
+# ellos en lugar de dejar una punta de ida y vuelta en el polígono.
+
+TOL = 1e-7
+
+
+class Collapsed(ValueError):
+    pass
+
+
+def axial_profile(segments, x0=0.0):
+    # segments: [(longitud, r_inicio, r_fin)] a lo largo de +X -> [(x, r)] cerrado sobre el eje
+    pts, x = [(x0, 0.0)], x0
+    for L, r0, r1 in segments:
+        for p in ((x, r0), (x + L, r1)):
+            if abs(p[0] - pts[-1][0]) > TOL or abs(p[1] - pts[-1][1]) > TOL:
+                pts.append(p)
+        x += L
+    if pts[-1][1] > TOL:
+        pts.append((x, 0.0))
+    return pts
+
+
+def split_profile(points):
+    # Tramos que solo se tocan en un punto del eje (p.ej. la punta de un cono apoyada en la
+    # cara de un cilindro) -> un perfil cerrado sobre el eje por cada trozo con área
+    out, cur = [], [points[0]]
+    for p in points[1:]:
+        cur.append(p)
+        if abs(p[1]) <= TOL and len(cur) > 1:
+            if _area(cur) > TOL:
+                out.append(cur)
+            cur = [p]
+    if len(cur) > 1 and _area(cur) > TOL:
+        out.append(cur)
+    return out
+
+
+def _unit(a, b):
+    dx, dr = b[0] - a[0], b[1] - a[1]
+    n = (dx * dx + dr * dr) ** 0.5
+    return (dx / n, dr / n)
+
+
+def _meet(l1, l2):
+    # Corte de dos rectas (punto, dirección); None si son paralelas en sentidos opuestos
+    # (el tramo entre ellas tiene ancho nulo o negativo y no hay vértice que devolver)
+    (p1, u1), (p2, u2) = l1, l2
+    cross = u1[0] * u2[1] - u1[1] * u2[0]
+    if abs(cross) < 1e-12:
+        if u1[0] * u2[0] + u1[1] * u2[1] < 0:
+            return None
+        # colineales: el punto desplazado del vértice común; paralelas separadas: sin corte
+        dist = (p2[0] - p1[0]) * u1[1] - (p2[1] - p1[1]) * u1[0]
+        if abs(dist) > TOL:
+            raise Collapsed("segmentos paralelos")
+        return p2
+    s = ((p2[0] - p1[0]) * u2[1] - (p2[1] - p1[1]) * u2[0]) / cross
+    return (p1[0] + s * u1[0], p1[1] + s * u1[1])
+
+
+def _on_axis(line):
+    (p, u) = line
+    if abs(u[1]) < 1e-12:
+        raise Collapsed("segmento paralelo al eje")
+    s = -p[1] / u[1]
+    return (p[0] + s * u[0], 0.0)
+
+
+def _area(pts):
+    # área de la región entre la polilínea y el eje (fórmula del lazo, cerrada sobre el eje)
+    return 0.5 * abs(sum(a[0] * b[1] - b[0] * a[1] for a, b in zip(pts, pts[1:] + pts[:1])))
+
+
+def _along(a, b, u):
+    return (b[0] - a[0]) * u[0] + (b[1] - a[1]) * u[1]
+
+
+def inset_profile(points, d):
+    # Perfil desplazado d hacia dentro (normal a la derecha del sentido de avance);
+    # los segmentos que se invierten desaparecen y se recortan los vecinos
+    if d <= 0:
+        return list(points)
+    if len(split_profile(points)) > 1:
+        raise ValueError("inset_profile: el perfil vuelve al eje, desplaza cada trozo de split_profile")
+    segs = [(a, b) for a, b in zip(points, points[1:])
+            if abs(b[0] - a[0]) > TOL or abs(b[1] - a[1]) > TOL]
+    lines = []
+    for a, b in segs:
+        u = _unit(a, b)
+        lines.append(((a[0] + u[1] * d, a[1] - u[0] * d), u))
+    active = list(range(len(segs)))
+    while active:
+        act = [lines[i] for i in active]
+        pts = [_on_axis(act[0])] + [_meet(a, b) for a, b in zip(act, act[1:])] + [_on_axis(act[-1])]
+        fold = next((k for k, p in enumerate(pts) if p is None), None)
+        if fold is not None:
+            # act[fold-1] y act[fold] paralelas y opuestas: de A (inicio de la primera) a
+            # B (fin de la segunda) sigue la que avanza de A a B; la otra sobra
+            a, b = pts[fold - 1], pts[fold + 1]
+            if a is None or b is None or _along(a, b, act[fold - 1][1]) >= 0:
+                del active[fold]
+            else:
+                del active[fold - 1]
+            continue
+        bad = [k for k, i in enumerate(active) if _along(pts[k], pts[k + 1], lines[i][1]) <= TOL]
+        if not bad:
+            if any(p[1] < -TOL for p in pts):
+                raise Collapsed("el perfil cruza el eje")
+            if _area(pts) <= TOL:
+                raise Collapsed("sección vacía")
+            return pts
+        del active[bad[0]]
+    raise Collapsed("espesor mayor que la sección")
@@ -0,0 +1,145 @@
+# starsat.parallel – constructores de subconjuntos en paralelo con workers FreeCADCmd.
+# Los build_* de una macro son independientes entre sí (solo comparten parámetros
+# globales), así que cada uno puede ejecutarse en su propio proceso FreeCADCmd:
+#
+#   objs = build_parallel(doc, [build_bus, build_heat_shield, (build_paddle, +1), ...])
+#
+# El worker carga el fichero de la macro como módulo (sin ejecutar su bloque
+# __main__), llama al constructor sobre un documento propio y devuelve las formas
+# como BREP comprimido + metadatos de cada objeto (nombre, etiqueta, color,
+# transparencia, propiedades de material). El padre las materializa en doc en el
+# orden de los trabajos, así el resultado coincide con la ejecución secuencial.
+# El worker hereda el LOD por entorno (STARSAT_LOD) y recibe en el trabajo el contexto
+# booleano activo (booleans.OPTIONS: fuzzy, glue, refine...), el mismo que vería el
+# constructor ejecutado en el proceso. Bajo starsat-build los --set activos van también
+# en el trabajo y el worker carga la macro con ellos (cli.load_module).
+# Si no hay FreeCADCmd o un worker falla, ese constructor se ejecuta en el proceso.
+#   STARSAT_FREECADCMD=ruta   ejecutable FreeCADCmd
+#   STARSAT_JOBS=n            número de workers (por defecto núcleos disponibles)
+
+import contextlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import FreeCAD as App
+
+from .booleans import OPTIONS
+from .buildtree import BuildTree
+from .bulk import bulk_build
+from .cache import load_objects
+from .cli import active_overrides, format_overrides
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+REPO = os.path.dirname(_HERE)
+WORKER = os.path.join(_HERE, "_worker.py")
+
+
+def find_freecadcmd():
+    exe = os.environ.get("STARSAT_FREECADCMD")
+    if exe:
+        return exe
+    for name in ("FreeCADCmd", "freecadcmd", "FreeCADCmd.exe"):
+        exe = shutil.which(name)
+        if exe:
+            return exe
+    try:
+        for name in ("FreeCADCmd", "freecadcmd", "FreeCADCmd.exe"):
+            exe = os.path.join(App.getHomePath(), "bin", name)
+            if os.path.exists(exe):
+                return exe
+    except Exception:
+        pass
+    return None
+
+
+def default_jobs():
+    try:
+        n = len(os.sched_getaffinity(0))
+    except AttributeError:
+        n = os.cpu_count() or 1
+    return int(os.environ.get("STARSAT_JOBS", n))
+
+
+def _split(job):
+    # job: fn  o  (fn, arg1, arg2, ...); el documento siempre es el primer argumento
+    if isinstance(job, (list, tuple)):
+        return job[0], list(job[1:])
+    return job, []
+
+
+def _run_worker(exe, fn, args, base, timeout, tree=False):
+    target = getattr(fn, "__wrapped__", fn)
+    spec = {"repo": REPO, "script": os.path.abspath(target.__code__.co_filename),
+            "func": fn.__name__, "args": args, "out": base, "tree": tree, "boolean_options": dict(OPTIONS),
+            "overrides": format_overrides(active_overrides())}
+    env = dict(os.environ, STARSAT_JOB=json.dumps(spec))
+    t0 = time.perf_counter()
+    try:
+        proc = subprocess.run([exe, WORKER], env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                              timeout=timeout)
+        out = proc.stdout.decode("utf-8", "replace")
+        ok = proc.returncode == 0 and os.path.exists(base + ".json")
+    except subprocess.TimeoutExpired:
+        out, ok = "timeout (%s s)" % timeout, False
+    return ok, out, time.perf_counter() - t0
+
+
+def build_parallel(doc, jobs, workers=None, timeout=None):
+    # Devuelve la lista concatenada de lo que devuelve cada constructor (como "objs += build_x(doc)");
+    # doc puede ser un BuildTree: los constructores reciben el árbol y devuelven nodos
+    jobs = [_split(j) for j in jobs]
+    exe = find_freecadcmd()
+    workers = max(1, min(workers or default_jobs(), len(jobs)))
+    if exe is None or workers == 1:
+        if exe is None:
+            App.Console.PrintWarning("build_parallel: FreeCADCmd no encontrado; ejecución secuencial\n")
+        with _session(doc):
+            return _collect([fn(doc, *args) for fn, args in jobs])
+
+    tmp = tempfile.mkdtemp(prefix="starsat_par_")
+    t0 = time.perf_counter()
+    try:
+        bases = [os.path.join(tmp, "job%03d" % i) for i in range(len(jobs))]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_run_worker, exe, fn, args, base, timeout, isinstance(doc, BuildTree))
+                       for (fn, args), base in zip(jobs, bases)]
+            status = [f.result() for f in futures]
+
+        results, t_workers = [], 0.0
+        with _session(doc):
+            for (fn, args), base, (ok, out, dt) in zip(jobs, bases, status):
+                t_workers += dt
+                if ok:
+                    try:
+                        results.append(load_objects(base, doc))
+                        continue
+                    except Exception as e:
+                        out += "\n%s" % e
+                App.Console.PrintWarning("build_parallel: %s falló en el worker; se ejecuta localmente\n%s\n"
+                                         % (fn.__name__, out[-2000:]))
+                results.append(fn(doc, *args))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    App.Console.PrintMessage("build_parallel: %d constructores, %d workers, %.2f s (secuencial ~%.2f s)\n"
+                             % (len(jobs), workers, time.perf_counter() - t0, t_workers))
+    return _collect(results)
+
+
+def _session(doc):
+    # Un BuildTree no tiene documento que congelar
+    return contextlib.nullcontext() if isinstance(doc, BuildTree) else bulk_build(doc, recompute=False)
+
+
+def _collect(results):
+    out = []
+    for r in results:
+        if isinstance(r, (list, tuple)):
+            out += list(r)
+        elif r is not None:
+            out.append(r)
+    return out
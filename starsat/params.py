@@ -0,0 +1,148 @@
+# starsat.params – grafo de construcción incremental para macros guiadas por un dict P.
+# Cada bloque de geometría (hull, shield, truss, ...) es una función cuyos argumentos
+# son P y/o los nombres de otros bloques:
+#
+#   G = BuildGraph(doc, P)
+#   @G.block
+#   def truss(P): ...
+#   @G.block
+#   def nave(hull, truss): return fuse_all([hull, truss])
+#   G.build({"truss": "Structural_Truss", "nave": "Nave"})
+#
+# En cada ejecución se anotan las claves de P que lee cada bloque. El estado queda en
+# memoria por documento (el módulo starsat sigue importado entre ejecuciones de la macro),
+# así al volver a lanzarla tras cambiar P['truss_beam_r'] solo se recalculan truss y los
+# bloques que dependen de él; el resto de Part::Feature se reutiliza sin tocar su Shape.
+# Los bloques no deben modificar in situ (translate, ...) las formas que reciben.
+# Un bloque también se recalcula si cambia el contexto global que altera la geometría sin
+# pasar por P: LOD y opciones booleanas (fuzzy, glue, refine...), como en brep_cache.
+
+import inspect
+import time
+
+import FreeCAD as App
+
+from .cache import TrackedDict, _context, _source, fingerprint
+from .bulk import bulk_build, set_view
+
+_ALL = "*"
+_MISSING = "<missing>"
+
+# doc.Name -> {"blocks": {nombre: estado}, "objects": {obj.Name: (bloque, versión)}}
+_GRAPHS = {}
+
+
+def reuse_document(name):
+    # Documento existente con ese nombre (para reconstrucción incremental) o uno nuevo
+    docs = App.listDocuments()
+    doc = docs.get(name) or App.newDocument(name)
+    App.setActiveDocument(doc.Name)
+    return doc
+
+
+def forget(doc):
+    _GRAPHS.pop(doc.Name, None)
+
+
+class BuildGraph:
+    def __init__(self, doc, P):
+        self.doc = doc
+        self.P = P
+        self.blocks = {}
+        self.state = _GRAPHS.setdefault(doc.Name, {"blocks": {}, "objects": {}})
+        self.rebuilt = []
+        self.values = {}
+
+    def block(self, fn):
+        args = list(inspect.signature(fn).parameters)
+        self.blocks[fn.__name__] = (fn, args, _source(fn))
+        return fn
+
+    # ---------- evaluación ----------
+    def _read_fp(self, k):
+        # Un valor sin huella estable nunca coincide: el bloque que lo lee se recalcula siempre
+        try:
+            if k == _ALL:
+                return fingerprint(self.P)
+            return fingerprint(self.P[k]) if k in self.P else _MISSING
+        except TypeError:
+            return object()
+
+    def _fresh(self, name, src, deps):
+        st = self.state["blocks"].get(name)
+        if st is None or st["src"] != src or st.get("ctx") != _context():
+            return False
+        if any(self._read_fp(k) != v for k, v in st["reads"].items()):
+            return False
+        return all(self.state["blocks"][d]["version"] == v for d, v in st["deps"].items())
+
+    def _eval(self, name, stack=()):
+        if name in self.values:
+            return self.values[name]
+        if name in stack:
+            raise ValueError("BuildGraph: ciclo en %s" % " -> ".join(stack + (name,)))
+        if name not in self.blocks:
+            raise KeyError("BuildGraph: bloque desconocido '%s'" % name)
+        fn, args, src = self.blocks[name]
+        deps = [a for a in args if a != "P"]
+        kwargs = dict((d, self._eval(d, stack + (name,))) for d in deps)
+        dep_versions = dict((d, self.state["blocks"][d]["version"]) for d in deps)
+
+        if self._fresh(name, src, dep_versions):
+            value = self.state["blocks"][name]["value"]
+        else:
+            tp = TrackedDict(self.P)
+            if "P" in args:
+                kwargs["P"] = tp
+            t0 = time.perf_counter()
+            value = fn(**kwargs)
+            dt = time.perf_counter() - t0
+            reads = [_ALL] if _ALL in tp.reads else tp.reads
+            old = self.state["blocks"].get(name)
+            self.state["blocks"][name] = {
+                "src": src, "ctx": _context(), "deps": dep_versions, "value": value,
+                "reads": dict((k, self._read_fp(k)) for k in reads),
+                "version": (old["version"] + 1) if old else 1}
+            self.rebuilt.append((name, dt))
+        self.values[name] = value
+        return value
+
+    # ---------- materialización ----------
+    def _materialize(self, block, obj_name, color):
+        value = self.values[block]
+        version = self.state["blocks"][block]["version"]
+        obj = self.doc.getObject(obj_name)
+        if obj is None:
+            obj = self.doc.addObject("Part::Feature", obj_name)
+        elif self.state["objects"].get(obj_name) == (block, version):
+            return obj, False
+        obj.Shape = value
+        if color is not None:
+            set_view(obj, ShapeColor=color)
+        self.state["objects"][obj_name] = (block, version)
+        return obj, True
+
+    def build(self, objects=None):
+        # objects: {bloque: nombre_objeto} o {bloque: (nombre_objeto, color)}
+        t0 = time.perf_counter()
+        self.rebuilt = []
+        self.values = {}
+        for name in self.blocks:
+            self._eval(name)
+        out, touched = {}, 0
+        with bulk_build(self.doc, recompute=False):
+            for block, spec in (objects or {}).items():
+                obj_name, color = (spec, None) if isinstance(spec, str) else spec
+                out[block], changed = self._materialize(block, obj_name, color)
+                touched += changed
+        App.Console.PrintMessage(
+            "BuildGraph: %d/%d bloques recalculados, %d/%d objetos actualizados (%.2f s)\n"
+            % (len(self.rebuilt), len(self.blocks), touched, len(objects or {}), time.perf_counter() - t0))
+        for name, dt in self.rebuilt:
+            App.Console.PrintMessage("  %-22s %.3f s\n" % (name, dt))
+        return out
+
+    def readers(self, key):
+        # Bloques cuya última evaluación leyó P[key]
+        return sorted(n for n, st in self.state["blocks"].items()
+                      if key in st["reads"] or _ALL in st["reads"])
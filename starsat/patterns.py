@@ -0,0 +1,63 @@
+# starsat.patterns – matrices polares y lineales de una misma pieza.
+# La geometría semilla se construye una sola vez; cada instancia es una copia
+# ubicada (TopoDS_Location) que comparte la misma TShape. Memoria, tiempo de
+# construcción y tamaño del STEP crecen con las piezas únicas, no con las instancias.
+# proxy=True (tornillería, greebles): con LOD draft la semilla es su caja envolvente.
+
+import FreeCAD as App
+
+from .lod import bbox_proxy, lod_wants
+
+X = App.Vector(1, 0, 0)
+Z = App.Vector(0, 0, 1)
+
+
+def _located(shape, pl):
+    # moved() compone la ubicación sin tocar la TShape
+    try:
+        return shape.moved(pl)
+    except Exception:
+        s = shape.copy()
+        s.Placement = pl.multiply(s.Placement)
+        return s
+
+
+def _perpendicular(axis):
+    # Dirección radial por defecto: X (o Y si el eje es X) proyectada sobre el plano normal
+    for v in (X, App.Vector(0, 1, 0)):
+        r = v - axis * v.dot(axis)
+        if r.Length > 1e-9:
+            return r.normalize()
+
+
+def polar_pattern(shape, n, axis=Z, radius=0.0, center=App.Vector(0, 0, 0),
+                  ref=None, start_deg=0.0, step_deg=None, proxy=False):
+    # Instancia i: semilla desplazada "radius" según ref, girada start + i*step sobre el eje
+    if shape is None or n < 1:
+        return []
+    if proxy and lod_wants("proxies"):
+        shape = bbox_proxy(shape)
+    axis = App.Vector(axis).normalize()
+    step = 360.0 / n if step_deg is None else step_deg
+    seed = shape
+    if radius:
+        ref = _perpendicular(axis) if ref is None else App.Vector(ref).normalize()
+        seed = _located(shape, App.Placement(ref * radius, App.Rotation()))
+    out = []
+    for i in range(n):
+        rot = App.Rotation(axis, start_deg + i * step)
+        pl = App.Placement(center - rot.multVec(center), rot)
+        out.append(seed if pl.isIdentity() else _located(seed, pl))
+    return out
+
+
+def linear_pattern(shape, n, pitch, proxy=False):
+    # pitch: vector entre instancias consecutivas (un escalar se toma sobre X)
+    if shape is None or n < 1:
+        return []
+    if proxy and lod_wants("proxies"):
+        shape = bbox_proxy(shape)
+    if not isinstance(pitch, App.Vector):
+        pitch = X * float(pitch)
+    return [shape if i == 0 else _located(shape, App.Placement(pitch * i, App.Rotation()))
+            for i in range(n)]
@@ -0,0 +1,111 @@
+# starsat.primitives – primitivas exactas para perfiles que las macros aproximaban con
+# polígonos de 72–160 segmentos (cada segmento revolucionado es una cara cónica más
+# para las booleanas, los redondeos y el STEP).
+#
+# Paraboloides (eje Z, vértice en el origen, boca de diámetro d a la altura depth):
+# el perfil z = depth·(r/R)² es exactamente una Bézier cuadrática, así que cada capa
+# sale de una sola revolución:
+#   paraboloid_solid(d, depth)        macizo bajo la boca: 2–3 caras
+#   paraboloid_shell(d, depth, t)     cáscara de espesor radial t (boca interior d-2t),
+#                                     una revolución sin booleana: 4 caras
+# z0 > 0 recorta el vértice como hacían las macros (z0 = depth/steps): la cáscara queda
+# abierta en el fondo con radio r_int(z0), igual que outer.cut(inner).
+#
+# Sectores anulares con arcos verdaderos (radiadores curvos): annular_sector_face,
+# annular_sector.
+
+import math
+
+import FreeCAD as App
+import Part
+
+V = App.Vector
+O = V(0, 0, 0)
+Z = V(0, 0, 1)
+
+
+# ===================== Paraboloides =====================
+def parabola_arc(R, depth, r0=0.0):
+    # Arco de z = depth·(r/R)² en el plano XZ entre r0 y R (Bézier cuadrática exacta:
+    # el polo intermedio es la intersección de las tangentes en los extremos)
+    a = depth / (R * R)
+    bz = Part.BezierCurve()
+    bz.setPoles([V(r0, 0, a*r0*r0), V(0.5*(r0 + R), 0, a*r0*R), V(R, 0, depth)])
+    return bz.toShape()
+
+
+def _r_at(R, depth, z):
+    return R * (max(0.0, z) / depth) ** 0.5
+
+
+def paraboloid_solid(d, depth, z0=0.0):
+    if d <= 0 or depth <= 0:
+        return None
+    R = 0.5 * d
+    r0 = _r_at(R, depth, z0)
+    edges = [parabola_arc(R, depth, r0),
+             Part.makeLine(V(R, 0, depth), V(0, 0, depth)),
+             Part.makeLine(V(0, 0, depth), V(0, 0, z0))]
+    if r0 > 0:
+        edges.append(Part.makeLine(V(0, 0, z0), V(r0, 0, z0)))
+    return Part.Face(Part.Wire(edges)).revolve(O, Z, 360)
+
+
+def paraboloid_shell(d, depth, t, z0=None):
+    # Misma geometría que paraboloid_solid(d) - paraboloid_solid(d - 2t), con z0 común
+    if d <= 0 or depth <= 0:
+        return None
+    R, Ri = 0.5 * d, 0.5 * d - t
+    if Ri <= 0.05:
+        return paraboloid_solid(d, depth, z0 or 0.0)
+    z0 = depth / 128.0 if z0 is None else z0
+    if z0 <= 0:
+        return paraboloid_solid(d, depth).cut(paraboloid_solid(2.0 * Ri, depth))
+    r0, ri0 = _r_at(R, depth, z0), _r_at(Ri, depth, z0)
+    edges = [parabola_arc(R, depth, r0),
+             Part.makeLine(V(R, 0, depth), V(Ri, 0, depth)),
+             parabola_arc(Ri, depth, ri0),
+             Part.makeLine(V(ri0, 0, z0), V(r0, 0, z0))]
+    return Part.Face(Part.Wire(edges)).revolve(O, Z, 360)
+
+
+# ===================== Sectores anulares =====================
+# Sector de cilindro hueco en el plano YZ (x=0), centrado en +Y, que abarca angle_deg;
+# extruido a lo largo de X da un panel curvo de 6 caras (2 cilíndricas, 2 radiales,
+# 2 extremos) en lugar de ~150 caras planas.
+# thickness opcional: espesor radial variable a lo largo del ángulo, medido hacia dentro
+# desde r_out (r_in se ignora). Puede ser (t_centro, t_borde) -> variación parabólica, o
+# una función t(u) con u en [-1, 1] (u=0 centro). La cara interior pasa a ser una B-spline.
+def _sector_point(r, ang):
+    return V(0, r * math.cos(ang), r * math.sin(ang))
+
+
+def _thickness_fn(thickness):
+    if thickness is None or callable(thickness):
+        return thickness
+    t_mid, t_edge = thickness
+    return lambda u: t_edge + (t_mid - t_edge) * (1.0 - u * u)
+
+
+def annular_sector_face(r_out, r_in, angle_deg, thickness=None, samples=17):
+    half = 0.5 * math.radians(angle_deg)
+    outer = Part.Arc(_sector_point(r_out, -half), _sector_point(r_out, 0.0), _sector_point(r_out, half)).toShape()
+    t = _thickness_fn(thickness)
+    if t is None:
+        inner = Part.Arc(_sector_point(r_in, half), _sector_point(r_in, 0.0), _sector_point(r_in, -half)).toShape()
+    else:
+        us = [1.0 - 2.0 * i / (samples - 1) for i in range(samples)]
+        bs = Part.BSplineCurve()
+        bs.interpolate([_sector_point(r_out - t(u), u * half) for u in us])
+        inner = bs.toShape()
+    p_in_a, p_in_b = inner.Vertexes[0].Point, inner.Vertexes[-1].Point
+    edges = [outer, Part.makeLine(_sector_point(r_out, half), p_in_a), inner,
+             Part.makeLine(p_in_b, _sector_point(r_out, -half))]
+    return Part.Face(Part.Wire(edges))
+
+
+def annular_sector(r_out, r_in, angle_deg, length, thickness=None):
+    # Panel extruido en +X y centrado en x=0
+    panel = annular_sector_face(r_out, r_in, angle_deg, thickness).extrude(V(length, 0, 0))
+    panel.translate(V(-0.5 * length, 0, 0))
+    return panel
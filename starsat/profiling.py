@@ -0,0 +1,187 @@
+# starsat.profiling – perfil por operación de OCC/FreeCAD (opt-in).
+# Part.Shape y App.Document son tipos C y no se pueden envolver con monkeypatch, así que
+# se usa un hook sys.setprofile que solo mira los eventos c_call/c_return/c_exception de
+# los métodos de NAMES. Sin activar no hay hook instalado: coste cero.
+#
+#   from starsat.profiling import profile
+#   with profile("greyscale_trace.json"):
+#       main()
+#
+#   starsat-build DFD_GreyScale.py --profile greyscale_trace.json
+#   STARSAT_PROFILE=greyscale_trace.json starsat-build DFD_GreyScale.py
+#
+# Por cada llamada: tiempo, constructor que la hace (primera función fuera de starsat en
+# la pila, p.ej. create_advanced_tps), caras/aristas de cada operando y resultado: ok,
+# error (excepción) o fallback (primera operación que tiene éxito en la misma función
+# después de un error). El hook de perfil no ve los argumentos de una llamada C: las
+# herramientas de fuse/cut/common se leen del marco de booleans._op, por donde pasan
+# fuse/cut/common/fuse_all/cut_all de starsat; en una llamada directa a.fuse(b) de una
+# macro solo se conoce el operando propio (a). Se escriben:
+#   trace.json    formato Chrome trace (chrome://tracing, Perfetto, speedscope)
+#   trace.folded  pilas colapsadas para flamegraph.pl / speedscope (microsegundos)
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+NAMES = frozenset(("fuse", "cut", "common", "makeFillet", "makeChamfer", "makeOffsetShape", "makeThickness",
+                   "makePipeShell", "revolve", "extrude", "addObject", "recompute"))
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_BOOLEANS = os.path.join(_HERE, "booleans.py")
+_active = None
+
+
+def _frame_name(code):
+    if code.co_name == "<module>":
+        return os.path.basename(code.co_filename)
+    return code.co_name
+
+
+def _counts(obj):
+    try:
+        return len(obj.Faces), len(obj.Edges)
+    except Exception:
+        return None, None
+
+
+def _operands(fn, frame):
+    # Operando propio (self) y, si la llamada la hace booleans._op, sus herramientas
+    ops = [getattr(fn, "__self__", None)]
+    code = frame.f_code
+    if code.co_name == "_op" and code.co_filename == _BOOLEANS:
+        ops += list(frame.f_locals.get("tools") or ())
+    return [list(_counts(o)) for o in ops]
+
+
+def _total(ops, k):
+    vals = [o[k] for o in ops if o[k] is not None]
+    return sum(vals) if vals else None
+
+
+class Profiler:
+    def __init__(self, path=None):
+        self.path = path
+        self.events = []
+        self.open = []
+        self.failed = set()
+        self.t0 = time.perf_counter()
+
+    def hook(self, frame, event, arg):
+        if event == "c_call":
+            if getattr(arg, "__name__", None) in NAMES:
+                self.open.append((arg, frame, time.perf_counter()))
+        elif event[0] == "c" and self.open and self.open[-1][0] is arg:
+            fn, fr, t = self.open.pop()
+            self._record(fn, fr, t, time.perf_counter(), event == "c_exception")
+
+    def _record(self, fn, frame, t, t_end, error):
+        stack, builder, f = [], None, frame
+        while f is not None:
+            stack.append(_frame_name(f.f_code))
+            if builder is None and not f.f_code.co_filename.startswith(_HERE):
+                builder = stack[-1]
+            f = f.f_back
+        stack.reverse()
+        key = id(frame)
+        if error:
+            outcome = "error"
+            self.failed.add(key)
+        elif key in self.failed:
+            outcome = "fallback"
+            self.failed.discard(key)
+        else:
+            outcome = "ok"
+        # operands: [[caras, aristas], ...] propio primero; faces/edges: suma de todos
+        ops = _operands(fn, frame)
+        self.events.append({"op": fn.__name__, "t": t - self.t0, "dur": t_end - t, "builder": builder,
+                            "operands": ops, "faces": _total(ops, 0), "edges": _total(ops, 1),
+                            "outcome": outcome, "stack": stack, "tid": threading.get_ident()})
+
+    # ---------- salida ----------
+    def chrome_trace(self):
+        ev = [{"name": e["op"], "cat": e["outcome"], "ph": "X", "pid": os.getpid(), "tid": e["tid"],
+               "ts": e["t"] * 1e6, "dur": e["dur"] * 1e6,
+               "args": {"builder": e["builder"], "faces": e["faces"], "edges": e["edges"],
+                        "operands": e["operands"], "stack": ";".join(e["stack"])}} for e in self.events]
+        return {"traceEvents": ev, "displayTimeUnit": "ms"}
+
+    def folded(self):
+        agg = {}
+        for e in self.events:
+            k = ";".join(e["stack"] + [e["op"]])
+            agg[k] = agg.get(k, 0) + int(e["dur"] * 1e6)
+        return "".join("%s %d\n" % kv for kv in sorted(agg.items()))
+
+    def write(self, path=None):
+        path = path or self.path
+        if not path:
+            return None
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+        folded = os.path.splitext(path)[0] + ".folded"
+        with open(folded, "w") as f:
+            f.write(self.folded())
+        return path, folded
+
+    def summary(self, top=20):
+        agg = {}
+        for e in self.events:
+            a = agg.setdefault((e["op"], e["builder"]), [0, 0.0, 0.0, 0, 0, 0])
+            a[0] += 1
+            a[1] += e["dur"]
+            a[2] = max(a[2], e["dur"])
+            a[3] += e["outcome"] != "ok"
+            a[4] = max(a[4], len(e["operands"]))
+            a[5] = max(a[5], e["faces"] or 0)
+        rows = sorted(agg.items(), key=lambda kv: -kv[1][1])[:top]
+        lines = ["%-16s %-32s %6s %9s %9s %5s %4s %8s" % ("op", "constructor", "n", "total s", "max s", "fallo",
+                                                         "ops", "caras")]
+        for (op, builder), (n, tot, mx, bad, nops, faces) in rows:
+            lines.append("%-16s %-32s %6d %9.3f %9.3f %5d %4d %8d" % (op, (builder or "?")[:32], n, tot, mx, bad,
+                                                                   nops, faces))
+        return "\n".join(lines)
+
+
+# ======================================================
+# Activación
+# ======================================================
+def enable(path=None):
+    global _active
+    if _active is None:
+        _active = Profiler(path)
+        sys.setprofile(_active.hook)
+        threading.setprofile(_active.hook)
+    return _active
+
+
+def disable(report=True):
+    global _active
+    prof, _active = _active, None
+    if prof is None:
+        return None
+    sys.setprofile(None)
+    threading.setprofile(None)
+    out = prof.write()
+    if report:
+        try:
+            import FreeCAD as App
+            say = App.Console.PrintMessage
+        except ImportError:
+            say = sys.stdout.write
+        say("profiling: %d operaciones, %.2f s\n%s\n" % (len(prof.events), sum(e["dur"] for e in prof.events),
+                                                         prof.summary()))
+        if out:
+            say("profiling: %s, %s\n" % out)
+    return prof
+
+
+@contextmanager
+def profile(path=None, report=True):
+    prof = enable(path)
+    try:
+        yield prof
+    finally:
+        disable(report)
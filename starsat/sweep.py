@@ -0,0 +1,270 @@
+# starsat.sweep – barridos de diseño sobre los parámetros P / TPS / TK de una macro.
+# Cada variante es una ejecución aislada de starsat-build (un proceso FreeCADCmd con
+# sus --set), así una geometría que revienta o se cuelga solo produce una fila con
+# status "error"/"timeout" y el barrido sigue:
+#
+#   from starsat.sweep import grid, lhs, sweep
+#   design = grid({"P.shield_d": [2200.0, 2600.0, 3000.0], "P.t_foam": [80.0, 120.0]})
+#   design = lhs({"P.hull_shield_t": (40.0, 120.0), "P.reactor_shield_t": (80.0, 160.0)}, 64, seed=1)
+#   rows = sweep("DFDmacro.py", design, out="trade.csv", workers=8, timeout=900)
+#
+#   python -m starsat.sweep DFDmacro.py --grid P.truss_count=6,8,12 --range P.scale=1:3 -n 20 --out trade.csv
+#
+# En la línea de comandos los límites de --range son siempre continuos (float), aunque se
+# escriban como enteros; para valores enteros usa --grid. Cada variante corre con
+# STARSAT_JOBS=1: el paralelismo es el del barrido, no el de las macros dentro de él.
+#
+# Métricas por variante (sobre los objetos raíz del documento): volumen, masa según
+# Density/Mass/MaterialData de cada objeto (en un Assembly materializado, la de su tabla
+# de materiales por pieza), caja envolvente, caras, sólidos, tiempos.
+# La salida es CSV, o Parquet si el nombre acaba en .parquet y hay pandas + pyarrow.
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .cli import REPO, WORKER, _freecadcmd
+
+METRICS = ("build_s", "macro_s", "recompute_s", "objects", "solids", "faces",
+           "volume_mm3", "mass_kg", "untagged_volume_mm3", "bbox_x", "bbox_y", "bbox_z")
+
+
+# ======================================================
+# Diseños
+# ======================================================
+def grid(spec):
+    # spec: {clave: [valores]} -> producto cartesiano
+    keys = list(spec)
+    return [dict(zip(keys, vals)) for vals in itertools.product(*(spec[k] for k in keys))]
+
+
+def _sample(rng_val, bounds):
+    # bounds: (lo, hi) continuo (enteros si ambos lo son) o lista de valores discretos
+    if isinstance(bounds, list):
+        return bounds[min(int(rng_val * len(bounds)), len(bounds) - 1)]
+    lo, hi = bounds
+    v = lo + rng_val * (hi - lo)
+    return int(round(v)) if isinstance(lo, int) and isinstance(hi, int) else v
+
+
+def lhs(spec, n, seed=None):
+    # Hipercubo latino: cada clave cubre sus n estratos exactamente una vez
+    rng = random.Random(seed)
+    cols = {}
+    for k in spec:
+        strata = [(i + rng.random()) / n for i in range(n)]
+        rng.shuffle(strata)
+        cols[k] = strata
+    return [dict((k, _sample(cols[k][i], spec[k])) for k in spec) for i in range(n)]
+
+
+def random_design(spec, n, seed=None):
+    rng = random.Random(seed)
+    return [dict((k, _sample(rng.random(), spec[k])) for k in spec) for _ in range(n)]
+
+
+# ======================================================
+# Métricas (dentro de FreeCAD)
+# ======================================================
+def _density(o):
+    # kg/m3; algunas macros guardan g/cm3
+    rho = getattr(o, "Density", 0.0) or 0.0
+    if not rho:
+        data = getattr(o, "MaterialData", None) or {}
+        if not isinstance(data, dict):
+            data = {}
+        for k in ("density", "Density", "density_kg_m3"):
+            try:
+                rho = float(data.get(k, 0.0))
+            except (TypeError, ValueError):
+                rho = 0.0
+            if rho:
+                break
+    return rho * 1000.0 if 0.0 < rho < 30.0 else rho
+
+
+def _assembly_mass(o):
+    # (masa kg, volumen sin material mm3) desde la tabla lateral de un Assembly materializado
+    from .assembly import Assembly
+    rows = Assembly.from_object(o).mass_rollup()["rows"]
+    return sum(r[4] for r in rows), sum(r[3] for r in rows if not r[4])
+
+
+def doc_metrics(doc):
+    from .cli import _root_objects
+    m = dict((k, 0) for k in METRICS if not k.endswith("_s"))
+    m["mass_kg"] = m["volume_mm3"] = m["untagged_volume_mm3"] = 0.0
+    bb = None
+    for o in _root_objects(doc):
+        shp = o.Shape
+        m["objects"] += 1
+        m["solids"] += len(shp.Solids)
+        m["faces"] += len(shp.Faces)
+        try:
+            vol = shp.Volume
+        except Exception:
+            vol = 0.0
+        m["volume_mm3"] += vol
+        mass = getattr(o, "Mass", 0.0) or 0.0
+        rho = _density(o)
+        if hasattr(o, "SolidMaterial"):
+            mass, untagged = _assembly_mass(o)
+            m["mass_kg"] += mass
+            m["untagged_volume_mm3"] += untagged
+        elif mass:
+            m["mass_kg"] += mass
+        elif rho:
+            m["mass_kg"] += vol * 1e-9 * rho
+        else:
+            m["untagged_volume_mm3"] += vol
+        box = shp.BoundBox
+        if bb is None:
+            bb = box
+        else:
+            bb = bb.united(box)
+    if bb is not None:
+        m["bbox_x"], m["bbox_y"], m["bbox_z"] = bb.XLength, bb.YLength, bb.ZLength
+    return m
+
+
+# ======================================================
+# Ejecución
+# ======================================================
+def _command(freecadcmd):
+    exe = _freecadcmd(freecadcmd)
+    if exe:
+        return [exe, WORKER]
+    try:
+        import FreeCAD  # noqa: F401
+        return [sys.executable, WORKER]
+    except ImportError:
+        raise RuntimeError("sweep: FreeCADCmd no encontrado (usa freecadcmd= o STARSAT_FREECADCMD)") from None
+
+
+def _run_variant(cmd, macro, i, params, tmp, timeout):
+    mfile = os.path.join(tmp, "v%05d.json" % i)
+    args = {"repo": REPO, "macro": macro, "out": None, "metrics": mfile,
+            "overrides": ["%s=%r" % (k, v) for k, v in params.items()]}
+    row = dict(params, variant=i, status="ok", error="")
+    t0 = time.perf_counter()
+    try:
+        proc = subprocess.run(cmd, env=dict(os.environ, STARSAT_CLI=json.dumps(args), STARSAT_JOBS="1"),
+                              stdout=subprocess.PIPE, stderr=subprocess.STDOUT, timeout=timeout)
+        log = proc.stdout.decode("utf-8", "replace")
+        if proc.returncode == 0 and os.path.exists(mfile):
+            with open(mfile) as f:
+                met = json.load(f)
+            row.update((k, met.get(k)) for k in METRICS if not k.endswith("_s"))
+            row["macro_s"], row["recompute_s"] = met.get("macro"), met.get("recompute")
+        else:
+            row["status"] = "error"
+            row["error"] = (log.strip().splitlines() or ["código %s" % proc.returncode])[-1][:300]
+    except subprocess.TimeoutExpired:
+        row["status"], row["error"] = "timeout", "> %s s" % timeout
+    row["build_s"] = time.perf_counter() - t0
+    return row
+
+
+def write_table(rows, path):
+    keys = []
+    for r in rows:
+        keys += [k for k in r if k not in keys]
+    if path.lower().endswith(".parquet"):
+        try:
+            import pandas as pd
+            pd.DataFrame(rows, columns=keys).to_parquet(path, index=False)
+            return path
+        except ImportError:
+            path = path[:-len(".parquet")] + ".csv"
+            sys.stderr.write("sweep: sin pandas/pyarrow, se escribe %s\n" % path)
+    with open(path, "w", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=keys)
+        w.writeheader()
+        w.writerows(rows)
+    return path
+
+
+def sweep(macro, design, out="sweep.csv", workers=None, timeout=600, freecadcmd=None):
+    macro = os.path.abspath(macro)
+    cmd = _command(freecadcmd)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(design) or 1))
+    tmp = tempfile.mkdtemp(prefix="starsat_sweep_")
+    rows = []
+    t0 = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_run_variant, cmd, macro, i, p, tmp, timeout) for i, p in enumerate(design)]
+            for n, fut in enumerate(as_completed(futures), 1):
+                r = fut.result()
+                rows.append(r)
+                print("sweep %d/%d  variante %d  %s  %.1f s%s" % (n, len(design), r["variant"], r["status"],
+                                                               r["build_s"], "  " + r["error"] if r["error"] else ""))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    rows.sort(key=lambda r: r["variant"])
+    if out:
+        out = write_table(rows, out)
+    bad = sum(r["status"] != "ok" for r in rows)
+    print("sweep: %d variantes (%d fallidas) en %.1f s con %d workers%s"
+          % (len(rows), bad, time.perf_counter() - t0, workers, " -> " + out if out else ""))
+    return rows
+
+
+# ======================================================
+# Línea de comandos
+# ======================================================
+def _values(text):
+    from .cli import parse_overrides
+    key, _, raw = text.partition("=")
+    return key.strip(), [parse_overrides(["x=" + v])[0][2] for v in raw.split(",")]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m starsat.sweep")
+    ap.add_argument("macro")
+    ap.add_argument("--grid", action="append", default=[], metavar="clave=v1,v2,...")
+    ap.add_argument("--range", action="append", default=[], metavar="clave=lo:hi")
+    ap.add_argument("--method", choices=("grid", "lhs", "random"), default=None,
+                    help="por defecto grid si no hay --range, si no lhs")
+    ap.add_argument("-n", "--samples", type=int, default=32)
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("-j", "--workers", type=int, default=None)
+    ap.add_argument("--timeout", type=float, default=600)
+    ap.add_argument("--out", default="sweep.csv")
+    ap.add_argument("--freecadcmd")
+    ns = ap.parse_args(argv)
+
+    spec = dict(_values(g) for g in ns.grid)
+    for r in ns.range:
+        key, vals = _values(r.replace(":", ","))
+        try:
+            spec[key] = tuple(float(v) for v in vals[:2])
+        except (TypeError, ValueError):
+            ap.error("--range espera clave=lo:hi numéricos: %r" % r)
+    method = ns.method or ("lhs" if ns.range else "grid")
+    if method == "grid":
+        if ns.range:
+            ap.error("--range necesita --method lhs o random")
+        design = grid(spec)
+    else:
+        spec = dict((k, v if isinstance(v, tuple) else list(v)) for k, v in spec.items())
+        design = (lhs if method == "lhs" else random_design)(spec, ns.samples, ns.seed)
+    try:
+        rows = sweep(ns.macro, design, ns.out, ns.workers, ns.timeout, ns.freecadcmd)
+    except RuntimeError as e:
+        sys.stderr.write("%s\n" % e)
+        return 2
+    return 0 if rows else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+# Historial y comparación de regresiones de starsat.bench (Python puro, no necesita FreeCAD)
+import json
+
+from starsat.bench import compare, load_history
+
+FP = {"objects": 3, "faces": 120, "solids": 3, "euler": 6, "volume": 1.5e9, "area": 2.0e7,
+      "bbox": [0, 0, 0, 10, 10, 10], "hash": "abc"}
+
+
+def _rec(status="ok", cold=10.0, warm=8.0, fp=FP, **kw):
+    return dict({"macro": "DFDmacro.py", "status": status, "cold_s": cold, "warm_s": warm,
+                 "fingerprint": fp}, **kw)
+
+
+def _write(path, recs):
+    with open(path, "w") as f:
+        for r in recs:
+            f.write((r if isinstance(r, str) else json.dumps(r)) + "\n")
+    return str(path)
+
+
+def test_load_history_missing_file(tmp_path):
+    assert load_history(str(tmp_path / "none.jsonl")) == {}
+
+
+def test_load_history_keeps_last_clean_ok_entry(tmp_path):
+    path = _write(tmp_path / "h.jsonl", [
+        _rec(cold=10.0, issues=[]),
+        _rec(cold=11.0, issues=[]),
+        _rec(cold=30.0, issues=["cold_s 11.00 -> 30.00 s (+173%)"]),
+        _rec(status="error", error="boom"),
+        _rec(status="no-doc", fp=None),
+        "{no es json",
+        _rec(cold=2.0, macro="otra.py"),
+    ])
+    hist = load_history(path)
+    assert sorted(hist) == ["DFDmacro.py", "otra.py"]
+    assert hist["DFDmacro.py"]["cold_s"] == 11.0
+
+
+def test_compare_without_base_reports_nothing():
+    assert compare(_rec(status="error"), None, 0.15, 0.5) == []
+    assert compare(_rec(status="no-doc", fp=None), None, 0.15, 0.5) == []
+
+
+def test_compare_same_run_is_clean():
+    assert compare(_rec(), _rec(), 0.15, 0.5) == []
+
+
+def test_compare_time_regression_needs_relative_and_absolute_delta():
+    assert compare(_rec(cold=11.4), _rec(), 0.15, 0.5) == []
+    assert compare(_rec(cold=10.4, warm=8.4), _rec(cold=10.0, warm=8.0), 0.01, 0.5) == []
+    issues = compare(_rec(cold=12.0), _rec(), 0.15, 0.5)
+    assert len(issues) == 1 and issues[0].startswith("cold_s 10.00 -> 12.00 s")
+
+
+def test_compare_missing_warm_time_is_ignored():
+    assert compare(_rec(warm=None), _rec(), 0.15, 0.5) == []
+
+
+def test_compare_geometry_change_lists_fields():
+    new = dict(FP, faces=118, volume=1.4e9, hash="def")
+    assert compare(_rec(fp=new), _rec(), 0.15, 0.5) == ["geometría cambiada (faces, volume)"]
+
+
+def test_compare_failure_after_success():
+    assert compare(_rec(status="timeout"), _rec(), 0.15, 0.5) == ["timeout (antes funcionaba)"]
+
+
+def test_compare_no_doc_after_success_is_a_regression():
+    assert compare(_rec(status="no-doc", fp=None), _rec(), 0.15, 0.5) == ["no-doc (antes funcionaba)"]
+
+
+def test_compare_tolerates_old_base_without_fingerprint():
+    assert compare(_rec(), _rec(fp=None), 0.15, 0.5) == []
+
+
+def test_no_doc_entries_are_never_a_baseline(tmp_path):
+    path = _write(tmp_path / "h.jsonl", [_rec(status="no-doc", fp=None, issues=[])])
+    assert load_history(path) == {}
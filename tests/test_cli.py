@@ -0,0 +1,91 @@
+# Overrides de starsat-build (starsat.cli): parseo y transformación de la macro, sin FreeCAD
+import pytest
+
+from starsat.cli import _Overrides, format_overrides, parse_overrides, transform
+
+MACRO = """
+P = {'scale': 1.0, 'truss_count': 8}
+TK = {'panel_t': 2}
+P['extra'] = P['scale'] * 2
+n_ribs = 4
+label = 'base'
+obj.ViewObject.ShapeColor = (1, 0, 0)
+"""
+
+
+def _run(source, items):
+    ov = _Overrides(parse_overrides(items))
+    g = {"__starsat_dict__": ov.apply_dict, "__starsat_global__": ov.apply_global, "obj": None}
+    exec(transform(source, "<macro>", ov), g)
+    return g, ov
+
+
+def test_parse_overrides_literals_and_prefixes():
+    assert parse_overrides(["P.scale=2.5", "truss_count = 12", "TK.axis=(1,0,0)", "name=texto"]) == [
+        ("P", "scale", 2.5), (None, "truss_count", 12), ("TK", "axis", (1, 0, 0)), (None, "name", "texto")]
+
+
+def test_parse_overrides_unknown_prefix_is_a_plain_key():
+    assert parse_overrides(["Q.x=1"]) == [(None, "Q.x", 1)]
+
+
+@pytest.mark.parametrize("item", ["scale", "=3", " =3"])
+def test_parse_overrides_rejects_missing_key_or_value(item):
+    with pytest.raises(ValueError):
+        parse_overrides([item])
+
+
+def test_format_overrides_round_trips():
+    items = parse_overrides(["P.scale=2.5", "n=(1, 2)", "s=hola", "TK.on=True"])
+    assert parse_overrides(format_overrides(items)) == items
+
+
+def test_prefixed_override_changes_existing_key():
+    d = {"shield_dx": 1}
+    ov = _Overrides(parse_overrides(["P.shield_dx=5"]))
+    ov.apply_dict("P", d)
+    assert d == {"shield_dx": 5} and ov.pending() == []
+
+
+def test_prefixed_override_never_creates_a_key():
+    d = {"shield_dx": 1}
+    ov = _Overrides(parse_overrides(["P.missing=1", "TK.shield_dx=2"]))
+    ov.apply_dict("P", d)
+    assert d == {"shield_dx": 1}
+    assert ov.pending() == ["P.missing", "TK.shield_dx"]
+
+
+def test_plain_override_goes_to_first_dict_that_has_it():
+    p, tk = {"t": 1}, {"t": 2}
+    ov = _Overrides(parse_overrides(["t=9"]))
+    ov.apply_dict("P", p)
+    ov.apply_dict("TK", tk)
+    assert (p, tk) == ({"t": 9}, {"t": 2})
+
+
+def test_plain_override_falls_back_to_global():
+    ov = _Overrides(parse_overrides(["n_ribs=6"]))
+    ov.apply_dict("P", {"scale": 1})
+    assert ov.apply_global("n_ribs", 4) == 6
+    assert ov.apply_global("other", 4) == 4
+    assert ov.pending() == []
+
+
+def test_transform_applies_overrides_after_each_assignment():
+    g, ov = _run(MACRO, ["P.scale=3.0", "truss_count=12", "TK.panel_t=5", "n_ribs=6", "label=nuevo"])
+    assert g["P"] == {"scale": 3.0, "truss_count": 12, "extra": 6.0}
+    assert g["TK"] == {"panel_t": 5}
+    assert (g["n_ribs"], g["label"]) == (6, "nuevo")
+    assert ov.pending() == []
+
+
+def test_transform_reports_unknown_keys():
+    g, ov = _run(MACRO, ["P.shield_dx=5", "nothing=1"])
+    assert "shield_dx" not in g["P"]
+    assert ov.pending() == ["P.shield_dx", "nothing"]
+
+
+def test_transform_strips_view_object_statements():
+    # obj es None: la línea de ViewObject fallaría si no se eliminara
+    g, _ = _run(MACRO, [])
+    assert g["P"]["extra"] == 2.0
@@ -0,0 +1,95 @@
+# Perfiles meridianos de starsat.meridian (Python puro, no necesita FreeCAD)
+import pytest
+
+from starsat.meridian import Collapsed, axial_profile, inset_profile, split_profile
+
+HULL = [(800, 0, 300), (1400, 450, 450), (800, 600, 600)]
+
+
+def _close(a, b, tol=1e-6):
+    return len(a) == len(b) and all(abs(p[0] - q[0]) < tol and abs(p[1] - q[1]) < tol for p, q in zip(a, b))
+
+
+def test_axial_profile_starts_and_ends_on_axis():
+    assert axial_profile(HULL) == [(0.0, 0.0), (800, 300), (800, 450), (2200, 450),
+                                   (2200, 600), (3000, 600), (3000, 0.0)]
+
+
+def test_axial_profile_skips_repeated_points_and_offset():
+    assert axial_profile([(100, 0, 50), (200, 50, 50)], x0=10.0) == [
+        (10.0, 0.0), (110.0, 50), (310.0, 50), (310.0, 0.0)]
+
+
+def test_inset_zero_returns_copy():
+    prof = axial_profile(HULL)
+    out = inset_profile(prof, 0)
+    assert out == prof and out is not prof
+
+
+def test_inset_cylinder_is_exact():
+    prof = axial_profile([(100, 50, 50)])
+    assert _close(inset_profile(prof, 10.0), [(10.0, 0.0), (10.0, 40.0), (90.0, 40.0), (90.0, 0.0)])
+
+
+def test_inset_hull_small_thickness():
+    out = inset_profile(axial_profile(HULL), 10.0)
+    assert out[0][1] == 0.0 and out[-1][1] == 0.0
+    assert len(out) == 7
+    assert _close(out[-3:], [(2210.0, 590.0), (2990.0, 590.0), (2990.0, 0.0)])
+
+
+def test_inset_collinear_opposite_segments_do_not_spike():
+    # a d=400 la sección trasera (800 mm) queda con ancho cero: el escalón y la tapa
+    # caen sobre x=2600 en sentidos opuestos; antes salía (2600,50)->(2600,600)->(2600,0)
+    out = inset_profile(axial_profile(HULL), 400.0)
+    assert _close(out, [(1139.2, 0.0), (1200.0, 22.8), (1200.0, 50.0), (2600.0, 50.0), (2600.0, 0.0)], 1e-3)
+    assert all(p[1] <= 50.0 + 1e-6 for p in out)
+
+
+def test_inset_never_leaves_the_outer_profile():
+    prof = axial_profile(HULL)
+    for d in (1.0, 50.0, 150.0, 299.0, 400.0, 440.0):
+        out = inset_profile(prof, d)
+        assert all(p[1] >= -1e-7 for p in out)
+        assert all(0.0 <= p[0] <= 3000.0 for p in out)
+        assert max(p[1] for p in out) <= 600.0 - d + 1e-6
+
+
+def test_inset_thicker_than_section_collapses():
+    with pytest.raises(Collapsed):
+        inset_profile(axial_profile(HULL), 700.0)
+    with pytest.raises(ValueError):
+        inset_profile(axial_profile([(100, 50, 50)]), 60.0)
+
+
+def test_inset_crossed_parallel_segments_keep_the_inner_one():
+    # a d=440 el escalón (x=2640) y la tapa trasera (x=2560) se han cruzado: queda la tapa
+    out = inset_profile(axial_profile(HULL), 440.0)
+    assert _close(out, [(1240.0, 0.0), (1240.0, 10.0), (2560.0, 10.0), (2560.0, 0.0)])
+
+
+# Nariz como la primitiva Nose de las macros: base en x=0, punta en x=800 sobre el cilindro
+NOSE_BACK = [(800, 300, 0), (1400, 450, 450), (800, 600, 600)]
+
+
+def test_split_profile_separates_pieces_touching_on_axis():
+    prof = axial_profile(NOSE_BACK)
+    assert prof[:4] == [(0.0, 0.0), (0.0, 300), (800, 0), (800, 450)]
+    nose, body = split_profile(prof)
+    assert nose == [(0.0, 0.0), (0.0, 300), (800, 0)]
+    assert body == [(800, 0), (800, 450), (2200, 450), (2200, 600), (3000, 600), (3000, 0.0)]
+    assert split_profile(axial_profile(HULL)) == [axial_profile(HULL)]
+
+
+def test_inset_pieces_stay_inside_their_own_solid():
+    nose, body = split_profile(axial_profile(NOSE_BACK))
+    inner = inset_profile(nose, 30.0)
+    assert all(0.0 <= x <= 800.0 and r <= 300.0 * (1 - x / 800.0) + 1e-6 for x, r in inner)
+    assert _close(inset_profile(body, 30.0)[1:3], [(830.0, 420.0), (2230.0, 420.0)])
+    with pytest.raises(Collapsed):
+        inset_profile(nose, 250.0)
+
+
+def test_inset_profile_rejects_profiles_that_return_to_the_axis():
+    with pytest.raises(ValueError):
+        inset_profile(axial_profile(NOSE_BACK), 30.0)
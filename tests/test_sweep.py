@@ -0,0 +1,102 @@
+# Diseños de starsat.sweep (grid / lhs / random_design), línea de comandos y densidades, sin FreeCAD
+from types import SimpleNamespace
+
+import pytest
+
+from starsat import sweep as sw
+from starsat.sweep import _density, grid, lhs, random_design
+
+SPEC = {"P.hull_shield_t": (40.0, 120.0), "P.reactor_shield_t": (80.0, 160.0)}
+
+
+def _bin(v, bounds, n):
+    lo, hi = bounds
+    return min(int((v - lo) / (hi - lo) * n), n - 1)
+
+
+def test_grid_is_the_cartesian_product():
+    design = grid({"P.truss_count": [6, 8, 12], "P.t_foam": [80.0, 120.0], "TK.panel_t": [2]})
+    assert len(design) == 6
+    assert len(set(tuple(sorted(d.items())) for d in design)) == 6
+    assert design[0] == {"P.truss_count": 6, "P.t_foam": 80.0, "TK.panel_t": 2}
+
+
+def test_grid_empty_values_give_no_variants():
+    assert grid({"P.a": [1, 2], "P.b": []}) == []
+
+
+@pytest.mark.parametrize("n", [1, 7, 64])
+def test_lhs_one_sample_per_bin_per_key(n):
+    design = lhs(SPEC, n, seed=3)
+    assert len(design) == n
+    for key, bounds in SPEC.items():
+        vals = [d[key] for d in design]
+        assert all(bounds[0] <= v <= bounds[1] for v in vals)
+        assert sorted(_bin(v, bounds, n) for v in vals) == list(range(n))
+
+
+def test_lhs_discrete_values_are_covered_evenly():
+    design = lhs({"P.truss_count": [6, 8, 12, 16]}, 8, seed=0)
+    counts = [sum(d["P.truss_count"] == v for d in design) for v in (6, 8, 12, 16)]
+    assert counts == [2, 2, 2, 2]
+
+
+def test_integer_bounds_give_integers_float_bounds_give_floats():
+    d = lhs({"P.n": (1, 9), "P.x": (1.0, 9.0)}, 5, seed=1)
+    assert all(isinstance(r["P.n"], int) and isinstance(r["P.x"], float) for r in d)
+
+
+@pytest.mark.parametrize("gen", [lhs, random_design])
+def test_same_seed_same_design(gen):
+    assert gen(SPEC, 16, seed=42) == gen(SPEC, 16, seed=42)
+    assert gen(SPEC, 16, seed=42) != gen(SPEC, 16, seed=43)
+
+
+def test_random_design_stays_in_bounds():
+    for d in random_design(SPEC, 50, seed=5):
+        assert all(SPEC[k][0] <= v <= SPEC[k][1] for k, v in d.items())
+
+
+def _cli_design(monkeypatch, argv):
+    seen = {}
+
+    def fake_sweep(macro, design, *a):
+        seen["design"] = design
+        return design
+
+    monkeypatch.setattr(sw, "sweep", fake_sweep)
+    assert sw.main(["macro.py"] + argv) == 0
+    return seen["design"]
+
+
+def test_cli_range_bounds_are_float_even_if_written_as_integers(monkeypatch):
+    design = _cli_design(monkeypatch, ["--range", "P.scale=1:3", "-n", "6", "--seed", "2"])
+    vals = [d["P.scale"] for d in design]
+    assert len(vals) == 6 and all(isinstance(v, float) for v in vals)
+    assert len(set(round(v, 6) for v in vals)) == 6
+
+
+def test_cli_grid_with_range_uses_discrete_grid_values(monkeypatch):
+    design = _cli_design(monkeypatch, ["--grid", "P.truss_count=6,8", "--range", "P.scale=1:3",
+                                       "-n", "4", "--seed", "0"])
+    assert sorted(d["P.truss_count"] for d in design) == [6, 6, 8, 8]
+
+
+def test_cli_grid_only(monkeypatch):
+    design = _cli_design(monkeypatch, ["--grid", "P.truss_count=6,8,12", "--grid", "TK.panel_t=2,3"])
+    assert len(design) == 6
+
+
+def test_cli_rejects_non_numeric_range(monkeypatch):
+    with pytest.raises(SystemExit):
+        _cli_design(monkeypatch, ["--range", "P.scale=a:b"])
+
+
+def test_density_from_property_or_material_data():
+    assert _density(SimpleNamespace(Density=2700.0)) == 2700.0
+    assert _density(SimpleNamespace(MaterialData={"density": 2.7})) == 2700.0
+
+
+def test_density_ignores_assembly_material_table():
+    # MaterialData de un Assembly materializado es una lista de JSON por material, no un dict
+    assert _density(SimpleNamespace(MaterialData=['{"density": 2.7}'])) == 0.0